@@ -0,0 +1,91 @@
+"""
+Bulk badge generation: the old sequential loop (font reloaded and RGB image per badge)
+versus generate_badges (cached font, grayscale image, process pool), and the A4 badge
+sheet PDF (generate_badge_sheets, vector QR codes).
+
+Usage (from the repository root):
+    python benchmarks/bench_badges.py [--employees 1000] [--workers 0]
+
+The ZIP paths write a ZIP of every badge and the sheet path a PDF into a temporary
+directory. Reports badges per second, the file size and (not on Windows) the peak memory.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+try:
+    import resource  # Peak memory (not available on Windows)
+except ImportError:
+    resource = None
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+import qrcode
+from PIL import ImageDraw, ImageFont
+
+from utils.qr_generator import generate_badge_sheets, generate_badges
+
+
+def old_badge(employee_id, name):
+    """generate_qr_with_text as it was: font loaded on every call, RGB image."""
+    qr = qrcode.QRCode(version=1, box_size=33, border=5)
+    qr.add_data(employee_id)
+    qr.make(fit=True)
+    img = qr.make_image(fill='black', back_color='white').convert('RGB')
+    draw = ImageDraw.Draw(img)
+    try:
+        font = ImageFont.truetype("arial.ttf", 30)
+    except OSError:
+        font = ImageFont.load_default()
+    for text, y in ((f"ID: {employee_id}", 20), (f"Name: {name}", img.height - 70)):
+        bbox = draw.textbbox((0, 0), text, font=font)
+        draw.text(((img.width - (bbox[2] - bbox[0])) // 2, y), text, fill='black', font=font)
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=0, help='Pool processes (<= 0: relative to the cores)')
+    args = parser.parse_args()
+
+    badges = [(f"FP-{100000 + i}", f"Employe Numero {i}") for i in range(args.employees)]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'old.zip')
+        start = time.perf_counter()
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for employee_id, name in badges:
+                zipf.writestr(f"QR_{employee_id}.png", old_badge(employee_id, name))
+        results['old (sequential)'] = (time.perf_counter() - start, os.path.getsize(path))
+
+        path = os.path.join(tmp, 'new.zip')
+        start = time.perf_counter()
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for employee_id, name, png, error in generate_badges(badges, workers=args.workers):
+                zipf.writestr(f"QR_{employee_id}.png", png)
+        results[f'generate_badges (workers {args.workers})'] = (time.perf_counter() - start, os.path.getsize(path))
+
+        path = os.path.join(tmp, 'sheets.pdf')
+        start = time.perf_counter()
+        generate_badge_sheets(iter(badges), path, workers=args.workers)
+        results[f'PDF sheets (workers {args.workers})'] = (time.perf_counter() - start, os.path.getsize(path))
+
+    print(f"{args.employees} badges, {os.cpu_count()} cores\n")
+    print(f"{'path':<32}{'seconds':>9}{'badges/s':>10}{'file MB':>9}")
+    for name, (seconds, size) in results.items():
+        print(f"{name:<32}{seconds:>9.2f}{args.employees / seconds:>10.0f}{size / 1e6:>9.1f}")
+    if resource is not None:
+        print(f"\nPeak memory {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
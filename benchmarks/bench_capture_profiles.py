@@ -0,0 +1,190 @@
+"""
+CPU cost of the live terminal per capture profile, from the camera buffer to the preview.
+
+Usage (from the repository root):
+    python benchmarks/bench_capture_profiles.py [--frame FRAME.jpg] [--mode face|qr|both]
+    python benchmarks/bench_capture_profiles.py --camera 0 [--seconds 10]
+
+Without --camera, each profile is simulated in-process: a frame at the profile size is
+encoded as the camera would deliver it (MJPG: JPEG bytes decoded by OpenCV, YUYV: packed
+4:2:2 converted to BGR), then runs the mode pipeline (face: detector; QR: grayscale + pyzbar)
+and the kiosk preview (BGR->RGB + smooth scale to 480x360). CPU time per frame and the CPU
+share at the profile frame rate are compared with the driver default the terminal used
+before capture profiles (--baseline, 1920x1080@30 YUYV). Frames are assumed to be processed
+at the profile rate; the kiosk's scheduling lowers the absolute numbers, not the ratios.
+
+With --camera the profiles are negotiated on a real device (utils.capture_profile) and the
+process CPU time (capture thread included) is measured while the pipeline runs on the
+newest frames for --seconds per profile.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+import cv2
+import numpy as np
+
+from utils.capture_profile import DEFAULT_PROFILES, MODE_FACE, MODE_QR, CaptureProfile, format_negotiated
+
+PREVIEW_SIZE = (480, 360)  # Kiosk camera label
+
+
+def bgr_to_yuyv(frame):
+    """Pack a BGR frame as YUYV 4:2:2 (what a camera delivers in YUYV mode)."""
+    yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV)
+    height, width = frame.shape[:2]
+    packed = np.empty((height, width, 2), dtype=np.uint8)
+    packed[:, :, 0] = yuv[:, :, 0]
+    packed[:, 0::2, 1] = yuv[:, 0::2, 1]  # U on even pixels
+    packed[:, 1::2, 1] = yuv[:, 1::2, 2]  # V on odd pixels
+    return packed
+
+
+def make_pipeline(mode, detector_backend):
+    """Per-frame work of a mode, as in PublicInterface.process_qr_frame / process_face_frame."""
+    if mode == MODE_FACE:
+        from utils.face_detectors import create_detector
+        detector = create_detector(detector_backend)
+        return detector.detect
+    try:
+        from pyzbar.pyzbar import decode
+    except ImportError:
+        print("pyzbar unavailable: QR mode measures the grayscale conversion only")
+        decode = None
+
+    def scan(frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return decode(gray) if decode is not None else []
+    return scan
+
+
+def preview(frame):
+    """Kiosk preview: RGB conversion and smooth scale into the label, keeping the aspect ratio."""
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    height, width = rgb.shape[:2]
+    scale = min(PREVIEW_SIZE[0] / width, PREVIEW_SIZE[1] / height)
+    return cv2.resize(rgb, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+
+
+def simulate(profile, base_frame, pipeline, iterations):
+    """CPU milliseconds per frame of capture conversion, pipeline and preview for one profile."""
+    frame = cv2.resize(base_frame, (profile.width, profile.height), interpolation=cv2.INTER_AREA)
+    if profile.pixel_format == 'YUYV':
+        payload = bgr_to_yuyv(frame)
+        capture = lambda: cv2.cvtColor(payload, cv2.COLOR_YUV2BGR_YUYV)
+    else:
+        payload = np.frombuffer(cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])[1], dtype=np.uint8)
+        capture = lambda: cv2.imdecode(payload, cv2.IMREAD_COLOR)
+
+    pipeline(capture())  # Warm-up
+    totals = {'capture': 0.0, 'pipeline': 0.0, 'preview': 0.0}
+    for _ in range(iterations):
+        start = time.process_time()
+        decoded = capture()
+        captured = time.process_time()
+        pipeline(decoded)
+        processed = time.process_time()
+        preview(decoded)
+        totals['capture'] += captured - start
+        totals['pipeline'] += processed - captured
+        totals['preview'] += time.process_time() - processed
+    return {stage: seconds / iterations * 1000 for stage, seconds in totals.items()}
+
+
+def measure_camera(camera_index, profile, pipeline, seconds):
+    """Negotiate a profile on a real camera and measure process CPU while the pipeline runs."""
+    import tempfile
+    from utils.camera_manager import CameraManager
+    from utils.capture_thread import CaptureThread
+
+    manager = CameraManager(cache_path=os.path.join(tempfile.mkdtemp(), 'camera_cache.json'),
+                            indices=(camera_index,))
+    source = manager.open("benchmark", profile)
+    if source is None:
+        return None
+    capture = CaptureThread(source).start()
+    frames, last_sequence = 0, -1
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    while time.perf_counter() - wall_start < seconds:
+        frame, _, last_sequence = capture.wait_for_frame(last_sequence, timeout=1.0)
+        if frame is None:
+            continue
+        pipeline(frame)
+        preview(frame)
+        frames += 1
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    stats = capture.get_stats()
+    capture.stop()
+    source.release()
+    return {
+        'negotiated': format_negotiated(source.negotiated),
+        'exact': source.profile_exact,
+        'cpu_percent': cpu / wall * 100,
+        'processed_fps': frames / wall,
+        'capture_fps': stats['capture_fps'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frame', help='Camera frame (ideally with a face or badge) scaled to each profile')
+    parser.add_argument('--mode', choices=(MODE_FACE, MODE_QR, 'both'), default='both')
+    parser.add_argument('--profiles', nargs='+',
+                        default=['1920x1080@30 YUYV', '1280x720@30 MJPG', '1280x720@15 MJPG',
+                                 '640x480@30 MJPG', '640x480@30 YUYV', '320x240@30 MJPG'],
+                        help='Profiles to compare ("WIDTHxHEIGHT@FPS FOURCC")')
+    parser.add_argument('--baseline', default='1920x1080@30 YUYV',
+                        help='Driver default format the savings are computed against')
+    parser.add_argument('--detector', default='auto', help='Face detector backend')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--camera', type=int, help='Measure on this camera index instead of simulating')
+    parser.add_argument('--seconds', type=float, default=10.0, help='Measurement time per profile with --camera')
+    args = parser.parse_args()
+
+    modes = (MODE_FACE, MODE_QR) if args.mode == 'both' else (args.mode,)
+    profiles = [CaptureProfile.parse(spec) for spec in args.profiles]
+    baseline = CaptureProfile.parse(args.baseline)
+    if baseline not in profiles:
+        profiles.insert(0, baseline)
+
+    base_frame = cv2.imread(args.frame) if args.frame else None
+    if base_frame is None:
+        base_frame = np.random.randint(0, 255, (1080, 1920, 3), dtype=np.uint8)
+        print("No --frame: synthetic noise frame (costs only, no detections expected)")
+
+    for mode in modes:
+        pipeline = make_pipeline(mode, args.detector)
+        print(f"\n{mode} mode (default profile {DEFAULT_PROFILES[mode]})")
+
+        if args.camera is not None:
+            print(f"{'profile':<20}{'negotiated':<20}{'capture fps':>12}{'processed fps':>15}{'CPU %':>8}")
+            for profile in profiles:
+                r = measure_camera(args.camera, profile, pipeline, args.seconds)
+                if r is None:
+                    print(f"{profile.spec:<20}camera {args.camera} unavailable")
+                    continue
+                print(f"{profile.spec:<20}{r['negotiated'] + ('' if r['exact'] else ' (!)'):<20}"
+                      f"{r['capture_fps']:>12.1f}{r['processed_fps']:>15.1f}{r['cpu_percent']:>8.0f}")
+            continue
+
+        results = {profile: simulate(profile, base_frame, pipeline, args.iterations) for profile in profiles}
+        base_total = sum(results[baseline].values())
+        base_share = base_total * (baseline.fps or 30) / 1000
+        print(f"{'profile':<20}{'capture':>9}{'pipeline':>10}{'preview':>9}{'total ms':>10}"
+              f"{'CPU at fps':>12}{'saved':>8}")
+        for profile, r in results.items():
+            total = sum(r.values())
+            # CPU cores busy when every frame at the profile rate is processed
+            share = total * (profile.fps or 30) / 1000
+            saved = (1 - share / base_share) * 100 if base_share else 0.0
+            print(f"{profile.spec:<20}{r['capture']:>9.2f}{r['pipeline']:>10.2f}{r['preview']:>9.2f}{total:>10.2f}"
+                  f"{share * 100:>11.0f}%{saved:>7.0f}%")
+
+
+if __name__ == '__main__':
+    main()
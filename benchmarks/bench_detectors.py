@@ -0,0 +1,114 @@
+"""
+Compare face detector backends: startup cost, per-frame latency and memory.
+
+Usage (from the repository root):
+    python benchmarks/bench_detectors.py [--frame FRAME.jpg] [--iterations 30]
+
+Each backend runs in a fresh process so import time and resident memory include
+everything the backend pulls in (TensorFlow for mtcnn-tf). Without --frame a synthetic
+640x480 frame is used (latency only, no detections expected).
+Backends that are not installed (or YuNet without its model file) are reported as unavailable.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def rss_mb():
+    """Resident memory of this process in MB (Linux /proc, else psutil if installed)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024.0 * 1024.0)
+    except ImportError:
+        return 0.0
+
+
+def run_worker(backend, iterations, frame_path, yunet_model):
+    start = time.perf_counter()
+    import cv2
+    import numpy as np
+    from utils.face_detectors import _BACKENDS, BACKEND_YUNET
+
+    # No fallback here: measure exactly the requested backend
+    if backend == BACKEND_YUNET:
+        detector = _BACKENDS[backend](yunet_model)
+    else:
+        detector = _BACKENDS[backend]()
+    init_seconds = time.perf_counter() - start
+
+    frame = cv2.imread(frame_path) if frame_path else None
+    if frame is None:
+        frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    faces = detector.detect(frame)  # Warm-up
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        detector.detect(frame)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    print(json.dumps({
+        'init_seconds': init_seconds,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'faces': len(faces),
+        'rss_mb': rss_mb(),
+        'tensorflow': 'tensorflow' in sys.modules,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--frame', help='Camera frame to run the detectors on')
+    parser.add_argument('--yunet-model', default=os.path.join(SRC_DIR, 'models', 'face_detection_yunet_2023mar.onnx'),
+                        help='YuNet ONNX model file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.iterations, args.frame, args.yunet_model)
+        return
+
+    from utils.face_detectors import BACKEND_MTCNN_TF, BACKEND_MTCNN_TORCH, BACKEND_YUNET
+
+    print(f"{'backend':<14}{'init (s)':>10}{'p50 ms':>9}{'p95 ms':>9}{'faces':>7}{'RSS MB':>9}  TensorFlow")
+    for backend in (BACKEND_MTCNN_TF, BACKEND_MTCNN_TORCH, BACKEND_YUNET):
+        command = [sys.executable, os.path.abspath(__file__), '--worker', backend,
+                   '--iterations', str(args.iterations), '--yunet-model', args.yunet_model]
+        if args.frame:
+            command += ['--frame', args.frame]
+        output = subprocess.run(command, capture_output=True, text=True)
+        try:
+            r = json.loads(output.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            error = output.stderr.strip().splitlines()[-1:] or ['no output']
+            print(f"{backend:<14} unavailable: {error[0]}")
+            continue
+        print(f"{backend:<14}{r['init_seconds']:>10.2f}{r['p50']:>9.1f}{r['p95']:>9.1f}{r['faces']:>7}"
+              f"{r['rss_mb']:>9.0f}  {'loaded' if r['tensorflow'] else 'no'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark FaceNet embedding throughput versus batch size.
+
+Usage (from the repository root):
+    python benchmarks/bench_embedding_batch.py [--faces 64] [--images DIR]
+
+Without --images, random 200x200 crops are used (throughput does not depend on content).
+With --images, every image in DIR is treated as an already cropped face.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.face_recognition import FaceRecognition
+
+
+def load_faces(image_dir, count):
+    faces = []
+    if image_dir:
+        for name in sorted(os.listdir(image_dir)):
+            image = cv2.imread(os.path.join(image_dir, name))
+            if image is not None:
+                faces.append(image)
+    while len(faces) < count:
+        faces.append(np.random.randint(0, 255, (200, 200, 3), dtype=np.uint8))
+    return faces[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--faces', type=int, default=64, help='Number of face crops to embed')
+    parser.add_argument('--images', help='Directory of face crops')
+    parser.add_argument('--batch-sizes', default='1,4,8,16,32', help='Comma separated batch sizes')
+    args = parser.parse_args()
+
+    recognizer = FaceRecognition()
+    faces = [(face, None) for face in load_faces(args.images, args.faces)]
+
+    # Warm-up (allocator, lazy kernels)
+    recognizer.extract_embeddings(faces[:8], max_batch_size=8)
+
+    # Baseline: one forward pass per face through the single-face API
+    start = time.perf_counter()
+    for face, _ in faces:
+        recognizer._extract_embedding(face, None)
+    single = time.perf_counter() - start
+    print(f"{'single':>8}: {len(faces) / single:8.1f} faces/s")
+
+    for batch_size in [int(v) for v in args.batch_sizes.split(',')]:
+        start = time.perf_counter()
+        recognizer.extract_embeddings(faces, max_batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{batch_size:>8}: {len(faces) / elapsed:8.1f} faces/s  (x{single / elapsed:.2f})")
+
+
+if __name__ == '__main__':
+    main()
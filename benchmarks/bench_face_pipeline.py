@@ -0,0 +1,200 @@
+"""
+Replay recorded sessions through the face pipeline.
+
+Usage (from the repository root):
+    python benchmarks/bench_face_pipeline.py --sessions SESSIONS_DIR --enroll ENROLL_DIR
+    python benchmarks/bench_face_pipeline.py --sessions SESSIONS_DIR --db data/slat.db
+
+SESSIONS_DIR has one sub-directory per employee_id (use 'unknown' for people who must be
+rejected). Each video file in it is one session; loose images in it form one more session.
+The gallery comes either from ENROLL_DIR (one sub-directory of face images per employee_id,
+enrolled like the admin capture: the embedding of the image with the best detection confidence) or from the face_templates
+table of an existing database.
+
+Every frame goes through detect_and_extract_face, FaceGallery matching and the multi-frame
+TemporalIdentifier, like the kiosk (motion gate excluded). Frames are timestamped at the
+recorded rate (--fps for image sessions) so decisions do not depend on the machine speed.
+
+Reported: per-stage latency percentiles (read, detect, embed, match, total), effective
+pipeline FPS, per-frame top-1 accuracy and per-session decision accuracy.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.face_decision import FaceDecision, TemporalIdentifier
+from utils.face_gallery import FaceGallery
+from utils.face_recognition import FaceRecognition, PRECISION_FLOAT
+from utils.frame_source import (ImageDirectorySource, VideoFileSource, VIDEO_EXTENSIONS,
+                                list_images)
+
+UNKNOWN_LABELS = ('unknown', '_unknown')
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def list_sessions(sessions_dir):
+    """Yield (label, source) for every recorded session."""
+    for label in sorted(os.listdir(sessions_dir)):
+        person_dir = os.path.join(sessions_dir, label)
+        if not os.path.isdir(person_dir):
+            continue
+        for name in sorted(os.listdir(person_dir)):
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                yield label, VideoFileSource(os.path.join(person_dir, name))
+        if list_images(person_dir):
+            yield label, ImageDirectorySource(person_dir)
+
+
+def enroll_gallery(recognizer, enroll_dir):
+    """Template rows (template_id, employee_id, embedding_bytes) from a directory of face images."""
+    rows = []
+    for employee_id in sorted(os.listdir(enroll_dir)):
+        person_dir = os.path.join(enroll_dir, employee_id)
+        if not os.path.isdir(person_dir):
+            continue
+        best_embedding, best_quality = None, 0
+        for path in list_images(person_dir):
+            embedding, face_info = recognizer.detect_and_extract_face(cv2.imread(path))
+            if embedding is not None and face_info['confidence'] > best_quality:
+                best_embedding, best_quality = embedding, face_info['confidence']
+        if best_embedding is None:
+            print(f"No usable face for {employee_id}, not enrolled")
+            continue
+        rows.append((len(rows) + 1, employee_id, best_embedding.astype(np.float32).tobytes()))
+    return rows
+
+
+def database_gallery(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('SELECT id, employee_id, embedding FROM face_templates ORDER BY employee_id, id').fetchall()
+
+
+def timed(timings, stage, function):
+    """Wrap a recognizer method to record its latency under stage."""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        timings[stage].append((time.perf_counter() - start) * 1000)
+        return result
+    return wrapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', required=True, help='Recorded sessions, one sub-directory per employee_id')
+    gallery_group = parser.add_mutually_exclusive_group(required=True)
+    gallery_group.add_argument('--enroll', help='Enrollment images, one sub-directory per employee_id')
+    gallery_group.add_argument('--db', help='Database whose face_templates form the gallery')
+    parser.add_argument('--fps', type=float, default=15.0, help='Frame rate assumed for image sessions')
+    parser.add_argument('--precision', default=PRECISION_FLOAT)
+    parser.add_argument('--detector', default='auto')
+    parser.add_argument('--window', type=int, default=5)
+    parser.add_argument('--max-frames', type=int, default=10)
+    parser.add_argument('--margin', type=float, default=40.0)
+    args = parser.parse_args()
+
+    recognizer = FaceRecognition(precision=args.precision, detector_backend=args.detector)
+    gallery = FaceGallery()
+    gallery.set_templates(enroll_gallery(recognizer, args.enroll) if args.enroll else database_gallery(args.db))
+    print(f"Gallery: {gallery.template_count} templates, {gallery.employee_count} employees\n")
+
+    timings = defaultdict(list)
+    recognizer._detect_faces = timed(timings, 'detect', recognizer._detect_faces)
+    recognizer._extract_embedding = timed(timings, 'embed', recognizer._extract_embedding)
+
+    frames = frames_with_face = frames_correct = 0
+    outcomes = defaultdict(int)
+    decision_frames = []
+    pipeline_seconds = 0.0
+
+    for label, source in list_sessions(args.sessions):
+        identifier = TemporalIdentifier(window_frames=args.window, max_frames=args.max_frames,
+                                        decisive_margin=args.margin)
+        fps = source.get(cv2.CAP_PROP_FPS) or args.fps
+        expected_known = label not in UNKNOWN_LABELS
+        decided = None
+        index = 0
+        while True:
+            start = time.perf_counter()
+            ret, frame = source.read()
+            timings['read'].append((time.perf_counter() - start) * 1000)
+            if not ret:
+                break
+
+            start = time.perf_counter()
+            embedding, face_info = recognizer.detect_and_extract_face(frame)
+            matches = []
+            if embedding is not None:
+                match_start = time.perf_counter()
+                matches = gallery.match(embedding, top_k=identifier.top_k)
+                confidences = recognizer.similarity_to_confidence([m[1] for m in matches])
+                candidates = [(employee_id, float(c)) for (employee_id, _, _), c in zip(matches, confidences)]
+                timings['match'].append((time.perf_counter() - match_start) * 1000)
+                if decided is None:
+                    decision = identifier.update(candidates, [int(v) for v in face_info['bbox']], now=index / fps)
+                    if decision.status != FaceDecision.PENDING:
+                        decided = decision
+            elapsed = time.perf_counter() - start
+            timings['total'].append(elapsed * 1000)
+            pipeline_seconds += elapsed
+
+            frames += 1
+            if embedding is not None:
+                frames_with_face += 1
+                top_accepted = matches and recognizer.is_match_accepted(float(confidences[0]))
+                if (top_accepted and matches[0][0] == label) or (not top_accepted and not expected_known):
+                    frames_correct += 1
+            index += 1
+        source.release()
+
+        # Session outcome: first decision of the session (kiosk behaviour)
+        if decided is None:
+            outcome = 'undecided' if expected_known else 'correct'
+        elif decided.status == FaceDecision.ACCEPTED and recognizer.is_match_accepted(decided.confidence):
+            decision_frames.append(decided.frames)
+            if not expected_known:
+                outcome = 'false accept'
+            else:
+                outcome = 'correct' if decided.candidate == label else 'wrong person'
+        else:
+            outcome = 'correct' if not expected_known else 'false reject'
+        outcomes[outcome] += 1
+        print(f"{label:<16}{source.name:<28}{outcome}")
+
+    print(f"\n{'stage':<8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'count':>8}")
+    for stage in ('read', 'detect', 'embed', 'match', 'total'):
+        values = timings[stage]
+        print(f"{stage:<8}{percentile(values, 50):>9.2f}{percentile(values, 90):>9.2f}"
+              f"{percentile(values, 99):>9.2f}{len(values):>8}")
+
+    sessions = sum(outcomes.values())
+    print(f"\nFrames: {frames}, with a face: {frames_with_face}")
+    if pipeline_seconds:
+        print(f"Effective pipeline FPS: {frames / pipeline_seconds:.1f}")
+    if frames_with_face:
+        print(f"Per-frame top-1 accuracy: {frames_correct / frames_with_face * 100:.1f}%")
+    if sessions:
+        print("Session decisions: " + ", ".join(f"{k} {v}" for k, v in sorted(outcomes.items())) +
+              f" -> accuracy {outcomes['correct'] / sessions * 100:.1f}%")
+    if decision_frames:
+        print(f"Median frames to accept: {percentile(decision_frames, 50)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark face matching cost versus gallery size.
+
+Usage (from the repository root):
+    python benchmarks/bench_gallery_match.py [--employees 50,200,1000] [--templates 1,5]
+
+Compares the former per-employee Python loop (FaceRecognition.match_face on each stored
+embedding) with FaceGallery.match (one matrix-vector product over all templates and a
+per-employee max). Embeddings are random unit vectors; cost does not depend on content.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.face_gallery import FaceGallery
+
+
+def similarity_loop(stored, query):
+    """Per-template loop equivalent to calling match_face for every stored embedding."""
+    best = {}
+    for employee_id, blob in stored:
+        embedding = np.frombuffer(blob, dtype=np.float32)
+        embedding = embedding / np.linalg.norm(embedding)
+        similarity = float(np.dot(embedding, query / np.linalg.norm(query)))
+        best[employee_id] = max(similarity, best.get(employee_id, -1.0))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', default='50,200,1000', help='Comma separated employee counts')
+    parser.add_argument('--templates', default='1,5', help='Comma separated templates per employee')
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'employees':>10}{'templates':>11}{'loop ms':>10}{'gallery ms':>12}{'speed-up':>10}")
+    for employees in [int(v) for v in args.employees.split(',')]:
+        for per_employee in [int(v) for v in args.templates.split(',')]:
+            rows = []
+            for e in range(employees):
+                for _ in range(per_employee):
+                    vector = rng.standard_normal(512).astype(np.float32)
+                    rows.append((len(rows) + 1, f"EMP{e:05d}", vector.tobytes()))
+            queries = rng.standard_normal((args.queries, 512)).astype(np.float32)
+
+            gallery = FaceGallery()
+            gallery.set_templates(rows)
+            stored = [(employee_id, blob) for _, employee_id, blob in rows]
+
+            start = time.perf_counter()
+            for query in queries[:max(1, args.queries // 10)]:
+                similarity_loop(stored, query)
+            loop_ms = (time.perf_counter() - start) / max(1, args.queries // 10) * 1000
+
+            start = time.perf_counter()
+            for query in queries:
+                gallery.match(query, top_k=5)
+            gallery_ms = (time.perf_counter() - start) / args.queries * 1000
+
+            # Same best candidate as the loop
+            expected = similarity_loop(stored, queries[0])
+            result = gallery.match(queries[0], top_k=5)
+            best_loop = max(expected, key=expected.get)
+            assert result[0][0] == best_loop and abs(result[0][1] - expected[best_loop]) < 1e-4
+
+            print(f"{employees:>10}{per_employee:>11}{loop_ms:>10.2f}{gallery_ms:>12.3f}{loop_ms / gallery_ms:>9.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+CPU-seconds per hour of the kiosk loop in the ACTIVE, IDLE and PARKED power states.
+
+Usage (from the repository root):
+    python benchmarks/bench_idle_cpu.py --source recorded_session.avi [--seconds 30] [--detector auto]
+
+Replays a recorded session through the shared camera service and runs the kiosk tick
+loop (frame scheduler, wake-up motion detection, face stage, preview resize) with the
+scheduler at full rate (ACTIVE) and capped at --idle-fps (IDLE). PARKED measures the
+process with the camera released and no models loaded, i.e. only the once-a-minute
+clock is left. Process CPU time (capture thread included) is extrapolated to one hour.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+import cv2
+
+from utils.frame_scheduler import FrameScheduler
+from utils.motion_gate import MotionGate
+
+
+def run_loop(camera, scheduler, detect, seconds):
+    """Kiosk tick loop (PublicInterface.on_camera_tick without Qt) for a number of seconds."""
+    wake_detector = MotionGate()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    while time.perf_counter() - wall_start < seconds:
+        time.sleep(scheduler.next_delay_ms() / 1000.0)
+        frame, _ = camera.read_latest()
+        if frame is None:
+            continue
+        wake_detector.detect_motion(frame)
+        if scheduler.due('face'):
+            with scheduler.run('face'):
+                detect(frame)
+        if scheduler.due('preview'):
+            with scheduler.run('preview'):
+                cv2.resize(frame, (480, 360), interpolation=cv2.INTER_AREA)
+    wall = time.perf_counter() - wall_start
+    return (time.process_time() - cpu_start) / wall * 3600
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', required=True, help='Recorded session (video file or image directory)')
+    parser.add_argument('--seconds', type=float, default=30.0, help='Measurement time per state')
+    parser.add_argument('--idle-fps', type=float, default=2.0)
+    parser.add_argument('--face-fps', type=float, default=10.0)
+    parser.add_argument('--preview-fps', type=float, default=15.0)
+    parser.add_argument('--detector', default='auto', help="Face detector backend ('none' to skip detection)")
+    args = parser.parse_args()
+
+    os.environ['SLAT_FRAME_SOURCE'] = args.source
+    from utils.camera_service import camera_service
+
+    if args.detector == 'none':
+        detect = lambda frame: None
+    else:
+        from utils.face_detectors import create_detector
+        detect = create_detector(args.detector).detect
+
+    scheduler = FrameScheduler()
+    scheduler.add_stage('preview', args.preview_fps)
+    scheduler.add_stage('face', args.face_fps, shed_order=0)
+
+    results = {}
+    camera = camera_service.subscribe("benchmark")
+    if camera is None:
+        print(f"Could not open {args.source}")
+        return
+    camera.wait_for_frame(timeout=5.0)
+    for state, ceiling in (('active', None), ('idle', args.idle_fps)):
+        scheduler.reset()
+        scheduler.set_ceiling(ceiling)
+        results[state] = run_loop(camera, scheduler, detect, args.seconds)
+    camera.release()
+
+    # Parked: camera released, models dropped, only the minute clock remains
+    detect = None
+    gc.collect()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    while time.perf_counter() - wall_start < args.seconds:
+        time.sleep(min(60.0, args.seconds))
+    results['parked'] = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start) * 3600
+
+    print(f"\n{'state':<10}{'CPU-s/hour':>12}{'vs active':>11}")
+    for state, cpu_per_hour in results.items():
+        print(f"{state:<10}{cpu_per_hour:>12.0f}{cpu_per_hour / results['active'] * 100:>10.0f}%")
+
+
+if __name__ == '__main__':
+    main()
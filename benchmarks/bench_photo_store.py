@@ -0,0 +1,136 @@
+"""
+Checkpoint photo storage: one full-frame JPEG per punch (old layout) versus the packed
+PhotoStore (monthly containers + photo_index), with and without face cropping.
+
+Usage (from the repository root):
+    python benchmarks/bench_photo_store.py [--punches 2000] [--width 1280 --height 720] [--months 3]
+
+Punches are spread over --months months and recorded in a temporary database. For each
+layout, reports write time per photo (encode, write and index), files created, disk use,
+lookup time of a random record's photo (database read included), and the time of a
+retention purge. Containers are purged by whole month, so they keep the photos of a
+partly expired month a little longer than the per-file layout.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+import cv2
+import numpy as np
+
+from utils.photo_store import PhotoStore
+from utils.photo_writer import PhotoWriter
+
+
+def make_frame(width, height, rng):
+    """Camera-like frame with a bright 'face' region; returns (frame, region)."""
+    small = rng.integers(0, 255, (height // 16, width // 16, 3), dtype=np.uint8)
+    frame = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    size = height // 3
+    x, y = int(rng.integers(0, width - size)), int(rng.integers(0, height - size))
+    cv2.circle(frame, (x + size // 2, y + size // 2), size // 2, (180, 200, 230), -1)
+    return frame, (x, y, x + size, y + size)
+
+
+def disk_use(root):
+    files, size = 0, 0
+    for directory, _, names in os.walk(root):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(directory, name))
+    return files, size
+
+
+def backdate(db, record_id, when):
+    """Set the time of a record (punches spread over several months)."""
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute('UPDATE attendance_logs SET timestamp = ? WHERE record_id = ?', (when, record_id))
+
+
+def run(name, db, root, punches, store, crop, frames):
+    writer = PhotoWriter(on_failure=db.clear_photo_path, store=store, crop=crop)
+    records = []
+    write_seconds = 0.0
+    for i, when in enumerate(punches):
+        frame, region = frames[i % len(frames)]
+        if store is not None:
+            path = store.container_path(store.container_name(when))
+        else:
+            path = os.path.join(root, f"EMP{i % 200}", f"{when:%Y%m%d_%H%M%S}_{i}_arrival.jpg")
+        record_id = db.record_attendance(f"EMP{i % 200}", 'IN', 'QR', 'BENCH', photo_path=path)
+        backdate(db, record_id, when)
+        start = time.perf_counter()
+        writer.write(path, frame, region, record_id)  # Synchronously: measures the writer's work
+        write_seconds += time.perf_counter() - start
+        records.append((record_id, path))
+    if store is not None:
+        store.close()
+    files, size = disk_use(root)
+
+    sample = random.Random(1).sample(records, min(200, len(records)))
+    start = time.perf_counter()
+    for record_id, path in sample:
+        if store is not None:
+            data = store.read(record_id)
+        else:
+            # The log row gives the file
+            with sqlite3.connect(db.db_path) as conn:
+                path = conn.execute('SELECT photo_path FROM attendance_logs WHERE record_id = ?',
+                                    (record_id,)).fetchone()[0]
+            with open(path, 'rb') as f:
+                data = f.read()
+        assert data
+    lookup_ms = (time.perf_counter() - start) / len(sample) * 1000
+
+    # Retention: drop the oldest month
+    purge_store = store or PhotoStore(root, db)
+    retention_days = (datetime.now() - punches[0]).days - 31
+    start = time.perf_counter()
+    removed = purge_store.purge(max(1, retention_days))
+    purge_seconds = time.perf_counter() - start
+
+    print(f"{name:<26}{write_seconds / len(punches) * 1000:>9.2f}{files:>8}{size / 1e6:>9.1f}"
+          f"{lookup_ms:>10.2f}{removed:>8}{purge_seconds:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--punches', type=int, default=2000)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--months', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [make_frame(args.width, args.height, rng) for _ in range(20)]
+    now = datetime.now()
+    start = now - timedelta(days=30 * args.months)
+    punches = [start + (now - start) * i / args.punches for i in range(args.punches)]
+
+    print(f"{args.punches} punches over {args.months} months, {args.width}x{args.height}\n")
+    print(f"{'layout':<26}{'write ms':>9}{'files':>8}{'MB':>9}{'lookup ms':>10}{'purged':>8}{'purge s':>9}")
+    cwd = os.getcwd()
+    for name, pack, crop in (("one file per punch", False, False), ("packed", True, False),
+                             ("packed + face crop", True, True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)  # Database keeps its key under ./data
+            try:
+                from database import Database
+                db = Database(os.path.join(tmp, 'data', 'bench.db'))
+                root = os.path.join(tmp, 'photos')
+                run(name, db, root, punches, PhotoStore(root, db) if pack else None, crop, frames)
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Checkpoint photo cost on the punch path: synchronous os.makedirs + cv2.imwrite (old
+path) versus reserving the path and queueing the frame to the PhotoWriter.
+
+Usage (from the repository root):
+    python benchmarks/bench_photo_writer.py [--width 1280 --height 720] [--punches 50] [--quality 95]
+
+Each punch inserts an attendance row into a temporary SQLite database (as
+Database.record_attendance does) and handles the photo; the time measured is what the
+GUI thread spends per punch. Punches are spaced by --interval seconds (0 = burst). The
+asynchronous run also reports how long the worker took to drain the queue and checks
+that a failed write clears the photo_path of its row.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+import cv2
+import numpy as np
+
+from utils.photo_writer import PhotoWriter
+
+
+def percentile(values, q):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def make_frame(width, height):
+    """Camera-like frame: smooth gradients and some texture (compresses like a real scene)."""
+    rng = np.random.default_rng(0)
+    frame = cv2.resize(rng.integers(0, 255, (height // 16, width // 16, 3), dtype=np.uint8), (width, height),
+                       interpolation=cv2.INTER_CUBIC)
+    return cv2.add(frame, rng.integers(0, 12, (height, width, 3), dtype=np.uint8))
+
+
+def insert_row(db_path, photo_path):
+    record_id = str(uuid.uuid4())
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('INSERT INTO attendance_logs (record_id, photo_path) VALUES (?, ?)', (record_id, photo_path))
+        conn.commit()
+    return record_id
+
+
+def clear_photo_path(db_path, record_id):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('UPDATE attendance_logs SET photo_path = NULL WHERE record_id = ?', (record_id,))
+        conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--punches', type=int, default=50)
+    parser.add_argument('--interval', type=float, default=0.2, help='Seconds between punches (0 = burst)')
+    parser.add_argument('--quality', type=int, default=95)
+    parser.add_argument('--max-width', type=int, default=0)
+    args = parser.parse_args()
+
+    frame = make_frame(args.width, args.height)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        with sqlite3.connect(db_path) as conn:
+            conn.execute('CREATE TABLE attendance_logs (record_id TEXT PRIMARY KEY, photo_path TEXT)')
+
+        # Old path: directory, encode and write before the row is inserted
+        sync_times = []
+        for i in range(args.punches):
+            start = time.perf_counter()
+            path = os.path.join(tmp, 'sync', f"EMP{i % 20}", f"{i}_arrival.jpg")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            cv2.imwrite(path, frame, [cv2.IMWRITE_JPEG_QUALITY, args.quality])
+            insert_row(db_path, path)
+            sync_times.append((time.perf_counter() - start) * 1000)
+            time.sleep(args.interval)
+
+        # New path: row inserted with the reserved path, photo queued
+        writer = PhotoWriter(on_failure=lambda record_id: clear_photo_path(db_path, record_id),
+                             quality=args.quality, max_width=args.max_width, max_queue=args.punches).start()
+        async_times = []
+        for i in range(args.punches):
+            start = time.perf_counter()
+            path = os.path.join(tmp, 'async', f"EMP{i % 20}", f"{i}_arrival.jpg")
+            record_id = insert_row(db_path, path)
+            writer.submit(record_id, path, frame)
+            async_times.append((time.perf_counter() - start) * 1000)
+            time.sleep(args.interval)
+        drain_start = time.perf_counter()
+        writer.stop(timeout=60)
+        drain = time.perf_counter() - drain_start
+
+        # Failed write: the parent "directory" is a file
+        blocker = os.path.join(tmp, 'blocker')
+        open(blocker, 'w').close()
+        failing = PhotoWriter(on_failure=lambda record_id: clear_photo_path(db_path, record_id)).start()
+        bad_path = os.path.join(blocker, 'photo.jpg')
+        record_id = insert_row(db_path, bad_path)
+        failing.submit(record_id, bad_path, frame)
+        failing.stop()
+        with sqlite3.connect(db_path) as conn:
+            reconciled = conn.execute('SELECT photo_path FROM attendance_logs WHERE record_id = ?',
+                                      (record_id,)).fetchone()[0] is None
+
+    stats = writer.get_stats()
+    print(f"{args.width}x{args.height}, {args.punches} punches every {args.interval}s, JPEG quality {args.quality}\n")
+    print(f"{'punch path':<28}{'mean ms':>9}{'p95 ms':>9}")
+    print(f"{'sync imwrite':<28}{sum(sync_times) / len(sync_times):>9.2f}{percentile(sync_times, 95):>9.2f}")
+    print(f"{'reserved path + queue':<28}{sum(async_times) / len(async_times):>9.2f}{percentile(async_times, 95):>9.2f}")
+    print(f"\nWorker: {stats['written']} written, {stats['mean_encode_ms']:.1f} ms encode, "
+          f"{stats['mean_kb']:.0f} KB per photo, queue depth max {stats['max_depth']}, "
+          f"{drain * 1000:.0f} ms to drain after the last punch")
+    print(f"Failed write reconciled (photo_path cleared): {reconciled}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+QR decode time per frame: per-frame QRScanner on BGR with every symbology (old path)
+versus the long-lived grayscale, QR-only, downscale-first QRScanner, with and without
+tracking the last code.
+
+Usage (from the repository root):
+    python benchmarks/bench_qr_decode.py [--width 1280 --height 720] [--frames 200] [--empty-ratio 0.7] [--hold 10]
+
+Frames are generated: badge QR codes (qrcode library, employee-like payloads) pasted at
+random positions and sizes (from --min-module to --max-module pixels per module) on a noisy
+background, slightly blurred, mixed with frames without any code (--empty-ratio; most kiosk
+frames show nobody). With --hold N, each badge (or empty scene) stays for N consecutive
+frames with a few pixels of jitter, like a badge held in front of the camera; tracking
+only pays off then. Reports mean / p95 decode time and the share of codes found.
+Requires pyzbar and the zbar library.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+import cv2
+import numpy as np
+import qrcode
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def make_frames(count, width, height, empty_ratio, min_module, max_module, hold=1, seed=0):
+    """Generated frames and the payload each one contains (None for empty frames)."""
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    frames = []
+    payload, code = None, None
+    for i in range(count):
+        if i % hold == 0:
+            # New scene: a badge at a new place, or nobody
+            payload, code = None, None
+            if rng.random() >= empty_ratio:
+                payload = f"EMP{rng.randint(1, 9999):04d}"
+                qr = qrcode.QRCode(box_size=1, border=4)
+                qr.add_data(payload)
+                qr.make(fit=True)
+                modules = np.array(qr.get_matrix(), dtype=np.uint8)
+                module = rng.randint(min_module, max_module)
+                code = np.where(modules, 0, 255).astype(np.uint8)
+                code = cv2.resize(code, (code.shape[1] * module, code.shape[0] * module),
+                                  interpolation=cv2.INTER_NEAREST)
+                if code.shape[0] >= min(width, height) - 8:
+                    payload, code = None, None
+                else:
+                    x, y = rng.randint(4, width - code.shape[0] - 4), rng.randint(4, height - code.shape[0] - 4)
+        frame = np_rng.integers(60, 200, (height, width, 3), dtype=np.uint8)
+        frame = cv2.GaussianBlur(frame, (7, 7), 0)
+        if code is not None:
+            size = code.shape[0]
+            jx, jy = x + rng.randint(-3, 3), y + rng.randint(-3, 3)  # Hand shake
+            frame[jy:jy + size, jx:jx + size] = code[:, :, None]
+            frame = cv2.GaussianBlur(frame, (3, 3), 0)  # Camera softness
+        frames.append((frame, payload))
+    return frames
+
+
+def run(name, scan, frames):
+    latencies, found, expected, false_reads = [], 0, 0, 0
+    scan(frames[0][0])  # Warm-up
+    for frame, payload in frames:
+        start = time.perf_counter()
+        data = scan(frame)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if payload is not None:
+            expected += 1
+            found += data == payload
+        elif data is not None:
+            false_reads += 1
+    print(f"{name:<34}{sum(latencies) / len(latencies):>9.2f}{percentile(latencies, 95):>9.2f}"
+          f"{found:>7}/{expected:<5}{false_reads:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--empty-ratio', type=float, default=0.7)
+    parser.add_argument('--min-module', type=int, default=3, help='Smallest code module size in pixels')
+    parser.add_argument('--max-module', type=int, default=10, help='Largest code module size in pixels')
+    parser.add_argument('--decode-width', type=int, default=640)
+    parser.add_argument('--hold', type=int, default=1, help='Consecutive frames showing the same scene')
+    parser.add_argument('--track-frames', type=int, default=10)
+    args = parser.parse_args()
+
+    from pyzbar.pyzbar import decode
+    from utils.qr_scanner import QRScanner
+
+    frames = make_frames(args.frames, args.width, args.height, args.empty_ratio, args.min_module, args.max_module,
+                         max(1, args.hold))
+
+    def old_path(frame):
+        # Before: a new scanner per frame, BGR frame, every symbology, then filtered
+        for obj in decode(frame):
+            if obj.type == 'QRCODE':
+                return obj.data.decode('utf-8')
+        return None
+
+    gray_scanner = QRScanner(decode_width=0, track_frames=0)
+    scanner = QRScanner(decode_width=args.decode_width, track_frames=0)
+    every_frame = QRScanner(decode_width=args.decode_width, full_retry_interval=1, track_frames=0)
+    tracking = QRScanner(decode_width=args.decode_width, track_frames=args.track_frames)
+
+    print(f"{args.width}x{args.height}, {len(frames)} frames, {args.empty_ratio:.0%} without a code, "
+          f"scenes held {max(1, args.hold)} frames\n")
+    print(f"{'path':<34}{'mean ms':>9}{'p95 ms':>9}{'found':>13}{'false':>7}")
+    run("old (BGR, all symbologies)", old_path, frames)
+    run("gray, QR only, full resolution", gray_scanner.scan_frame, frames)
+    run(f"downscale {args.decode_width} + retry 1/3", scanner.scan_frame, frames)
+    run(f"downscale {args.decode_width} + retry always", every_frame.scan_frame, frames)
+    run(f"... + tracking ({args.track_frames} frames)", tracking.scan_frame, frames)
+    stats = scanner.get_stats()
+    print(f"\nDownscaled decodes found {stats['found_small']}/{stats['found']} codes, "
+          f"{stats['full_retries']} full-resolution retries")
+    stats = tracking.get_stats()
+    print(f"Tracking: {stats['roi_hit_rate'] * 100:.0f}% of {stats['roi_attempts']} crop decodes hit, "
+          f"{stats['decode_area_ratio'] * 100:.0f}% of the frame pixels searched "
+          f"({stats['mean_decode_area'] / 1000:.0f} kpx per frame)")
+
+
+if __name__ == '__main__':
+    main()
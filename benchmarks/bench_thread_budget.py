@@ -0,0 +1,127 @@
+"""
+Benchmark CPU thread budgets for the terminal.
+
+Usage (from the repository root):
+    python benchmarks/bench_thread_budget.py [--iterations 40] [--frame FRAME.jpg]
+
+Each configuration runs in a fresh process (thread pools can only be sized once).
+The worker runs the face pipeline in a loop (detection + embedding on FRAME, or embedding
+only on a synthetic crop) while a second thread simulates the GUI/preview: every 30 ms it
+converts and resizes a 640x480 frame and records how late it was woken up.
+
+Reported per configuration:
+    face p50/p95   latency of one face pipeline iteration (ms)
+    ui late p95    GUI tick lateness (ms) - what the operator perceives as stutter
+Compare the 'kiosk' profile against 'default' (library defaults) and the torch_intra sweep.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def run_worker(config, iterations, frame_path):
+    from utils.thread_budget import THREAD_PROFILES, apply_thread_budget
+    if isinstance(config, dict):
+        THREAD_PROFILES['custom'] = config
+        config = 'custom'
+    apply_thread_budget(config)
+
+    import cv2
+    import numpy as np
+    from utils.face_recognition import FaceRecognition
+
+    recognizer = FaceRecognition()
+    if frame_path:
+        frame = cv2.imread(frame_path)
+        step = lambda: recognizer.detect_and_extract_face(frame)
+    else:
+        crop = np.random.randint(0, 255, (200, 200, 3), dtype=np.uint8)
+        step = lambda: recognizer._extract_embedding(crop, None)
+
+    # Simulated GUI thread: 30 ms preview ticks
+    stop = threading.Event()
+    lateness = []
+
+    def gui_loop():
+        preview = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+        next_tick = time.perf_counter()
+        while not stop.is_set():
+            next_tick += 0.030
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            lateness.append(max(0.0, time.perf_counter() - next_tick) * 1000)
+            cv2.resize(cv2.cvtColor(preview, cv2.COLOR_BGR2RGB), (480, 360))
+
+    step()  # Warm-up
+    gui = threading.Thread(target=gui_loop, daemon=True)
+    gui.start()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        step()
+        latencies.append((time.perf_counter() - start) * 1000)
+    stop.set()
+    gui.join()
+
+    print(json.dumps({
+        'face_p50': percentile(latencies, 50),
+        'face_p95': percentile(latencies, 95),
+        'ui_late_p95': percentile(lateness, 95),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=40)
+    parser.add_argument('--frame', help='Camera frame with one face (runs detection + embedding)')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(json.loads(args.worker), args.iterations, args.frame)
+        return
+
+    cores = os.cpu_count() or 1
+    configs = [('default (library defaults)', 'default'), ('kiosk', 'kiosk'), ('admin batch', 'admin batch')]
+    for threads in sorted({1, 2, 4, cores}):
+        if threads <= cores:
+            configs.append((f'torch_intra={threads}', {'torch_intra': threads, 'torch_inter': 1, 'tf_intra': 1,
+                                                       'tf_inter': 1, 'opencv': 1, 'qt': 2}))
+
+    print(f"{cores} cores, {args.iterations} iterations per configuration\n")
+    print(f"{'configuration':<26}{'face p50':>10}{'face p95':>10}{'ui late p95':>13}")
+    for label, config in configs:
+        command = [sys.executable, os.path.abspath(__file__), '--worker', json.dumps(config),
+                   '--iterations', str(args.iterations)]
+        if args.frame:
+            command += ['--frame', args.frame]
+        env = {k: v for k, v in os.environ.items() if not k.endswith('_NUM_THREADS')
+               and not k.startswith('TF_NUM_')}
+        output = subprocess.run(command, capture_output=True, text=True, env=env)
+        try:
+            result = json.loads(output.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            print(f"{label:<26} failed: {output.stderr.strip().splitlines()[-1:]}")
+            continue
+        print(f"{label:<26}{result['face_p50']:>10.1f}{result['face_p95']:>10.1f}{result['ui_late_p95']:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
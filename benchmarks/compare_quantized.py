@@ -0,0 +1,128 @@
+"""
+Accuracy regression harness: float32 versus int8 FaceNet embeddings.
+
+Usage (from the repository root):
+    python benchmarks/compare_quantized.py --images FACES_DIR [--detect]
+
+FACES_DIR holds one sub-directory per person (FACES_DIR/<person>/<image>).
+Images are used as face crops; with --detect the largest detected face is cropped first.
+The int8 model is the calibrated artifact from export_model.py --int8-calibration when present,
+dynamic quantization otherwise.
+
+Reports:
+    * latency per face (batch 1) for both models and the reduction
+    * embedding drift: cosine similarity between float and int8 embeddings of the same face
+    * match decisions: agreement of accept/reject on every image pair at the terminal threshold
+    * identification accuracy (leave-one-out nearest neighbour) for both models
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.face_recognition import (FaceRecognition, PRECISION_FLOAT, PRECISION_INT8,
+                                    load_recognition_model, preprocess_faces)
+
+
+def load_dataset(image_dir, detector=None):
+    faces, labels = [], []
+    for person in sorted(os.listdir(image_dir)):
+        person_dir = os.path.join(image_dir, person)
+        if not os.path.isdir(person_dir):
+            continue
+        for name in sorted(os.listdir(person_dir)):
+            image = cv2.imread(os.path.join(person_dir, name))
+            if image is None:
+                continue
+            if detector is not None:
+                detections = detector._detect_faces(image)
+                if not detections:
+                    print(f"No face in {person}/{name}, skipped")
+                    continue
+                x1, y1, x2, y2 = max(detections, key=lambda d: (d['bbox'][2] - d['bbox'][0]) *
+                                     (d['bbox'][3] - d['bbox'][1]))['bbox']
+                image = image[max(0, y1):y2, max(0, x1):x2]
+            faces.append(image)
+            labels.append(person)
+    return faces, np.array(labels)
+
+
+def embed(model, faces):
+    """Embed faces one at a time (terminal conditions); returns (embeddings, mean seconds per face)."""
+    inputs = preprocess_faces(faces)
+    with torch.no_grad():
+        model(inputs[:1])  # Warm-up
+        embeddings = []
+        start = time.perf_counter()
+        for i in range(len(faces)):
+            embeddings.append(model(inputs[i:i + 1]).numpy()[0])
+        elapsed = (time.perf_counter() - start) / len(faces)
+    embeddings = np.array(embeddings, dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings, elapsed
+
+
+def identification_accuracy(embeddings, labels):
+    similarity = embeddings @ embeddings.T
+    np.fill_diagonal(similarity, -1.0)
+    return float(np.mean(labels[similarity.argmax(axis=1)] == labels))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', required=True, help='Directory with one sub-directory per person')
+    parser.add_argument('--detect', action='store_true', help='Crop the largest detected face first')
+    parser.add_argument('--threshold', type=float, default=0.5, help='Cosine similarity acceptance threshold')
+    args = parser.parse_args()
+
+    detector = FaceRecognition() if args.detect else None
+    faces, labels = load_dataset(args.images, detector)
+    if len(faces) < 2:
+        sys.exit("Need at least two face images")
+    print(f"{len(faces)} faces, {len(set(labels))} people")
+
+    cpu = torch.device('cpu')
+    float_model, float_source = load_recognition_model(cpu, PRECISION_FLOAT)
+    int8_model, int8_source = load_recognition_model(cpu, PRECISION_INT8)
+
+    float_emb, float_latency = embed(float_model, faces)
+    int8_emb, int8_latency = embed(int8_model, faces)
+
+    print(f"\nLatency per face ({float_source} vs {int8_source}):")
+    print(f"  float: {float_latency * 1000:7.1f} ms")
+    print(f"  int8:  {int8_latency * 1000:7.1f} ms  ({(1 - int8_latency / float_latency) * 100:.1f}% reduction)")
+
+    drift = np.sum(float_emb * int8_emb, axis=1)
+    print("\nEmbedding drift (cosine float vs int8, 1.0 = identical):")
+    print(f"  mean {drift.mean():.4f}  min {drift.min():.4f}  p1 {np.percentile(drift, 1):.4f}")
+
+    pairs = np.triu_indices(len(faces), k=1)
+    float_sim = (float_emb @ float_emb.T)[pairs]
+    int8_sim = (int8_emb @ int8_emb.T)[pairs]
+    float_accept = float_sim > args.threshold
+    int8_accept = int8_sim > args.threshold
+    same = labels[pairs[0]] == labels[pairs[1]]
+    print(f"\nMatch decisions on {len(float_sim)} pairs (threshold {args.threshold}):")
+    print(f"  agreement:           {np.mean(float_accept == int8_accept) * 100:.2f}%")
+    print(f"  similarity shift:    mean |Δ| {np.mean(np.abs(float_sim - int8_sim)):.4f}  "
+          f"max |Δ| {np.max(np.abs(float_sim - int8_sim)):.4f}")
+    if same.any() and (~same).any():
+        print(f"  false rejects float/int8: {np.mean(~float_accept[same]) * 100:.2f}% / "
+              f"{np.mean(~int8_accept[same]) * 100:.2f}%")
+        print(f"  false accepts float/int8: {np.mean(float_accept[~same]) * 100:.2f}% / "
+              f"{np.mean(int8_accept[~same]) * 100:.2f}%")
+
+    print("\nIdentification accuracy (leave-one-out nearest neighbour):")
+    print(f"  float: {identification_accuracy(float_emb, labels) * 100:.2f}%")
+    print(f"  int8:  {identification_accuracy(int8_emb, labels) * 100:.2f}%")
+
+
+if __name__ == '__main__':
+    main()
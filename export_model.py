@@ -0,0 +1,58 @@
+"""
+Export the FaceNet weights to frozen TorchScript artifacts for fast cold start.
+Run after download_weights.py; FaceRecognition loads the artifacts when present.
+
+    python export_model.py                              # float32 artifact
+    python export_model.py --int8-calibration FACES_DIR # also a calibrated int8 artifact
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, "src")
+
+import cv2
+import torch
+from utils.face_recognition import build_recognition_model, export_recognition_model, export_quantized_model
+
+weights_path = "src/models/20180402-114759-vggface2.pt"
+output_path = "src/models/20180402-114759-vggface2.torchscript.pt"
+int8_output_path = "src/models/20180402-114759-vggface2.int8.torchscript.pt"
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--int8-calibration", metavar="FACES_DIR",
+                    help="Directory (searched recursively) of cropped face images used to calibrate the int8 model")
+args = parser.parse_args()
+
+print("Exporting TorchScript model...")
+output_path = export_recognition_model(weights_path, output_path)
+print(f"✅ Compiled model saved to: {output_path}")
+print(f"File size: {os.path.getsize(output_path) / (1024*1024):.2f} MB")
+
+# Compare model-ready time (load + first inference) of both paths
+example = torch.zeros(1, 3, 160, 160)
+start = time.perf_counter()
+model = build_recognition_model(torch.device('cpu'), weights_path)
+with torch.no_grad():
+    model(example)
+print(f"State dict model ready in {time.perf_counter() - start:.2f}s")
+
+start = time.perf_counter()
+model = torch.jit.load(output_path, map_location='cpu').eval()
+with torch.no_grad():
+    model(example)
+print(f"Compiled model ready in {time.perf_counter() - start:.2f}s")
+
+if args.int8_calibration:
+    faces = []
+    for root, _, files in os.walk(args.int8_calibration):
+        for name in sorted(files):
+            image = cv2.imread(os.path.join(root, name))
+            if image is not None:
+                faces.append(image)
+    print(f"Calibrating int8 model on {len(faces)} faces...")
+    int8_output_path = export_quantized_model(faces, weights_path, int8_output_path)
+    print(f"✅ Quantized model saved to: {int8_output_path}")
+    print(f"File size: {os.path.getsize(int8_output_path) / (1024*1024):.2f} MB")
+    print("Check accuracy with: python benchmarks/compare_quantized.py --images FACES_DIR")
@@ -24,6 +24,7 @@ class Database:
     def __init__(self, db_path="data/slat.db"):
         self.db_path = db_path
         self.key_path = "data/key.key"
+        self.employees_revision = 0  # Bumped on every employee change (invalidates the recent-scan cache)
         self._ensure_data_dir()
         self.cipher = self._load_or_create_key()
         self._create_tables()
@@ -101,6 +102,32 @@ class Database:
                 )
             ''')
 
+            # Face templates table (several embeddings per employee, matched together)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS face_templates (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    employee_id TEXT NOT NULL,
+                    embedding BLOB NOT NULL,  -- float32 FaceNet embedding
+                    source TEXT DEFAULT 'ENROLL',  -- 'ENROLL' (admin capture) or 'ADAPTIVE' (added at the kiosk)
+                    quality REAL,  -- Match similarity when the template was added (adaptive only)
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_matched_at TIMESTAMP,  -- Last accepted match (pruning order)
+                    FOREIGN KEY (employee_id) REFERENCES employees(employee_id)
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_face_templates_employee ON face_templates(employee_id)')
+
+            # Photo index (checkpoint photos packed into monthly container files)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS photo_index (
+                    record_id TEXT PRIMARY KEY,  -- attendance_logs.record_id
+                    container TEXT NOT NULL,  -- Container file name, e.g. '2025-03.pack'
+                    offset INTEGER NOT NULL,  -- Byte offset of the JPEG in the container
+                    length INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_photo_index_container ON photo_index(container)')
+
             # Settings table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS settings (
@@ -121,7 +148,47 @@ class Database:
                 ('card_enabled', '1'),
                 ('qr_enabled', '0'),
                 ('face_enabled', '0'),
-                ('attendance_mode', 'qr')  # qr, face, or card
+                ('attendance_mode', 'qr'),  # qr, face, or card
+                # Motion gate in front of the face detector
+                ('motion_gate_enabled', '1'),
+                ('motion_diff_threshold', '12'),  # Grey level change per pixel (0-255)
+                ('motion_min_changed_ratio', '0.01'),  # Fraction of changed pixels = motion
+                ('motion_hold_seconds', '3'),  # Keep detecting this long after last motion
+                # Multi-frame face identification
+                ('face_decision_window', '5'),  # Frames summed in the sliding window
+                ('face_decision_max_frames', '10'),  # Reject after this many undecided frames
+                ('face_decision_margin', '40'),  # Summed confidence needed over the runner-up
+                ('face_model_precision', 'float'),  # float or int8 (quantized, CPU only)
+                ('thread_profile', 'default'),  # CPU thread budget: default (library defaults), kiosk or admin batch
+                ('face_detector', 'auto'),  # auto, mtcnn-torch, mtcnn-tf or yunet
+                # Face templates
+                ('face_max_templates', '5'),  # Templates kept per employee
+                ('face_template_add_confidence', '60'),  # Min match confidence to learn a new template
+                ('face_template_novelty', '0.85'),  # Learn only if no template is this similar (cosine)
+                ('profiling_enabled', '0'),  # Per-stage timing of the face pipeline (F9 dumps it)
+                ('capture_profile_face', '640x480@30 YUYV'),  # Camera format in face mode (validated at open)
+                ('capture_profile_qr', '1280x720@15 MJPG'),  # Camera format in QR mode
+                ('preview_fps', '15'),  # Kiosk preview rate (0 = every frame)
+                ('face_inference_fps', '10'),  # Face analysis rate target (shed first under load)
+                ('qr_decode_fps', '10'),  # QR decoding rate target
+                ('frame_max_load', '0.7'),  # Share of the GUI thread before analysis is shed
+                ('idle_after_seconds', '20'),  # Quiet time before the kiosk drops to the idle rate
+                ('idle_fps', '2'),  # Processing rate while idle (motion wakes it)
+                ('park_outside_windows', '1'),  # Release camera and models outside the working windows
+                ('qr_decode_width', '640'),  # QR decoded on a copy this wide first (0 = full resolution only)
+                ('qr_full_retry_interval', '3'),  # Full-resolution QR retry every N frames without a code
+                ('qr_decode_workers', '1'),  # QR decode threads (frames they cannot keep up with are dropped)
+                ('qr_track_frames', '10'),  # QR decoded around the last code for N frames between full searches (0 = off)
+                ('qr_track_margin', '0.5'),  # Crop margin around the last code, as a share of its size
+                ('scan_cache_ttl', '60'),  # Seconds a QR / card ID lookup and its outcome are remembered
+                ('scan_cache_size', '256'),  # Payloads kept in the recent-scan cache
+                ('badge_workers', '0'),  # Processes rendering badges in bulk (<= 0: relative to the cores)
+                ('photo_jpeg_quality', '95'),  # Checkpoint photo JPEG quality
+                ('photo_max_width', '0'),  # Checkpoint photos downscaled to this width (0 = camera resolution)
+                ('photo_queue_size', '8'),  # Photos waiting to be written before new ones are dropped
+                ('photo_storage', 'files'),  # 'files' (one JPEG per punch) or 'pack' (monthly containers + photo_index)
+                ('photo_crop', '0'),  # Keep only the face / badge region of checkpoint photos
+                ('photo_retention_days', '0')  # Checkpoint photos older than this are purged (0 = keep)
             ]
 
             for key, value in default_settings:
@@ -152,6 +219,17 @@ class Database:
                 conn.commit()
                 print("Database migration completed")
 
+            # Move single enrollment embeddings into face_templates
+            cursor.execute("SELECT COUNT(*) FROM face_templates")
+            if cursor.fetchone()[0] == 0:
+                cursor.execute('''
+                    INSERT INTO face_templates (employee_id, embedding, source)
+                    SELECT employee_id, face_embedding, 'ENROLL' FROM employees WHERE face_embedding IS NOT NULL
+                ''')
+                if cursor.rowcount > 0:
+                    print(f"Migrated {cursor.rowcount} face embeddings to face_templates")
+                conn.commit()
+
     def get_setting(self, key):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
@@ -209,6 +287,62 @@ class Database:
             conn.commit()
             return record_id
 
+    def clear_photo_path(self, record_id):
+        """Remove the photo reference of a record whose photo could not be written
+        (the path is reserved when the punch is recorded, the file written in the background)."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE attendance_logs SET photo_path = NULL WHERE record_id = ?', (record_id,))
+            conn.commit()
+
+    def add_photo_index(self, record_id, container, offset, length):
+        """Locate the packed checkpoint photo of a record"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('INSERT OR REPLACE INTO photo_index (record_id, container, offset, length) VALUES (?, ?, ?, ?)',
+                           (record_id, container, offset, length))
+            conn.commit()
+
+    def get_photo_index(self, record_id):
+        """(container, offset, length) of the packed photo of a record, or None"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT container, offset, length FROM photo_index WHERE record_id = ?', (record_id,))
+            return cursor.fetchone()
+
+    def get_photo_containers(self):
+        """Names of the photo containers that hold indexed photos"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT DISTINCT container FROM photo_index ORDER BY container')
+            return [row[0] for row in cursor.fetchall()]
+
+    def delete_photo_container(self, container):
+        """Drop the index of a photo container and the photo references of its records (retention).
+        Returns: Number of photos dropped
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE attendance_logs SET photo_path = NULL
+                WHERE record_id IN (SELECT record_id FROM photo_index WHERE container = ?)
+            ''', (container,))
+            cursor.execute('DELETE FROM photo_index WHERE container = ?', (container,))
+            conn.commit()
+            return cursor.rowcount
+
+    def get_expired_photo_files(self, cutoff):
+        """(record_id, photo_path) of the records older than cutoff without a photo_index entry
+        (individual photo files, or packed photos that were never written)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT record_id, photo_path FROM attendance_logs
+                WHERE photo_path IS NOT NULL AND timestamp < ?
+                  AND record_id NOT IN (SELECT record_id FROM photo_index)
+            ''', (cutoff,))
+            return cursor.fetchall()
+
     def correct_attendance(self, original_record_id, operator_id, correction_reason, new_type=None, new_timestamp=None):
         """Correct an attendance record by creating a new entry (immutable audit trail)"""
         with sqlite3.connect(self.db_path) as conn:
@@ -262,6 +396,7 @@ class Database:
                     VALUES (?, ?, 1, ?, ?)
                 ''', (employee_id, name, qr_code, face_embedding))
                 conn.commit()
+                self.employees_revision += 1
                 return True
             except sqlite3.IntegrityError:
                 return False
@@ -272,12 +407,95 @@ class Database:
             cursor = conn.cursor()
             cursor.execute('UPDATE employees SET qr_code = ? WHERE employee_id = ?', (qr_code, employee_id))
             conn.commit()
+        self.employees_revision += 1
     
-    def update_employee_face(self, employee_id, face_embedding):
-        """Update employee face embedding"""
+    def assign_qr_codes(self, employee_ids):
+        """Give each employee its ID as QR code, in one transaction (bulk badge generation).
+        Returns: Number of employees updated
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('UPDATE employees SET qr_code = ? WHERE employee_id = ?',
+                               [(employee_id, employee_id) for employee_id in employee_ids])
+            conn.commit()
+            updated = cursor.rowcount
+        self.employees_revision += 1
+        return updated
+
+    def update_employee_face(self, employee_id, face_embedding, replace=True):
+        """Update employee face embedding and its enrollment template.
+        Args:
+            replace: True replaces every template of the employee, False adds one
+                (e.g. a second profile with glasses)
+        """
+        max_templates = self.get_setting('face_max_templates') or 5
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('UPDATE employees SET face_embedding = ? WHERE employee_id = ?', (face_embedding, employee_id))
+            if replace:
+                cursor.execute('DELETE FROM face_templates WHERE employee_id = ?', (employee_id,))
+            cursor.execute('INSERT INTO face_templates (employee_id, embedding, source) VALUES (?, ?, ?)',
+                           (employee_id, face_embedding, 'ENROLL'))
+            if not replace:
+                self._prune_face_templates(cursor, employee_id, max_templates)
+            conn.commit()
+        self.employees_revision += 1
+
+    def add_face_template(self, employee_id, embedding, source='ADAPTIVE', quality=None, max_templates=5):
+        """Add a face template and prune the employee's templates to max_templates.
+        Pruning keeps enrollment templates first, then the most recently matched ones.
+        Returns: ID of the new template
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO face_templates (employee_id, embedding, source, quality, last_matched_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (employee_id, embedding, source, quality, datetime.now()))
+            template_id = cursor.lastrowid
+            self._prune_face_templates(cursor, employee_id, max_templates)
+            conn.commit()
+            return template_id
+
+    def _prune_face_templates(self, cursor, employee_id, max_templates):
+        """Delete the employee's templates beyond max_templates (least useful first)."""
+        cursor.execute('''
+            DELETE FROM face_templates WHERE employee_id = ? AND id NOT IN (
+                SELECT id FROM face_templates WHERE employee_id = ?
+                ORDER BY source = 'ENROLL' DESC, COALESCE(last_matched_at, created_at) DESC, id DESC
+                LIMIT ?
+            )
+        ''', (employee_id, employee_id, max(1, int(max_templates))))
+        return cursor.rowcount
+
+    def get_face_templates(self):
+        """Get all face templates grouped by employee.
+        Returns: List of (template_id, employee_id, embedding_bytes) ordered by employee_id
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT id, employee_id, embedding FROM face_templates ORDER BY employee_id, id')
+            return cursor.fetchall()
+
+    def get_face_templates_revision(self):
+        """Cheap change marker of face_templates (count, highest id); changes on every add or delete."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*), MAX(id) FROM face_templates')
+            return cursor.fetchone()
+
+    def count_face_templates(self, employee_id):
+        """Number of face templates of an employee"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM face_templates WHERE employee_id = ?', (employee_id,))
+            return cursor.fetchone()[0]
+
+    def touch_face_template(self, template_id):
+        """Record that a template produced an accepted match (keeps it from being pruned)."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE face_templates SET last_matched_at = ? WHERE id = ?', (datetime.now(), template_id))
             conn.commit()
     
     def generate_qr_code(self, employee_id):
@@ -327,6 +545,7 @@ class Database:
             cursor = conn.cursor()
             cursor.execute('UPDATE employees SET enabled = ? WHERE employee_id = ?', (int(enabled), employee_id))
             conn.commit()
+        self.employees_revision += 1
 
     def update_employee_name(self, employee_id, new_name):
         """Update employee name"""
@@ -334,6 +553,7 @@ class Database:
             cursor = conn.cursor()
             cursor.execute('UPDATE employees SET name = ? WHERE employee_id = ?', (new_name, employee_id))
             conn.commit()
+            self.employees_revision += 1
             return cursor.rowcount > 0
 
     def get_all_logs(self, limit=None):
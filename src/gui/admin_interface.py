@@ -17,10 +17,16 @@ import base64
 import calendar
 
 class EmployeeProfileDialog(QDialog):
-    def __init__(self, db, employee_id):
+    def __init__(self, db, employee_id, face_recognizer=None):
+        """
+        Args:
+            face_recognizer: Loaded FaceRecognition to enroll with (the terminal's); loaded on
+                first use otherwise
+        """
         super().__init__()
         self.db = db
         self.employee_id = employee_id
+        self.face_recognizer = face_recognizer
         self.employee = self.db.get_employee(employee_id)
         
         if not self.employee:
@@ -82,14 +88,19 @@ class EmployeeProfileDialog(QDialog):
         face_layout = QHBoxLayout()
         face_layout.addWidget(QLabel("Reconnaissance faciale :"))
         
-        self.face_status = QLabel("Non défini" if not self.employee.face_embedding else "Défini")
-        self.face_status.setStyleSheet("color: red;" if not self.employee.face_embedding else "color: green;")
+        self.face_status = QLabel()
         face_layout.addWidget(self.face_status)
         
         self.set_face_btn = QPushButton("Définir visage")
-        self.set_face_btn.clicked.connect(self.set_face)
+        self.set_face_btn.clicked.connect(lambda: self.set_face())
         face_layout.addWidget(self.set_face_btn)
         
+        # Extra profile (glasses, other lighting) matched alongside the existing ones
+        self.add_face_btn = QPushButton("Ajouter un visage")
+        self.add_face_btn.clicked.connect(lambda: self.set_face(replace=False))
+        face_layout.addWidget(self.add_face_btn)
+        self.update_face_status()
+        
         methods_layout.addLayout(face_layout)
         
         methods_group.setLayout(methods_layout)
@@ -190,11 +201,28 @@ class EmployeeProfileDialog(QDialog):
             qr_pixmap.save(filename, "PNG")
             QMessageBox.information(self, "Succès", f"Code QR enregistré dans {filename}")
     
-    def set_face(self):
-        """Capture and set face image for employee using camera."""
+    def update_face_status(self):
+        """Show whether a face profile is defined and how many templates it has"""
+        template_count = self.db.count_face_templates(self.employee_id)
+        if template_count:
+            self.face_status.setText(f"Défini ({template_count} modèle{'s' if template_count > 1 else ''})")
+            self.face_status.setStyleSheet("color: green;")
+        else:
+            self.face_status.setText("Non défini")
+            self.face_status.setStyleSheet("color: red;")
+        self.add_face_btn.setEnabled(template_count > 0)
+    
+    def set_face(self, replace=True):
+        """Capture and set face image for employee using camera.
+        Args:
+            replace: False adds the capture as an extra face template instead of replacing the profile
+        """
         from utils.face_recognition import FaceRecognition
         
-        face_rec = FaceRecognition()
+        # Models are loaded once per dialog at most (the terminal's when face mode is enabled)
+        if self.face_recognizer is None:
+            self.face_recognizer = FaceRecognition.from_settings(self.db)
+        face_rec = self.face_recognizer
         
         # Test camera availability
         if not face_rec.test_camera():
@@ -211,8 +239,9 @@ class EmployeeProfileDialog(QDialog):
                                "4. Attendez que la qualité soit excellente (>80%)\n"
                                "5. Appuyez sur ESPACE pour capturer\n"
                                "6. Appuyez sur Q pour annuler\n\n"
-                               "Conseil : Bon éclairage = meilleure reconnaissance\n"
-                               "L'ancien profil facial sera remplacé.",
+                               "Conseil : Bon éclairage = meilleure reconnaissance\n" +
+                               ("L'ancien profil facial sera remplacé." if replace else
+                                "Ce visage sera ajouté au profil existant (ex. avec lunettes)."),
                                QMessageBox.Ok)
         
         # Capture face with quality validation
@@ -234,16 +263,15 @@ class EmployeeProfileDialog(QDialog):
             
             # Store in database
             old_face_existed = self.employee.face_embedding is not None
-            self.db.update_employee_face(self.employee_id, embedding_bytes)
+            self.db.update_employee_face(self.employee_id, embedding_bytes, replace=replace)
             
             # Log the action
-            action_type = "redéfini" if old_face_existed else "défini"
+            action_type = "ajouté" if not replace else "redéfini" if old_face_existed else "défini"
             print(f"Face {action_type} for employee {self.employee_id} - {self.employee.name}")
             
             # Refresh employee data
             self.employee = self.db.get_employee(self.employee_id)
-            self.face_status.setText("Défini")
-            self.face_status.setStyleSheet("color: green;")
+            self.update_face_status()
             
             QMessageBox.information(self, "Succès", 
                                    f"✓ Visage {action_type} avec succès\n\n"
@@ -378,6 +406,23 @@ class AdminInterface(QWidget):
         generate_all_qr_btn.clicked.connect(self.generate_all_qr_codes)
         bulk_layout.addWidget(generate_all_qr_btn)
         
+        badge_sheet_btn = QPushButton("📄 Planches de badges (PDF)")
+        badge_sheet_btn.setToolTip("Créer un PDF A4 prêt à imprimer avec plusieurs badges par page")
+        badge_sheet_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #3498DB;
+                color: white;
+                padding: 8px 16px;
+                font-weight: bold;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #2980B9;
+            }
+        """)
+        badge_sheet_btn.clicked.connect(self.generate_badge_sheets)
+        bulk_layout.addWidget(badge_sheet_btn)
+        
         bulk_layout.addStretch()  # Push button to the left
         layout.addLayout(bulk_layout)
 
@@ -390,6 +435,8 @@ class AdminInterface(QWidget):
         layout.addWidget(self.employee_table)
 
     def setup_settings_tab(self):
+        from utils.capture_profile import DEFAULT_PROFILES, MODE_FACE, MODE_QR, PROFILE_PRESETS
+        
         # Create main layout
         main_layout = QVBoxLayout()
         self.settings_tab.setLayout(main_layout)
@@ -525,6 +572,81 @@ class AdminInterface(QWidget):
 
         layout.addLayout(methods_layout)
         
+        # Performance Section
+        performance_group = QGroupBox("⚙️ Performance")
+        performance_layout = QVBoxLayout()
+        
+        precision_desc = QLabel("Précision du modèle de reconnaissance faciale. Le mode INT8 est plus rapide\n"
+                                "sur les terminaux sans GPU, avec une légère dérive des scores.")
+        precision_desc.setWordWrap(True)
+        precision_desc.setStyleSheet("color: #7F8C8D; font-size: 11px; padding: 5px;")
+        performance_layout.addWidget(precision_desc)
+        
+        self.precision_combo = QComboBox()
+        self.precision_combo.addItem("Float32 (référence)", "float")
+        self.precision_combo.addItem("INT8 quantifié (CPU)", "int8")
+        self.precision_combo.setCurrentIndex(1 if self.db.get_setting('face_model_precision') == 'int8' else 0)
+        performance_layout.addWidget(self.precision_combo)
+        
+        threads_desc = QLabel("Répartition des threads CPU (PyTorch, TensorFlow, OpenCV, Qt).\n"
+                              "« Borne » laisse des cœurs libres pour l'affichage et la caméra.")
+        threads_desc.setWordWrap(True)
+        threads_desc.setStyleSheet("color: #7F8C8D; font-size: 11px; padding: 5px;")
+        performance_layout.addWidget(threads_desc)
+        
+        self.thread_profile_combo = QComboBox()
+        self.thread_profile_combo.addItem("Par défaut (bibliothèques)", "default")
+        self.thread_profile_combo.addItem("Borne (kiosk)", "kiosk")
+        self.thread_profile_combo.addItem("Traitement par lots (admin batch)", "admin batch")
+        self.thread_profile_combo.setCurrentIndex(max(0, self.thread_profile_combo.findData(self.db.get_setting('thread_profile'))))
+        performance_layout.addWidget(self.thread_profile_combo)
+        
+        detector_desc = QLabel("Détecteur de visages. « Automatique » utilise MTCNN TensorFlow s'il est installé,\n"
+                               "sinon YuNet si son modèle est présent, sinon MTCNN PyTorch.\n"
+                               "Changer de détecteur impose de réenregistrer les visages des employés.")
+        detector_desc.setWordWrap(True)
+        detector_desc.setStyleSheet("color: #7F8C8D; font-size: 11px; padding: 5px;")
+        performance_layout.addWidget(detector_desc)
+        
+        self.detector_combo = QComboBox()
+        self.detector_combo.addItem("Automatique", "auto")
+        self.detector_combo.addItem("MTCNN (PyTorch)", "mtcnn-torch")
+        self.detector_combo.addItem("MTCNN (TensorFlow)", "mtcnn-tf")
+        self.detector_combo.addItem("YuNet (OpenCV)", "yunet")
+        index = self.detector_combo.findData(self.db.get_setting('face_detector'))
+        self.detector_combo.setCurrentIndex(max(0, index))
+        performance_layout.addWidget(self.detector_combo)
+        
+        capture_desc = QLabel("Format de capture de la caméra (résolution@images/s format) pour chaque mode.\n"
+                              "Vérifié à l'ouverture : si la caméra le refuse, le format réel est journalisé.")
+        capture_desc.setWordWrap(True)
+        capture_desc.setStyleSheet("color: #7F8C8D; font-size: 11px; padding: 5px;")
+        performance_layout.addWidget(capture_desc)
+        
+        capture_layout = QHBoxLayout()
+        self.capture_profile_combos = {}
+        for mode, label in ((MODE_FACE, "Visage :"), (MODE_QR, "QR :")):
+            combo = QComboBox()
+            combo.setEditable(True)  # Presets, or any WIDTHxHEIGHT@FPS FOURCC
+            combo.addItems(PROFILE_PRESETS)
+            combo.setCurrentText(self.db.get_setting(f'capture_profile_{mode}') or DEFAULT_PROFILES[mode])
+            capture_layout.addWidget(QLabel(label))
+            capture_layout.addWidget(combo)
+            self.capture_profile_combos[mode] = combo
+        performance_layout.addLayout(capture_layout)
+        
+        preview_layout = QHBoxLayout()
+        preview_layout.addWidget(QLabel("Aperçu caméra (images/s, 0 = toutes) :"))
+        self.preview_fps_spin = QSpinBox()
+        self.preview_fps_spin.setRange(0, 60)
+        self.preview_fps_spin.setValue(int(self.db.get_setting('preview_fps') or 15))
+        preview_layout.addWidget(self.preview_fps_spin)
+        preview_layout.addStretch()
+        performance_layout.addLayout(preview_layout)
+        
+        performance_group.setLayout(performance_layout)
+        layout.addWidget(performance_group)
+        
         # Security Section
         security_group = QGroupBox("🔒 Sécurité")
         security_layout = QVBoxLayout()
@@ -2300,7 +2422,7 @@ class AdminInterface(QWidget):
 
     def view_profile(self, employee_id):
         """Open employee profile dialog"""
-        dialog = EmployeeProfileDialog(self.db, employee_id)
+        dialog = EmployeeProfileDialog(self.db, employee_id, face_recognizer=self.public.face_recognizer)
         dialog.exec_()
         # Refresh the table after dialog closes
         self.load_employees()
@@ -2371,9 +2493,10 @@ class AdminInterface(QWidget):
         )
         
         if reply == QMessageBox.Yes:
+            import time
             import zipfile
-            from io import BytesIO
-            from utils.qr_generator import generate_qr_with_text
+            from PyQt5.QtWidgets import QApplication, QProgressDialog
+            from utils.qr_generator import generate_badges
             
             # Choose save location for ZIP file
             zip_filename, _ = QFileDialog.getSaveFileName(
@@ -2386,31 +2509,49 @@ class AdminInterface(QWidget):
             if not zip_filename:
                 return
             
+            progress = QProgressDialog("Génération des codes QR...", "Annuler", 0, len(employees), self)
+            progress.setWindowTitle("Codes QR")
+            progress.setWindowModality(Qt.WindowModal)
+            progress.setMinimumDuration(0)
+            
             try:
+                start = time.perf_counter()
                 generated_count = 0
                 errors = []
+                cancelled = False
+                
+                # Employees without a code get their ID as QR code, all in one transaction
+                missing = [emp.employee_id for emp in employees if not emp.qr_code]
+                if missing:
+                    self.db.assign_qr_codes(missing)
                 
+                # Badges are rendered on a process pool and written to the ZIP as they complete
+                badges = generate_badges([(emp.employee_id, emp.name) for emp in employees],
+                                         workers=int(self.db.get_setting('badge_workers') or 0))
                 with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for emp in employees:
-                        try:
-                            # Generate QR with text overlay
-                            qr_bytes = generate_qr_with_text(emp.employee_id, emp.name)
-                            
+                    for done, (employee_id, name, qr_bytes, error) in enumerate(badges, 1):
+                        if error is not None:
+                            errors.append(f"{name}: {error}")
+                        else:
                             # Add to ZIP with filename like "QR_FP-123456_Name.png"
-                            safe_name = emp.name.replace(' ', '_').replace('/', '_')
-                            filename = f"QR_{emp.employee_id}_{safe_name}.png"
+                            safe_name = name.replace(' ', '_').replace('/', '_')
+                            filename = f"QR_{employee_id}_{safe_name}.png"
                             zipf.writestr(filename, qr_bytes)
-                            
-                            # Also save to database if not exists
-                            if not emp.qr_code:
-                                self.db.generate_qr_code(emp.employee_id)
-                            
                             generated_count += 1
-                        except Exception as e:
-                            errors.append(f"{emp.name}: {str(e)}")
+                        
+                        progress.setValue(done)
+                        QApplication.processEvents()
+                        if progress.wasCanceled():
+                            cancelled = True
+                            badges.close()  # Stops the pool
+                            break
+                progress.close()
+                print(f"Badges: {generated_count} generated in {time.perf_counter() - start:.1f}s")
                 
                 # Show results
                 message = f"Fichier ZIP créé avec succès : {zip_filename}\n\nCodes QR générés : {generated_count}"
+                if cancelled:
+                    message += f" sur {len(employees)} (annulé)"
                 if errors:
                     message += f"\n\nErreurs ({len(errors)}) :\n" + "\n".join(errors)
                 
@@ -2418,13 +2559,67 @@ class AdminInterface(QWidget):
                 self.load_employees()
                 
             except Exception as e:
+                progress.close()
                 QMessageBox.critical(self, "Erreur", f"Échec de création du fichier ZIP : {str(e)}")
     
+    def generate_badge_sheets(self):
+        """Create a print-ready A4 PDF of every employee badge (vector QR codes, several per page)"""
+        import time
+        from PyQt5.QtWidgets import QApplication, QProgressDialog
+        from utils.qr_generator import generate_badge_sheets
+        
+        employees = self.db.get_all_employees()
+        if not employees:
+            QMessageBox.information(self, "Info", "Aucun employé trouvé.")
+            return
+        
+        pdf_filename, _ = QFileDialog.getSaveFileName(
+            self,
+            "Enregistrer les planches de badges",
+            "Badges_Employes.pdf",
+            "PDF Files (*.pdf)"
+        )
+        if not pdf_filename:
+            return
+        
+        progress = QProgressDialog("Création des planches de badges...", "Annuler", 0, len(employees), self)
+        progress.setWindowTitle("Badges")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        
+        def on_page(done):
+            progress.setValue(done)
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+        
+        try:
+            start = time.perf_counter()
+            # Employees without a code get their ID as QR code, all in one transaction
+            missing = [emp.employee_id for emp in employees if not emp.qr_code]
+            if missing:
+                self.db.assign_qr_codes(missing)
+            
+            count = generate_badge_sheets(((emp.employee_id, emp.name) for emp in employees), pdf_filename,
+                                          workers=int(self.db.get_setting('badge_workers') or 0),
+                                          progress=on_page)
+            progress.close()
+            print(f"Badge sheets: {count} badges in {time.perf_counter() - start:.1f}s")
+            
+            message = f"PDF créé avec succès : {pdf_filename}\n\nBadges : {count}"
+            if count < len(employees):
+                message += f" sur {len(employees)} (annulé)"
+            QMessageBox.information(self, "Succès", message)
+            self.load_employees()
+        except Exception as e:
+            progress.close()
+            QMessageBox.critical(self, "Erreur", f"Échec de création du PDF : {str(e)}")
+    
     def set_face(self, employee_id):
         """Set face image for employee using camera"""
         from utils.face_recognition import FaceRecognition
         
-        face_rec = FaceRecognition()
+        # Reuse the terminal's loaded models when face mode is enabled
+        face_rec = self.public.face_recognizer if self.public.face_recognizer is not None else FaceRecognition.from_settings(self.db)
         
         # Get employee info
         emp = self.db.get_employee(employee_id)
@@ -2564,11 +2759,25 @@ class AdminInterface(QWidget):
                                               "Le nouveau mot de passe sera requis lors de la prochaine connexion.")
 
     def save_settings(self):
+        from utils.camera_service import camera_service
+        from utils.capture_profile import CaptureProfile
+        
+        # Validate the capture profiles before saving anything
+        capture_profiles = {}
+        for mode, combo in self.capture_profile_combos.items():
+            try:
+                capture_profiles[mode] = CaptureProfile.parse(combo.currentText())
+            except ValueError as e:
+                QMessageBox.warning(self, "Erreur", str(e))
+                return
+
         # Save time windows
         self.db.update_setting('morning_start', self.morning_start.time().toString('HH:mm'))
         self.db.update_setting('morning_end', self.morning_end.time().toString('HH:mm'))
         self.db.update_setting('afternoon_start', self.afternoon_start.time().toString('HH:mm'))
         self.db.update_setting('afternoon_end', self.afternoon_end.time().toString('HH:mm'))
+        # Cached "already punched" outcomes were decided against the old windows
+        self.public.scan_cache.clear()
         
         # Save official work hours
         self.db.update_setting('official_start_time', self.official_start_time.time().toString('HH:mm'))
@@ -2583,36 +2792,33 @@ class AdminInterface(QWidget):
         self.db.update_setting('qr_enabled', '1' if self.qr_enabled.isChecked() else '0')
         self.db.update_setting('face_enabled', '1' if self.face_enabled.isChecked() else '0')
 
+        # Save performance settings
+        self.db.update_setting('face_model_precision', self.precision_combo.currentData())
+        self.db.update_setting('thread_profile', self.thread_profile_combo.currentData())
+        self.db.update_setting('face_detector', self.detector_combo.currentData())
+        for mode, profile in capture_profiles.items():
+            self.db.update_setting(f'capture_profile_{mode}', profile.spec if profile is not None else 'auto')
+        camera_service.configure_profiles(capture_profiles)
+        self.db.update_setting('preview_fps', str(self.preview_fps_spin.value()))
+
         QMessageBox.information(self, "Succès", "Paramètres enregistrés avec succès.\n\n⚠ Redémarrez le terminal de présence pour appliquer le nouveau mode.")
 
     def test_camera(self):
         """Test camera availability with robust initialization"""
-        import cv2
-        
-        # Try different camera indices
-        for camera_index in [0, 1, 2]:
-            try:
-                cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-                
-                if cap.isOpened():
-                    # Test if we can actually read frames
-                    ret, test_frame = cap.read()
-                    if ret and test_frame is not None:
-                        cap.release()
-                        QMessageBox.information(self, "Test caméra réussi", 
-                                              f"✅ Caméra détectée sur l'index {camera_index}\n\n"
-                                              f"Résolution: {test_frame.shape[1]}x{test_frame.shape[0]}\n\n"
-                                              f"Le mode QR et Reconnaissance Faciale devraient fonctionner.")
-                        return
-                    else:
-                        cap.release()
-                        continue
-                else:
-                    continue
-                    
-            except Exception as e:
-                print(f"Failed to initialize camera {camera_index}: {e}")
-                continue
+        from utils.camera_service import camera_service
+        
+        # Shared camera (already open if the terminal is in a camera session)
+        cap = camera_service.subscribe("camera test")
+        if cap is not None:
+            ret, test_frame = cap.read()
+            location = f"sur l'index {cap.index}" if cap.index is not None else f"({cap.name})"
+            cap.release()
+            if ret and test_frame is not None:
+                QMessageBox.information(self, "Test caméra réussi", 
+                                      f"✅ Caméra détectée {location}\n\n"
+                                      f"Résolution: {test_frame.shape[1]}x{test_frame.shape[0]}\n\n"
+                                      f"Le mode QR et Reconnaissance Faciale devraient fonctionner.")
+                return
         
         # If all cameras failed
         QMessageBox.warning(self, "Test caméra échoué", 
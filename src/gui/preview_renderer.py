@@ -0,0 +1,87 @@
+"""
+Camera preview rendering for the kiosk.
+Scales each frame once, in OpenCV, straight to the label size into a reused buffer
+and hands that buffer to Qt as a BGR888 QImage (no color conversion, no full-size
+QImage/QPixmap, no Qt rescale). The preview can be capped below the capture rate;
+frames in between are processed but not drawn.
+"""
+
+import time
+from typing import Dict
+
+import cv2
+import numpy as np
+from PyQt5.QtGui import QImage, QPixmap
+
+from utils.profiling import profiler
+
+# Qt >= 5.14 reads BGR bytes directly; older versions need an RGB conversion
+_BGR888 = getattr(QImage, 'Format_BGR888', None)
+
+
+class PreviewRenderer:
+    def __init__(self, label, max_fps: float = 15.0):
+        """
+        Args:
+            label: QLabel showing the preview (its size is the render size)
+            max_fps: Highest preview rate (0 = draw every frame)
+        """
+        self.label = label
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self._buffer = None  # Label-sized frame, reused while the sizes do not change
+        self._last_render = None
+
+        # Metrics
+        self.rendered = 0
+        self.skipped = 0
+        self.render_seconds = 0.0
+
+    def _target_size(self, width: int, height: int):
+        """Largest size fitting the label with the frame's aspect ratio."""
+        label_size = self.label.size()
+        scale = min(label_size.width() / width, label_size.height() / height)
+        return max(1, int(width * scale)), max(1, int(height * scale))
+
+    def render(self, frame: np.ndarray, force: bool = False) -> bool:
+        """Draw a BGR frame in the label unless the preview rate cap says to skip it.
+        Args:
+            force: Draw even if the previous preview is recent (results the user must see)
+        Returns: True if the frame was drawn
+        """
+        now = time.monotonic()
+        if not force and self._last_render is not None and now - self._last_render < self.min_interval:
+            self.skipped += 1
+            return False
+        self._last_render = now
+
+        with profiler.stage('preview'):
+            height, width = frame.shape[:2]
+            target_width, target_height = self._target_size(width, height)
+            if self._buffer is None or self._buffer.shape[:2] != (target_height, target_width):
+                self._buffer = np.empty((target_height, target_width, 3), dtype=np.uint8)
+
+            interpolation = cv2.INTER_AREA if target_width < width else cv2.INTER_LINEAR
+            cv2.resize(frame, (target_width, target_height), dst=self._buffer, interpolation=interpolation)
+            if _BGR888 is not None:
+                image = QImage(self._buffer.data, target_width, target_height, self._buffer.strides[0], _BGR888)
+            else:
+                cv2.cvtColor(self._buffer, cv2.COLOR_BGR2RGB, dst=self._buffer)
+                image = QImage(self._buffer.data, target_width, target_height, self._buffer.strides[0],
+                               QImage.Format_RGB888)
+            # fromImage copies the label-sized pixels, so the buffer can be reused for the next frame
+            self.label.setPixmap(QPixmap.fromImage(image))
+
+        self.rendered += 1
+        self.render_seconds += time.monotonic() - now
+        return True
+
+    def reset(self):
+        """Draw the next frame immediately (e.g. after the camera was activated)."""
+        self._last_render = None
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'rendered': self.rendered,
+            'skipped': self.skipped,
+            'mean_render_ms': self.render_seconds / self.rendered * 1000 if self.rendered else 0.0,
+        }
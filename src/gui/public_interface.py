@@ -6,9 +6,11 @@ Le mode est défini par l'admin, la caméra est toujours active, pas d'interacti
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
                              QPushButton, QMessageBox, QSpacerItem, QSizePolicy, QInputDialog)
 from PyQt5.QtCore import Qt, QTimer, QDateTime, pyqtSignal
-from PyQt5.QtGui import QFont, QPalette, QColor, QPixmap, QImage, QPainter, QPen
+from PyQt5.QtGui import QFont, QPalette, QColor, QPixmap, QPainter, QPen
 import datetime
+import gc
 import os
+import time
 import cv2
 import numpy as np
 import hashlib
@@ -16,17 +18,40 @@ import winsound
 from pathlib import Path
 from database import Database
 from utils.qr_scanner import QRScanner
+from utils.qr_worker import QRDecodeWorker
+from utils.scan_cache import RecentScanCache
+from utils.photo_writer import PhotoWriter
+from utils.photo_store import PhotoStore, polygon_region
 from utils.face_recognition import FaceRecognition
+from utils.motion_gate import MotionGate
+from utils.face_decision import TemporalIdentifier, FaceDecision
+from utils.face_gallery import FaceGallery
+from utils.camera_manager import camera_manager
+from utils.camera_service import camera_service
+from utils.capture_profile import load_capture_profiles
+from utils.profiling import profiler
+from utils.session_stats import format_session_stats
+from utils.frame_scheduler import FrameScheduler
+from utils.idle_controller import IdleController, ACTIVE, IDLE, PARKED
+from gui.preview_renderer import PreviewRenderer
 
 class PublicInterface(QWidget):
     def __init__(self):
         super().__init__()
         self.db = Database()
-        # Initialize face recognizer only if face recognition is enabled
-        if self.db.get_setting('face_enabled') == '1':
-            self.face_recognizer = FaceRecognition()
-        else:
-            self.face_recognizer = None
+        profiler.enabled = self.db.get_setting('profiling_enabled') == '1'
+        camera_service.configure_profiles(load_capture_profiles(self.db))  # Face / QR capture formats
+        # Power state: full rate, low rate after a quiet period, parked outside the working windows
+        self.idle_controller = IdleController(
+            idle_after_seconds=float(self.db.get_setting('idle_after_seconds')),
+            park_outside_windows=self.db.get_setting('park_outside_windows') == '1'
+        )
+        self.idle_fps = float(self.db.get_setting('idle_fps'))
+        self.idle_controller.update(self.is_in_working_window())
+        # Initialize face recognizer only if face recognition is enabled (loaded when unparked)
+        self.face_recognizer = None
+        if self.idle_controller.state != PARKED:
+            self.load_face_models()
         self.setWindowTitle("SLAT - Terminal de Présence")
         self.showFullScreen()
         self.f11_press_count = 0
@@ -34,12 +59,37 @@ class PublicInterface(QWidget):
         self.f11_reset_timer.timeout.connect(self.reset_f11_count)
         
         # Camera and scanning state
-        self.camera = None
-        self.camera_timer = QTimer()
-        self.camera_timer.timeout.connect(self.process_camera_frame)
-        self.last_scan_time = None
-        self.scan_cooldown = 3  # seconds between scans
+        self.camera = None  # Subscription to the shared camera service
+        self.activation_started = None  # perf_counter() of the last activation, until its first frame
+        self.camera_timer = QTimer()  # Single shot, rescheduled for the next due stage
+        self.camera_timer.setSingleShot(True)
+        self.camera_timer.timeout.connect(self.on_camera_tick)
+        self.frame_scheduler = self.create_frame_scheduler()  # Per-stage rates, sheds inference first
+        self.overlay = []  # Drawing calls of the last analyzed frame, replayed on the frames in between
+        self.recent_scans = {}  # ('qr', payload) / ('face', employee_id) -> time.monotonic() it was handled
+        self.scan_cooldown = 3  # seconds before the same code or face is handled again
         self.current_frame = None  # Store current frame for photo capture
+        self.qr_worker = None  # Decodes QR codes off the GUI thread while the camera is active in QR mode
+        self.scan_cache = RecentScanCache(  # Repeated QR / card ID scans answered without the database
+            ttl_seconds=float(self.db.get_setting('scan_cache_ttl')),
+            max_entries=int(self.db.get_setting('scan_cache_size'))
+        )
+        self.motion_gate = self.create_motion_gate()  # Skips face detection on static scenes
+        self.wake_detector = MotionGate(  # Motion in front of the camera wakes the idle terminal
+            diff_threshold=int(self.db.get_setting('motion_diff_threshold')),
+            min_changed_ratio=float(self.db.get_setting('motion_min_changed_ratio'))
+        )
+        self.face_identifier = TemporalIdentifier(  # Multi-frame decision for face mode
+            window_frames=int(self.db.get_setting('face_decision_window')),
+            max_frames=int(self.db.get_setting('face_decision_max_frames')),
+            decisive_margin=float(self.db.get_setting('face_decision_margin'))
+        )
+        self.face_gallery = FaceGallery(  # All face templates, matched in one vectorized pass
+            self.db,
+            max_templates=int(self.db.get_setting('face_max_templates')),
+            add_min_confidence=float(self.db.get_setting('face_template_add_confidence')),
+            novelty_similarity=float(self.db.get_setting('face_template_novelty'))
+        )
         
         # Camera lifecycle management (session-based)
         self.camera_active = False  # Is camera currently active
@@ -56,6 +106,22 @@ class PublicInterface(QWidget):
         # Create photos directory
         self.photos_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'photos')
         os.makedirs(self.photos_dir, exist_ok=True)
+        # Packed monthly containers indexed by record_id, or one file per photo
+        self.photo_store = PhotoStore(self.photos_dir, self.db) \
+            if self.db.get_setting('photo_storage') == 'pack' else None
+        self.photo_writer = PhotoWriter(  # Encodes and writes checkpoint photos off the GUI thread
+            on_failure=self.db.clear_photo_path,
+            quality=int(self.db.get_setting('photo_jpeg_quality')),
+            max_width=int(self.db.get_setting('photo_max_width')),
+            max_queue=int(self.db.get_setting('photo_queue_size')),
+            store=self.photo_store,
+            crop=self.db.get_setting('photo_crop') == '1'
+        ).start()
+        # Photo retention purge at startup, then daily (on the photo writer thread)
+        self.retention_timer = QTimer()
+        self.retention_timer.timeout.connect(self.purge_old_photos)
+        self.retention_timer.start(24 * 3600 * 1000)
+        self.purge_old_photos()
         
         # Set background color
         self.setAutoFillBackground(True)
@@ -195,6 +261,7 @@ class PublicInterface(QWidget):
         """)
         self.camera_label.hide()
         self.left_layout.addWidget(self.camera_label, 0, Qt.AlignCenter)
+        self.preview = PreviewRenderer(self.camera_label, max_fps=0)  # Paced by the frame scheduler
         
         # Camera session countdown display
         self.camera_countdown_label = QLabel()
@@ -204,6 +271,14 @@ class PublicInterface(QWidget):
         self.camera_countdown_label.hide()
         self.left_layout.addWidget(self.camera_countdown_label, 0, Qt.AlignCenter)
         
+        # Achieved processing rates (frame scheduler)
+        self.rates_label = QLabel()
+        self.rates_label.setFont(QFont("Arial", 9))
+        self.rates_label.setAlignment(Qt.AlignCenter)
+        self.rates_label.setStyleSheet("color: #95A5A6;")
+        self.rates_label.hide()
+        self.left_layout.addWidget(self.rates_label, 0, Qt.AlignCenter)
+        
         # Camera activation instruction
         self.camera_instruction_label = QLabel()
         self.camera_instruction_label.setFont(QFont("Arial", 14))
@@ -403,44 +478,113 @@ class PublicInterface(QWidget):
             self.deactivate_camera()
         
         # Additional cleanup
-        if self.camera:
-            self.camera.release()
-            self.camera = None
+        self.release_camera()
         if self.camera_timer.isActive():
             self.camera_timer.stop()
         
         # Hide camera-related UI elements
         self.camera_instruction_label.hide()
         self.camera_countdown_label.hide()
+        self.rates_label.hide()
         
         self.clear_status()
 
+    def create_motion_gate(self):
+        """Create the motion gate from settings (None if disabled)"""
+        if self.db.get_setting('motion_gate_enabled') != '1':
+            return None
+        return MotionGate(
+            diff_threshold=int(self.db.get_setting('motion_diff_threshold')),
+            min_changed_ratio=float(self.db.get_setting('motion_min_changed_ratio')),
+            hold_seconds=float(self.db.get_setting('motion_hold_seconds'))
+        )
+
+    def load_face_models(self):
+        """Load the face models if face recognition is enabled"""
+        if self.db.get_setting('face_enabled') == '1' and self.face_recognizer is None:
+            self.face_recognizer = FaceRecognition.from_settings(self.db)
+
+    def note_activity(self):
+        """Motion, key press or punch: wake the terminal if it is idle"""
+        self.apply_power_state(self.idle_controller.note_activity())
+
+    def update_power_state(self):
+        """Re-evaluate the power state (quiet period, working windows)"""
+        self.apply_power_state(self.idle_controller.update(self.is_in_working_window()))
+
+    def apply_power_state(self, state):
+        """Apply a power state change returned by the idle controller"""
+        if state is None:
+            return
+        print(f"Power state: {state}")
+        if state == ACTIVE:
+            self.frame_scheduler.set_ceiling(None)
+        elif state == IDLE:
+            self.frame_scheduler.set_ceiling(self.idle_fps)
+            if self.idle_controller.previous_state == PARKED:
+                # Working window opened: reload the models and the per-second clock
+                self.load_face_models()
+                self.face_gallery.refresh(force=True)
+                self.time_timer.start(1000)
+                self.update_datetime()
+                print(self.idle_controller.format_report())
+        elif state == PARKED:
+            if self.camera_active:
+                self.deactivate_camera()
+            # Release the models (memory and their threads) until the next working window
+            self.face_recognizer = None
+            self.face_gallery.set_templates([])
+            gc.collect()
+            self.update_datetime()  # Switches the clock to one tick per minute
+            print(self.idle_controller.format_report())
+
+    def create_qr_scanner(self):
+        """Create a QR scanner from settings (one per decode worker, scanners keep buffers)"""
+        return QRScanner(
+            decode_width=int(self.db.get_setting('qr_decode_width')),
+            full_retry_interval=int(self.db.get_setting('qr_full_retry_interval')),
+            track_frames=int(self.db.get_setting('qr_track_frames')),
+            track_margin=float(self.db.get_setting('qr_track_margin'))
+        )
+
+    def resolve_scan(self, kind, payload):
+        """Recent-scan cache entry of a QR payload or typed card ID (the employee is looked up on a miss)"""
+        revision = self.db.employees_revision
+        entry = self.scan_cache.get((kind, payload), revision)
+        if entry is None:
+            employee = self.db.get_employee_by_qr(payload) if kind == 'qr' else self.db.get_employee(payload)
+            entry = self.scan_cache.put((kind, payload), employee, revision)
+        return entry
+
+    def cooldown_passed(self, key, now):
+        """Whether a code or face may be handled at time now (monotonic), and mark it handled if so"""
+        for old_key in [k for k, t in self.recent_scans.items() if now - t >= self.scan_cooldown]:
+            del self.recent_scans[old_key]
+        if key in self.recent_scans:
+            return False
+        self.recent_scans[key] = now
+        return True
+
+    def create_frame_scheduler(self):
+        """Create the frame scheduler from settings: preview is never shed, face inference first"""
+        scheduler = FrameScheduler(max_load=float(self.db.get_setting('frame_max_load')))
+        scheduler.add_stage('preview', float(self.db.get_setting('preview_fps')))
+        scheduler.add_stage('face', float(self.db.get_setting('face_inference_fps')), min_fps=1.0, shed_order=0)
+        scheduler.add_stage('qr', float(self.db.get_setting('qr_decode_fps')), min_fps=2.0, shed_order=1)
+        return scheduler
+
     def initialize_camera(self):
         """Initialize camera with fallback options"""
-        # Try different camera indices
-        for camera_index in [0, 1, 2]:
-            try:
-                self.camera = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)  # Use DirectShow backend
-                
-                if self.camera.isOpened():
-                    # Test if we can actually read frames
-                    ret, test_frame = self.camera.read()
-                    if ret and test_frame is not None:
-                        print(f"Camera initialized successfully on index {camera_index}")
-                        return True
-                    else:
-                        self.camera.release()
-                        continue
-                else:
-                    continue
-                    
-            except Exception as e:
-                print(f"Failed to initialize camera {camera_index}: {e}")
-                continue
-        
-        # If all cameras failed, show error
-        self.camera = None
-        return False
+        # Subscribe to the shared camera; frames are grabbed on its background thread
+        # and the GUI takes the newest one. The mode picks the capture profile (face or QR).
+        self.camera = camera_service.subscribe("kiosk", self.db.get_setting('attendance_mode'))
+        return self.camera is not None
+
+    def release_camera(self):
+        """Release the kiosk's camera subscription (hardware closes with the last subscriber)"""
+        if self.camera is not None:
+            self.camera.release()
+            self.camera = None
 
     def start_qr_mode(self):
         """Start QR scanning mode"""
@@ -501,9 +645,25 @@ class PublicInterface(QWidget):
         self.id_container.show()
         self.id_input.setFocus()
 
+    def on_camera_tick(self):
+        """Process the newest frame, then wake up again when the next stage is due"""
+        try:
+            self.process_camera_frame()
+        finally:
+            if self.camera_active and not self.camera_timer.isActive():
+                self.camera_timer.start(self.frame_scheduler.next_delay_ms())
+
     def process_camera_frame(self):
-        """Process camera frames for QR or Face detection"""
-        if not self.camera or not self.camera.isOpened():
+        """Process camera frames for QR or Face detection (each at its scheduled rate)"""
+        if self.camera is not None and self.camera.failed:
+            # Camera read failed, try to reinitialize
+            self.release_camera()
+            print("Camera read failed, attempting to reinitialize...")
+            if self.initialize_camera():
+                self.show_status("📷 Caméra reconnectée", "info", auto_clear=True)
+            return
+        
+        if self.camera is None:
             # Try to reinitialize camera
             if self.initialize_camera():
                 self.show_status("📷 Caméra reconnectée", "info", auto_clear=True)
@@ -520,72 +680,86 @@ class PublicInterface(QWidget):
                 self.camera_label.setPixmap(error_pixmap)
                 return
         
-        try:
-            ret, frame = self.camera.read()
-            if not ret or frame is None:
-                # Camera read failed, try to reinitialize
-                self.camera.release()
-                self.camera = None
-                print("Camera read failed, attempting to reinitialize...")
-                if self.initialize_camera():
-                    self.show_status("📷 Caméra reconnectée", "info", auto_clear=True)
-                return
-        except Exception as e:
-            print(f"Camera read error: {e}")
-            # Try to reinitialize
-            if self.camera:
-                self.camera.release()
-            self.camera = None
-            if self.initialize_camera():
-                self.show_status("📷 Caméra reconnectée après erreur", "info", auto_clear=True)
+        # Newest frame from the capture thread (never blocks; nothing new = nothing to do)
+        frame, timestamp = self.camera.read_latest()
+        if frame is None:
             return
+        if self.activation_started is not None:
+            print(f"First frame {(time.perf_counter() - self.activation_started) * 1000:.0f} ms after activation")
+            self.activation_started = None
+        
+        # Motion wakes the terminal from its low idle rate
+        if self.wake_detector.detect_motion(frame):
+            self.note_activity()
         
         # Store current frame for photo capture
         self.current_frame = frame.copy()
         
-        # Check cooldown
-        if self.last_scan_time:
-            elapsed = (datetime.datetime.now() - self.last_scan_time).total_seconds()
-            if elapsed < self.scan_cooldown:
-                # Just display frame
-                self.display_frame(frame)
-                return
-        
         mode = self.db.get_setting('attendance_mode')
         
-        if mode == 'qr':
-            self.process_qr_frame(frame)
-        elif mode == 'face':
-            self.process_face_frame(frame)
-
-    def process_qr_frame(self, frame):
-        """Detect and process QR codes"""
-        # Try to decode QR
-        qr_scanner = QRScanner()
-        qr_data = qr_scanner.scan_frame(frame)
+        # Codes decoded by the worker since the last tick (cooldown per code, not for the whole loop)
+        if self.qr_worker is not None:
+            for result in self.qr_worker.poll():
+                self.handle_qr_result(result, frame)
         
-        if qr_data:
-            # Play scan sound
-            self.play_sound("scan")
-            
-            # Draw detection box
-            cv2.putText(frame, "QR DETECTE", (50, 50), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            self.display_frame(frame)
-            
-            # Process attendance
-            self.last_scan_time = datetime.datetime.now()
-            self.process_qr_attendance(qr_data, frame)
+        if mode in ('qr', 'face') and self.frame_scheduler.due(mode):
+            self.overlay = []
+            with self.frame_scheduler.run(mode):
+                if mode == 'qr':
+                    self.process_qr_frame(frame, timestamp)
+                else:
+                    self.process_face_frame(frame)
         else:
-            # Draw instruction
-            cv2.putText(frame, "Presentez votre code QR", (50, 50), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-            self.display_frame(frame)
+            # Not analyzed: show the annotations of the last analyzed frame
+            for draw, args in self.overlay:
+                draw(frame, *args)
+        self.display_frame(frame)
+
+    def annotate(self, frame, draw, *args):
+        """Draw on the frame (cv2.putText / cv2.rectangle ...) and remember it for the next frames"""
+        draw(frame, *args)
+        self.overlay.append((draw, args))
+
+    def process_qr_frame(self, frame, timestamp):
+        """Hand the frame to the QR decode worker (results are handled by handle_qr_result)"""
+        if self.qr_worker is None:
+            self.qr_worker = QRDecodeWorker(self.create_qr_scanner,
+                                            workers=int(self.db.get_setting('qr_decode_workers'))).start()
+        # current_frame is a private copy that is never drawn on
+        self.qr_worker.submit(self.current_frame, timestamp)
+        
+        # Draw instruction
+        self.annotate(frame, cv2.putText, "Presentez votre code QR", (50, 50), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+
+    def handle_qr_result(self, result, frame):
+        """Process a code decoded by the worker (ignored while the same code is cooling down)"""
+        if not self.cooldown_passed(('qr', result.data), result.timestamp):
+            return
+        
+        # Play scan sound
+        self.play_sound("scan")
+        
+        # Draw detection box on the frame the code was read in, and on the live frame
+        scan_frame = result.frame.copy()
+        polygon = np.array(result.polygon, dtype=np.int32).reshape(-1, 1, 2)
+        for target in (scan_frame, frame):
+            cv2.polylines(target, [polygon], True, (0, 255, 0), 2)
+            cv2.putText(target, "QR DETECTE", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        self.display_frame(scan_frame, force=True)
+        
+        # Process attendance
+        self.process_qr_attendance(result.data, scan_frame, region=polygon_region(result.polygon))
 
     def process_face_frame(self, frame):
         """Detect and process faces using MTCNN and FaceNet"""
         if self.face_recognizer is None:
             return
+        # Skip detection entirely while nothing moves in front of the camera
+        if self.motion_gate is not None and not self.motion_gate.should_process(frame):
+            self.annotate(frame, cv2.putText, "Positionnez votre visage face à la caméra", (10, 30), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            return
         # Detect and extract face from the current frame
         result = self.face_recognizer.detect_and_extract_face(frame)
         
@@ -594,68 +768,83 @@ class PublicInterface(QWidget):
             bbox = face_info['bbox']
             x1, y1, x2, y2 = [int(v) for v in bbox]
             
-            # Get all employees with faces
-            all_employees = self.db.get_all_employees()
-            best_match = None
-            best_confidence = 0
+            # Score the embedding against every face template (reloaded when templates change)
+            self.face_gallery.refresh()
+            matches = self.face_gallery.match(captured_embedding, top_k=self.face_identifier.top_k)
+            confidences = self.face_recognizer.similarity_to_confidence([m[1] for m in matches])
+            candidates = [(employee_id, float(c)) for (employee_id, _, _), c in zip(matches, confidences)]
             
-            for emp in all_employees:
-                if emp.face_embedding:
-                    try:
-                        confidence = self.face_recognizer.match_face(emp.face_embedding, captured_embedding)
-                        if confidence > best_confidence:
-                            best_confidence = confidence
-                            best_match = emp
-                    except Exception as e:
-                        print(f"Error matching face for {emp.name}: {e}")
-                        continue
+            # Accumulate evidence over the frames of this face before deciding
+            decision = self.face_identifier.update(candidates, [x1, y1, x2, y2])
+            best_match = self.db.get_employee(decision.candidate) \
+                if decision.status == FaceDecision.ACCEPTED else None
             
             # Draw face box
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            self.annotate(frame, cv2.rectangle, (x1, y1), (x2, y2), (0, 255, 0), 2)
             
             # Process the result
-            if best_match and self.face_recognizer.is_match_accepted(best_confidence):
-                status = f"{best_match.name} - {best_confidence:.1f}%"
+            if decision.status == FaceDecision.ACCEPTED and best_match \
+                    and self.face_recognizer.is_match_accepted(decision.confidence):
+                status = f"{best_match.name} - {decision.confidence:.1f}%"
                 color = (0, 255, 0)  # Green
-                cv2.putText(frame, status, (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                self.annotate(frame, cv2.putText, status, (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
                 
-                # Check cooldown before processing attendance
-                current_time = datetime.datetime.now()
-                if self.last_scan_time is None or (current_time - self.last_scan_time).seconds >= 3:
-                    self.last_scan_time = current_time
-                    self.handle_successful_face_recognition(best_match, best_confidence, frame.copy())
+                # Check this employee's cooldown before processing attendance
+                if self.cooldown_passed(('face', best_match.employee_id), time.monotonic()):
+                    if best_match.enabled:
+                        self.update_face_templates(best_match.employee_id, matches, confidences, captured_embedding)
+                    self.handle_successful_face_recognition(best_match, decision.confidence, frame.copy(),
+                                                            region=(x1, y1, x2, y2))
             else:
                 # Show frame with status
-                if best_match:
-                    status = f"Confiance insuffisante: {best_confidence:.1f}%"
+                if decision.status == FaceDecision.PENDING:
+                    status = f"Identification... {decision.frames}/{self.face_identifier.max_frames}"
                     color = (0, 165, 255)  # Orange
                 else:
                     status = "Non reconnu"
                     color = (0, 0, 255)  # Red
                 
-                cv2.putText(frame, status, (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                self.annotate(frame, cv2.putText, status, (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
         else:
             # No face detected or low confidence
-            cv2.putText(frame, "Positionnez votre visage face à la caméra", (10, 30), 
+            self.annotate(frame, cv2.putText, "Positionnez votre visage face à la caméra", (10, 30), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        self.display_frame(frame)
 
-    def display_frame(self, frame):
-        """Display camera frame in label"""
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = frame.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_image)
-        
-        # Scale to fit label
-        scaled_pixmap = pixmap.scaled(self.camera_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.camera_label.setPixmap(scaled_pixmap)
+    def update_face_templates(self, employee_id, matches, confidences, embedding):
+        """Mark the template behind an accepted match as used and learn the current
+        embedding as a new template when it shows a new appearance of the employee"""
+        for (match_id, _, template_id), confidence in zip(matches, confidences):
+            if match_id == employee_id:
+                try:
+                    self.db.touch_face_template(template_id)
+                    if self.face_gallery.learn(employee_id, embedding, float(confidence)):
+                        print(f"Learned new face template for {employee_id}")
+                except Exception as e:
+                    print(f"Error updating face templates: {e}")
+                break
 
-    def process_qr_attendance(self, qr_data, frame=None):
+    def display_frame(self, frame, force=False):
+        """Display camera frame in label (at the scheduled preview rate unless forced)"""
+        if not force and not self.frame_scheduler.due('preview'):
+            return
+        with self.frame_scheduler.run('preview'):
+            self.preview.render(frame, force=True)
+
+    def update_rates_label(self):
+        """Show the achieved rate of each running stage (reduced = shed under load)"""
+        stats = self.frame_scheduler.get_stats()
+        parts = []
+        for stage, name in (('preview', "Aperçu"), ('qr', "QR"), ('face', "Visage")):
+            if stats[stage]['achieved_fps'] > 0:
+                parts.append(f"{name} {stats[stage]['achieved_fps']:.0f} i/s" +
+                             (" (réduit)" if stats[stage]['shed'] else ""))
+        self.rates_label.setText(" · ".join(parts))
+
+    def process_qr_attendance(self, qr_data, frame=None, region=None):
         """Process QR code attendance"""
-        employee = self.db.get_employee_by_qr(qr_data)
+        self.note_activity()
+        scan = self.resolve_scan('qr', qr_data)
+        employee = scan.employee
         
         if not employee:
             self.play_sound("error")
@@ -668,13 +857,13 @@ class PublicInterface(QWidget):
             return
         
         # Check window and record
-        self.record_attendance(employee, frame=frame)
+        self.record_attendance(employee, frame=frame, scan=scan, region=region)
         
         # Extend camera session on successful scan
         if self.camera_active:
             self.extend_camera_session()
 
-    def handle_successful_face_recognition(self, employee, confidence, frame):
+    def handle_successful_face_recognition(self, employee, confidence, frame, region=None):
         """Handle successful face recognition"""
         # Play scan sound
         self.play_sound("scan")
@@ -687,14 +876,17 @@ class PublicInterface(QWidget):
         cv2.putText(frame, f"Confiance: {confidence:.1f}%", (10, 60), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         
-        self.display_frame(frame)
+        self.display_frame(frame, force=True)
         
         # Process attendance
-        self.last_scan_time = datetime.datetime.now()
-        self.process_face_attendance(employee.employee_id, confidence, frame)
+        self.process_face_attendance(employee.employee_id, confidence, frame, region=region)
 
-    def process_face_attendance(self, employee_id, confidence, frame=None):
-        """Process face recognition attendance"""
+    def process_face_attendance(self, employee_id, confidence, frame=None, region=None):
+        """Process face recognition attendance
+        Args:
+            region: (x1, y1, x2, y2) of the face in the frame (kept when photos are cropped)
+        """
+        self.note_activity()
         employee = self.db.get_employee(employee_id)
         
         if not employee:
@@ -708,7 +900,8 @@ class PublicInterface(QWidget):
             return
         
         # Check window and record
-        self.record_attendance(employee, extra_info=f"Confiance: {confidence:.0f}%", frame=frame, confidence=confidence)
+        self.record_attendance(employee, extra_info=f"Confiance: {confidence:.0f}%", frame=frame, confidence=confidence,
+                               region=region)
         
         # Extend camera session on successful recognition
         if self.camera_active:
@@ -718,11 +911,13 @@ class PublicInterface(QWidget):
         """Process ID card input"""
         employee_id = self.id_input.text().strip()
         self.id_input.clear()
+        self.note_activity()
         
         if not employee_id:
             return
         
-        employee = self.db.get_employee(employee_id)
+        scan = self.resolve_scan('card', employee_id)
+        employee = scan.employee
         
         if not employee:
             self.play_sound("error")
@@ -735,38 +930,39 @@ class PublicInterface(QWidget):
             return
         
         # Check window and record (use current frame from camera)
-        self.record_attendance(employee, frame=self.current_frame)
+        self.record_attendance(employee, frame=self.current_frame, scan=scan)
 
-    def save_checkpoint_photo(self, employee_id, action, frame):
-        """Save a photo of the checkpoint"""
+    def checkpoint_photo_path(self, employee_id, action, frame):
+        """Path the checkpoint photo will be written to (None without a frame): the month's
+        container when packing, else its own file.
+        The photo itself is written by the photo writer once the punch is recorded."""
         if frame is None:
             return None
-        
-        try:
-            # Create employee directory
-            employee_dir = os.path.join(self.photos_dir, str(employee_id))
-            os.makedirs(employee_dir, exist_ok=True)
-            
-            # Generate filename with timestamp
-            timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-            action_name = "arrival" if action == "IN" else "departure"
-            filename = f"{timestamp}_{action_name}.jpg"
-            filepath = os.path.join(employee_dir, filename)
-            
-            # Save the photo
-            cv2.imwrite(filepath, frame)
-            print(f"Checkpoint photo saved: {filepath}")
-            return filepath
-        
-        except Exception as e:
-            print(f"Error saving checkpoint photo: {e}")
-            return None
+        if self.photo_store is not None:
+            return self.photo_store.container_path(self.photo_store.container_name())
+        
+        # Generate filename with timestamp
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        action_name = "arrival" if action == "IN" else "departure"
+        filename = f"{timestamp}_{action_name}.jpg"
+        return os.path.join(self.photos_dir, str(employee_id), filename)
     
-    def record_attendance(self, employee, extra_info="", frame=None, confidence=None):
-        """Record attendance for employee"""
+    def record_attendance(self, employee, extra_info="", frame=None, confidence=None, scan=None, region=None):
+        """Record attendance for employee
+        Args:
+            scan: Recent-scan cache entry of the QR / card ID (repeats of a refused punch skip the database)
+            region: (x1, y1, x2, y2) face or badge in the frame (kept when photos are cropped)
+        """
         now = datetime.datetime.now()
         current_time = now.time()
         
+        outcome = scan.current_outcome(now) if scan is not None else None
+        if outcome is not None:
+            self.scan_cache.outcome_hits += 1
+            self.play_sound("error")
+            self.show_status(f"❌ {employee.name}\n{outcome}", "error", auto_clear=True)
+            return
+        
         morning_start = datetime.datetime.strptime(self.db.get_setting('morning_start'), '%H:%M').time()
         morning_end = datetime.datetime.strptime(self.db.get_setting('morning_end'), '%H:%M').time()
         afternoon_start = datetime.datetime.strptime(self.db.get_setting('afternoon_start'), '%H:%M').time()
@@ -778,9 +974,11 @@ class PublicInterface(QWidget):
         if morning_start <= current_time <= morning_end:
             action = "IN"
             window_name = "ARRIVÉE"
+            window_end = morning_end
         elif afternoon_start <= current_time <= afternoon_end:
             action = "OUT"
             window_name = "DÉPART"
+            window_end = afternoon_end
         else:
             self.play_sound("error")
             self.show_status("❌ Hors fenêtre horaire", "error", auto_clear=True)
@@ -789,6 +987,8 @@ class PublicInterface(QWidget):
         # Check for duplicate
         is_duplicate, dup_message = self.check_duplicate_attendance(employee.employee_id, action)
         if is_duplicate:
+            if scan is not None:
+                scan.set_outcome(dup_message, datetime.datetime.combine(now.date(), window_end))
             self.play_sound("error")
             self.show_status(f"❌ {employee.name}\n{dup_message}", "error", auto_clear=True)
             return
@@ -799,8 +999,8 @@ class PublicInterface(QWidget):
         elif action == "OUT":
             self.play_sound("out")
 
-        # Save checkpoint photo
-        photo_path = self.save_checkpoint_photo(employee.employee_id, action, frame)
+        # Reserve the checkpoint photo path (written in the background below)
+        photo_path = self.checkpoint_photo_path(employee.employee_id, action, frame)
         
         # Record attendance with full audit trail
         mode = self.db.get_setting('attendance_mode')
@@ -812,6 +1012,13 @@ class PublicInterface(QWidget):
             photo_path=photo_path,
             confidence=confidence
         )
+        if photo_path:
+            # The frame is a copy nobody draws on any more; photo_path is cleared if the write fails
+            self.photo_writer.submit(record_id, photo_path, frame, region)
+        if scan is not None:
+            # The next scan in this window is a duplicate
+            scan.set_outcome(self.duplicate_message(action, current_time < afternoon_start),
+                             datetime.datetime.combine(now.date(), window_end))
         
         # Show success
         success_msg = f"✓ {window_name}\n{now.strftime('%H:%M:%S')}"
@@ -846,12 +1053,16 @@ class PublicInterface(QWidget):
             log_is_morning = log_time < afternoon_start
             
             if is_morning_window == log_is_morning and log_action == action:
-                window = "matin" if is_morning_window else "après-midi"
-                action_fr = "arrivée" if action == "IN" else "départ"
-                return True, f"Déjà pointé {action_fr} ce {window}"
+                return True, self.duplicate_message(action, is_morning_window)
         
         return False, ""
 
+    def duplicate_message(self, action, is_morning_window):
+        """Message shown for a second punch of the same action in a window"""
+        window = "matin" if is_morning_window else "après-midi"
+        action_fr = "arrivée" if action == "IN" else "départ"
+        return f"Déjà pointé {action_fr} ce {window}"
+
     def show_employee_info(self, employee, message, status_type, auto_clear=False):
         """Show employee info (no photo display per compliance specs)"""
         # Hide photo display since raw face images are not stored per compliance
@@ -910,9 +1121,14 @@ class PublicInterface(QWidget):
         self.employee_photo.hide()
 
     def update_datetime(self):
-        """Update date and time display"""
+        """Update date and time display (once a minute, without seconds, while parked)"""
         now = QDateTime.currentDateTime()
-        self.datetime_label.setText(now.toString("dddd d MMMM yyyy - HH:mm:ss"))
+        if self.idle_controller.state == PARKED:
+            self.datetime_label.setText(now.toString("dddd d MMMM yyyy - HH:mm"))
+            # Next tick on the next minute boundary
+            self.time_timer.start(60000 - now.time().second() * 1000 - now.time().msec())
+        else:
+            self.datetime_label.setText(now.toString("dddd d MMMM yyyy - HH:mm:ss"))
 
     def update_window_info(self):
         """Update current window information"""
@@ -944,9 +1160,14 @@ class PublicInterface(QWidget):
             print("⚠️ Working window ended - Force closing camera for security")
             self.deactivate_camera()
             self.show_status("⏰ Fenêtre horaire terminée - Caméra désactivée", "error", auto_clear=True)
+        
+        # Park outside the working windows, unpark when one opens
+        self.update_power_state()
 
     def keyPressEvent(self, event):
         """Handle keyboard shortcuts"""
+        self.update_power_state()  # A window may have opened since the last check
+        self.note_activity()
         if event.key() == Qt.Key_F11:
             self.f11_press_count += 1
             if self.f11_press_count == 1:
@@ -969,6 +1190,12 @@ class PublicInterface(QWidget):
                 else:
                     self.show_status("⏰ Hors fenêtre horaire - Caméra désactivée", "error", auto_clear=True)
             event.accept()
+        elif event.key() == Qt.Key_F9 and profiler.enabled:
+            # Dump the face pipeline stage timings for support
+            path = profiler.dump()
+            print(profiler.format_table())
+            print(f"Profile written to {path}")
+            event.accept()
         elif event.key() == Qt.Key_Escape:
             pass  # Ignore escape
     
@@ -1030,37 +1257,19 @@ class PublicInterface(QWidget):
     
     def capture_intruder_photo(self):
         """Capture photo of person attempting unauthorized admin access"""
-        temp_camera = None
-        camera_was_active = self.camera_active
+        subscription = None
         
         try:
-            # Use existing camera if active, otherwise temporarily activate
-            if self.camera is not None and self.camera.isOpened():
-                temp_camera = self.camera
-            else:
-                # Temporarily activate camera for security photo
-                print("📸 Temporarily activating camera for security photo")
-                for camera_index in [0, 1, 2]:
-                    try:
-                        temp_camera = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-                        if temp_camera.isOpened():
-                            ret, test_frame = temp_camera.read()
-                            if ret and test_frame is not None:
-                                break
-                            else:
-                                temp_camera.release()
-                                temp_camera = None
-                    except Exception as e:
-                        print(f"Camera {camera_index} failed: {e}")
-                        continue
-            
-            if temp_camera is None or not temp_camera.isOpened():
+            # Shared camera: instant if a session is running, opened just for the photo otherwise
+            subscription = camera_service.subscribe("security photo")
+            if subscription is None:
                 print("⚠️ Camera not available for intruder photo")
                 return
             
-            # Capture frame from camera
-            ret, frame = temp_camera.read()
-            if not ret or frame is None:
+            frame, _ = subscription.read_latest(new_only=False)
+            if frame is None:
+                frame, _ = subscription.wait_for_frame()
+            if frame is None:
                 print("⚠️ Failed to capture intruder photo")
                 return
             
@@ -1083,10 +1292,9 @@ class PublicInterface(QWidget):
         except Exception as e:
             print(f"⚠️ Error capturing intruder photo: {e}")
         finally:
-            # Clean up temporary camera if we created one
-            if not camera_was_active and temp_camera is not None and temp_camera != self.camera:
-                temp_camera.release()
-                print("📸 Temporary camera released")
+            # Release our subscription (the camera stays open if a session uses it)
+            if subscription is not None:
+                subscription.release()
 
     def is_in_working_window(self):
         """Check if current time is within working windows"""
@@ -1119,13 +1327,24 @@ class PublicInterface(QWidget):
             return
         
         # Initialize camera
+        self.activation_started = time.perf_counter()
         if self.initialize_camera():
             self.camera_active = True
+            if self.motion_gate is not None:
+                self.motion_gate.reset()
+            self.wake_detector.reset()
+            self.face_identifier.reset()
+            if self.face_recognizer is not None:
+                self.face_gallery.refresh(force=True)
             self.camera_label.show()
             self.camera_instruction_label.hide()
+            self.preview.reset()
+            self.frame_scheduler.reset(active=('preview', self.db.get_setting('attendance_mode')))
+            self.rates_label.setText("")
+            self.rates_label.show()
             
-            # Start camera frame processing
-            self.camera_timer.start(30)  # ~33 FPS
+            # Start camera frame processing (rescheduled by on_camera_tick)
+            self.camera_timer.start(0)
             
             # Start session timer (2 minutes)
             self.camera_session_remaining = self.camera_session_duration
@@ -1147,10 +1366,13 @@ class PublicInterface(QWidget):
         if not self.camera_active:
             return
         
+        if self.qr_worker is not None:
+            self.qr_worker.stop()
+        self.log_session_stats()
+        self.qr_worker = None
+        
         # Stop camera
-        if self.camera:
-            self.camera.release()
-            self.camera = None
+        self.release_camera()
         
         # Stop timers
         if self.camera_timer.isActive():
@@ -1164,6 +1386,7 @@ class PublicInterface(QWidget):
         self.camera_active = False
         self.camera_label.hide()
         self.camera_countdown_label.hide()
+        self.rates_label.hide()
         
         # Show reactivation instructions if still in working window
         if self.is_in_working_window():
@@ -1176,6 +1399,28 @@ class PublicInterface(QWidget):
                 self.camera_instruction_label.show()
                 self.show_status("⏱️ Caméra désactivée - Appuyez sur ESPACE pour réactiver", "info")
     
+    def log_session_stats(self, components=None):
+        """Print the metrics of the camera session's components (see utils.session_stats)
+        Args:
+            components: Name -> component to report (default: the camera session's)
+        """
+        if components is None:
+            components = {
+                'kiosk_camera': self.camera,
+                'motion_gate': self.motion_gate,
+                'face_decisions': self.face_identifier,
+                'camera_open': camera_manager,
+                'frame_scheduler': self.frame_scheduler,
+                'qr_worker': self.qr_worker,
+                'power_states': self.idle_controller,
+                'scan_cache': self.scan_cache,
+                'preview': self.preview,
+                'profiler': profiler,
+                'face_gallery': self.face_gallery,
+            }
+        for line in format_session_stats(components):
+            print(line)
+    
     def extend_camera_session(self):
         """Extend camera session by 2 minutes after successful scan"""
         if not self.camera_active:
@@ -1229,9 +1474,27 @@ class PublicInterface(QWidget):
         
         self.camera_countdown_label.setText(f"{icon} Session: {minutes:02d}:{seconds:02d}")
         self.camera_countdown_label.setStyleSheet(f"color: {color}; font-weight: bold; padding: 5px;")
+        self.update_rates_label()
+        self.update_power_state()  # Drops to the idle rate after a quiet period
+
+    def purge_old_photos(self):
+        """Queue the photo retention purge on the photo writer thread"""
+        retention_days = int(self.db.get_setting('photo_retention_days') or 0)
+        if retention_days <= 0:
+            return
+        store = self.photo_store or PhotoStore(self.photos_dir, self.db)  # Also purges the per-punch files
+        
+        def purge():
+            removed = store.purge(retention_days)
+            if removed:
+                print(f"Photo retention: {removed} photos older than {retention_days} days removed")
+        
+        self.photo_writer.submit_task(purge)
 
     def closeEvent(self, event):
         """Cleanup on close"""
-        if self.camera:
-            self.camera.release()
+        self.retention_timer.stop()
+        self.photo_writer.stop()  # Write the photos still queued
+        self.log_session_stats({'kiosk_camera': self.camera, 'photo_writer': self.photo_writer})
+        self.release_camera()
         event.accept()
@@ -6,11 +6,18 @@ Main entry point for the application.
 
 import sys
 import os
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QIcon
-from gui.public_interface import PublicInterface
+from database import Database
+from utils.thread_budget import apply_thread_budget
 
 def main():
+    # Size torch/TensorFlow/OpenCV/Qt thread pools before any model is loaded
+    profile = os.environ.get('SLAT_THREAD_PROFILE') or Database().get_setting('thread_profile')
+    apply_thread_budget(profile)
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QIcon
+    from gui.public_interface import PublicInterface
+
     app = QApplication(sys.argv)
     app.setApplicationName("SLAT")
     app.setApplicationVersion("1.0")
@@ -0,0 +1,201 @@
+"""
+Camera discovery for SLAT.
+Remembers the last camera that worked and the format it negotiated for each capture
+profile (resolution, fps, pixel format) in a small JSON file, opens it directly next
+time and probes the other indices only when it fails. Time to first frame is measured
+on every open.
+
+Setting the SLAT_FRAME_SOURCE environment variable (camera index, video file or
+image directory) makes open_camera() replay that source instead of opening a camera.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from statistics import median
+from typing import Dict, Optional
+
+from utils.capture_profile import (CaptureProfile, apply_profile, format_negotiated, negotiated_format,
+                                   request_format)
+from utils.frame_source import CameraSource, FrameSource, open_frame_source
+
+CAMERA_INDICES = (0, 1, 2)
+CAMERA_CACHE_PATH = "data/camera_cache.json"
+AUTO_PROFILE = 'auto'  # Cache key of the driver default format
+
+
+class CameraManager:
+    def __init__(self, cache_path: str = CAMERA_CACHE_PATH, indices=CAMERA_INDICES):
+        """
+        Args:
+            cache_path: JSON file holding the last working camera and its formats per profile
+            indices: Camera indices probed when the cached one fails
+        """
+        self.cache_path = cache_path
+        self.indices = tuple(indices)
+        self.cache = self._load_cache()
+
+        # Metrics
+        self.cache_hits = 0
+        self.probes = 0
+        self.profile_mismatches = 0  # Opens where the device refused the requested profile
+        self.last_time_to_first_frame = None
+        self._first_frame_times = deque(maxlen=100)
+
+    def _load_cache(self) -> Dict:
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if 'formats' not in cache and 'width' in cache:
+            # Cache written before capture profiles: a single driver default format
+            cache = {'index': cache.get('index'),
+                     'formats': {AUTO_PROFILE: {k: cache.get(k) for k in ('width', 'height', 'fps', 'fourcc')}}}
+        return cache
+
+    def _save_cache(self, source: CameraSource, key: str, negotiated: Dict):
+        """Remember the camera and the format the driver negotiated for a profile."""
+        formats = self.cache.get('formats', {}) if self.cache.get('index') == source.index else {}
+        formats[key] = negotiated
+        self.cache = {'index': source.index, 'formats': formats}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            with open(self.cache_path, 'w') as f:
+                json.dump(self.cache, f)
+        except OSError as e:
+            print(f"Could not save camera cache: {e}")
+
+    def _cached_format(self, camera_index: int, key: str) -> Optional[Dict]:
+        if self.cache.get('index') != camera_index:
+            return None
+        return self.cache.get('formats', {}).get(key)
+
+    def _negotiate(self, source: CameraSource, profile: Optional[CaptureProfile], cached: Optional[Dict]):
+        """Bring the source to the profile and validate it with a first frame.
+        Returns: First frame, or None if the camera delivers nothing
+        """
+        if cached:
+            # Request the previously negotiated format up front (skips renegotiation)
+            request_format(source, cached.get('width'), cached.get('height'), cached.get('fps') or 0,
+                           cached.get('fourcc') or '')
+            ret, frame = source.read()
+            if ret and frame is not None:
+                negotiated = negotiated_format(source, frame)
+                if (negotiated['width'], negotiated['height']) == (cached.get('width'), cached.get('height')):
+                    source.negotiated = negotiated
+                    source.profile_exact = profile is None or (
+                        (profile.width, profile.height) == (negotiated['width'], negotiated['height']))
+                    return frame
+        if profile is None:
+            ret, frame = source.read()
+            if not ret or frame is None:
+                return None
+            source.negotiated = negotiated_format(source, frame)
+            source.profile_exact = True
+            return frame
+
+        exact, negotiated, frame = apply_profile(source, profile)
+        source.negotiated = negotiated
+        source.profile_exact = exact
+        return frame
+
+    def _try_open(self, camera_index: int, profile: Optional[CaptureProfile], suffix: str) -> Optional[CameraSource]:
+        key = profile.spec if profile is not None else AUTO_PROFILE
+        try:
+            source = CameraSource(camera_index)
+            if source.isOpened():
+                source.profile = profile
+                cached = self._cached_format(camera_index, key)
+                # Test if we can actually read frames
+                test_frame = self._negotiate(source, profile, cached)
+                if test_frame is not None:
+                    if source.negotiated != cached:
+                        self._save_cache(source, key, source.negotiated)
+                    return source
+            source.release()
+        except Exception as e:
+            print(f"Failed to initialize camera {camera_index}{suffix}: {e}")
+        return None
+
+    def open(self, purpose: str = '', profile: Optional[CaptureProfile] = None) -> Optional[FrameSource]:
+        """Open the cached camera, or probe the indices if it fails.
+        Args:
+            purpose: Shown in the log line (e.g. "QR scanning")
+            profile: Capture profile to negotiate (None: driver default)
+        Returns: Opened source that already delivered a frame, or None
+        """
+        suffix = f" for {purpose}" if purpose else ""
+        start = time.perf_counter()
+
+        replay = os.environ.get('SLAT_FRAME_SOURCE')
+        if replay:
+            # Kiosk sessions replay in a loop at the recorded rate
+            source = open_frame_source(replay, loop=True, realtime=True)
+            if source.isOpened():
+                print(f"Replaying frame source {replay}{suffix}")
+                return source
+            print(f"Frame source {replay} could not be opened")
+            return None
+
+        source = None
+        cached_index = self.cache.get('index')
+        if cached_index is not None:
+            source = self._try_open(cached_index, profile, suffix)
+            if source is not None:
+                self.cache_hits += 1
+            else:
+                print(f"Cached camera {cached_index} unavailable, probing")
+
+        if source is None:
+            self.probes += 1
+            for camera_index in self.indices:
+                if camera_index == cached_index:
+                    continue
+                source = self._try_open(camera_index, profile, suffix)
+                if source is not None:
+                    break
+            if source is None:
+                return None
+
+        elapsed = time.perf_counter() - start
+        self.last_time_to_first_frame = elapsed
+        self._first_frame_times.append(elapsed)
+        print(f"Camera initialized successfully on index {source.index}{suffix} "
+              f"(first frame in {elapsed * 1000:.0f} ms{', cached' if source.index == cached_index else ''})")
+        if profile is not None:
+            if source.profile_exact:
+                print(f"Capture profile {profile.spec}: {format_negotiated(source.negotiated)}")
+            else:
+                self.profile_mismatches += 1
+                print(f"⚠ Capture profile {profile.spec} not supported by camera {source.index}, "
+                      f"using {format_negotiated(source.negotiated)}")
+        return source
+
+    def forget(self):
+        """Drop the cached camera (next open probes every index)."""
+        self.cache = {}
+        try:
+            os.remove(self.cache_path)
+        except OSError:
+            pass
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'opens': len(self._first_frame_times),
+            'cache_hits': self.cache_hits,
+            'probes': self.probes,
+            'profile_mismatches': self.profile_mismatches,
+            'median_time_to_first_frame': median(self._first_frame_times) if self._first_frame_times else 0.0,
+            'last_time_to_first_frame': self.last_time_to_first_frame or 0.0,
+        }
+
+
+# Shared by every capture path of the process
+camera_manager = CameraManager()
+
+
+def open_camera(purpose: str = '', profile: Optional[CaptureProfile] = None) -> Optional[FrameSource]:
+    """Open the terminal camera (cached device first, probing on failure)."""
+    return camera_manager.open(purpose, profile)
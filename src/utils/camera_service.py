@@ -0,0 +1,204 @@
+"""
+Shared camera service for SLAT.
+One camera and one capture thread per process, shared by every feature (kiosk
+session, admin enrollment, camera test, intruder photo). Features subscribe and
+read frames from their subscription; the camera is opened on the first subscription
+and released only when the last one is released, so features never compete for
+the device and switching between them does not reopen it.
+The capture profile of the mode (face or QR) is negotiated by the subscriber that
+opens the camera; later subscribers share the format already running.
+"""
+
+import threading
+import time
+from collections import deque
+from statistics import median
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.camera_manager import open_camera
+from utils.capture_profile import DEFAULT_PROFILES, CaptureProfile, format_negotiated
+from utils.capture_thread import CaptureThread
+
+
+class CameraSubscription:
+    """A feature's handle on the shared camera, usable like a cv2.VideoCapture."""
+
+    def __init__(self, service: 'CameraService', purpose: str):
+        self.service = service
+        self.purpose = purpose
+        self.last_sequence = -1  # Newest frame this subscriber received
+        self._released = False
+        self._ages = deque(maxlen=500)  # Frame age when handed out (seconds)
+
+    @property
+    def name(self) -> str:
+        source = self.service.source
+        return source.name if source is not None else ''
+
+    @property
+    def index(self) -> Optional[int]:
+        """Camera index of the shared source (None for a replayed file/directory)."""
+        return getattr(self.service.source, 'index', None)
+
+    @property
+    def failed(self) -> bool:
+        capture = self.service.capture
+        return capture is None or capture.failed
+
+    def _track(self, frame, timestamp, sequence):
+        if frame is not None:
+            self.last_sequence = sequence
+            self._ages.append(time.monotonic() - timestamp)
+        return frame, timestamp
+
+    def read_latest(self, new_only: bool = True) -> Tuple[Optional[np.ndarray], Optional[float]]:
+        """Copy of the newest frame without waiting for the camera.
+        Args:
+            new_only: Return (None, None) if this subscriber already received the newest frame
+        Returns: (frame, capture time.monotonic()) or (None, None)
+        """
+        capture = self.service.capture
+        if self._released or capture is None:
+            return None, None
+        return self._track(*capture.read_latest(self.last_sequence if new_only else -1))
+
+    def wait_for_frame(self, timeout: float = 1.0) -> Tuple[Optional[np.ndarray], Optional[float]]:
+        """Wait up to timeout for a frame this subscriber has not received yet."""
+        capture = self.service.capture
+        if self._released or capture is None:
+            return None, None
+        return self._track(*capture.wait_for_frame(self.last_sequence, timeout))
+
+    # cv2.VideoCapture-compatible interface for the blocking capture loops
+    def read(self, image=None) -> Tuple[bool, Optional[np.ndarray]]:
+        frame, _ = self.wait_for_frame()
+        return frame is not None, frame
+
+    def isOpened(self) -> bool:
+        return not self._released and not self.failed
+
+    def get(self, prop_id: int) -> float:
+        source = self.service.source
+        return source.get(prop_id) if source is not None else 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        """Change a capture property; only allowed while no other feature uses the camera."""
+        return self.service.set_property(self, prop_id, value)
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self.service.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def get_stats(self) -> Dict[str, float]:
+        ages = sorted(self._ages)
+        return {
+            'frames': len(ages),
+            'median_frame_age_ms': median(ages) * 1000 if ages else 0.0,
+            'p95_frame_age_ms': ages[int(0.95 * (len(ages) - 1))] * 1000 if ages else 0.0,
+        }
+
+
+class CameraService:
+    def __init__(self):
+        self.source = None
+        self.capture = None
+        self.subscribers = []
+        self.profiles = {mode: CaptureProfile.parse(spec) for mode, spec in DEFAULT_PROFILES.items()}
+        self._lock = threading.RLock()
+
+        # Metrics
+        self.opens = 0  # Hardware opens
+        self.shared_subscriptions = 0  # Subscriptions served by an already open camera
+
+    def configure_profiles(self, profiles: Dict[str, Optional[CaptureProfile]]):
+        """Set the capture profile of each mode (see utils.capture_profile.load_capture_profiles).
+        Applies from the next camera open.
+        """
+        with self._lock:
+            self.profiles.update(profiles)
+
+    def subscribe(self, purpose: str = '', mode: Optional[str] = None) -> Optional[CameraSubscription]:
+        """Subscribe to the shared camera, opening it if nobody uses it.
+        Args:
+            purpose: Shown in the logs
+            mode: MODE_FACE or MODE_QR: capture profile used if this subscription opens the camera
+        Returns: Subscription, or None if no camera works
+        """
+        with self._lock:
+            profile = self.profiles.get(mode) if mode else None
+            if self.capture is not None and self.capture.failed:
+                # Lost camera: reopen it for everyone
+                print("Shared camera lost, reopening")
+                profile = self.source.profile or profile
+                self._close()
+            if self.capture is None:
+                source = open_camera(purpose, profile)
+                if source is None:
+                    return None
+                self.source = source
+                self.capture = CaptureThread(source).start()
+                self.opens += 1
+                for subscriber in self.subscribers:
+                    subscriber.last_sequence = -1  # Sequence numbers restart with the new capture
+            else:
+                self.shared_subscriptions += 1
+                print(f"Camera shared{' for ' + purpose if purpose else ''} "
+                      f"({len(self.subscribers)} other subscriber(s))")
+                if profile is not None and self.source.profile is not None and profile != self.source.profile:
+                    print(f"Capture profile {profile.spec} requested, keeping {self.source.profile.spec} "
+                          f"while the camera is shared")
+            subscription = CameraSubscription(self, purpose)
+            self.subscribers.append(subscription)
+            return subscription
+
+    def release(self, subscription: CameraSubscription):
+        """Drop a subscription; the camera is released with the last one."""
+        with self._lock:
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
+            if not self.subscribers:
+                self._close()
+
+    def set_property(self, subscription: CameraSubscription, prop_id: int, value: float) -> bool:
+        with self._lock:
+            if self.source is None or self.subscribers != [subscription]:
+                return False
+            return self.source.set(prop_id, value)
+
+    def _close(self):
+        if self.capture is not None:
+            self.capture.stop()
+            stats = self.capture.get_stats()
+            if stats['frames_captured']:
+                print(f"Camera capture: {stats['capture_fps']:.1f} fps, {stats['frames_processed']} frames processed, "
+                      f"{stats['frames_skipped']} skipped")
+            self.capture = None
+        if self.source is not None:
+            self.source.release()
+            self.source = None
+            print("Camera released")
+
+    def is_open(self) -> bool:
+        return self.capture is not None
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            'subscribers': len(self.subscribers),
+            'opens': self.opens,
+            'shared_subscriptions': self.shared_subscriptions,
+            'profile': self.source.profile.spec if self.source is not None and self.source.profile else 'auto',
+            'negotiated': format_negotiated(self.source.negotiated) if self.source is not None else '',
+        }
+
+
+# One camera per process
+camera_service = CameraService()
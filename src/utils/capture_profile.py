@@ -0,0 +1,182 @@
+"""
+Capture profiles for SLAT.
+A profile is the resolution, frame rate and pixel format requested from the camera,
+written "640x480@30 MJPG" in the settings ("auto" keeps the driver default). Drivers
+silently substitute what they do not support, so the profile is validated against the
+device at open time: the format actually delivered is read back from the first frame
+and the next pixel format is tried when the requested one is refused.
+Face and QR modes have their own profile (capture_profile_face / capture_profile_qr).
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+import cv2
+
+MODE_FACE = 'face'
+MODE_QR = 'qr'
+
+DEFAULT_PROFILES = {
+    # Detector and embeddings work on 160 px crops; uncompressed 640x480@30 fits USB 2 and
+    # converts faster than a JPEG decodes
+    MODE_FACE: '640x480@30 YUYV',
+    # Small badges need pixels more than frame rate; 720p needs MJPG to reach 15 fps on USB 2
+    MODE_QR: '1280x720@15 MJPG',
+}
+
+# Choices offered in the admin settings (custom specs are accepted too)
+PROFILE_PRESETS = (
+    'auto',
+    '320x240@30 MJPG',
+    '640x480@15 MJPG',
+    '640x480@30 MJPG',
+    '640x480@30 YUYV',
+    '800x600@15 MJPG',
+    '1280x720@15 MJPG',
+    '1280x720@30 MJPG',
+    '1920x1080@15 MJPG',
+)
+
+# Tried in this order after the requested format
+PIXEL_FORMATS = ('MJPG', 'YUYV')
+
+_SPEC = re.compile(r'^\s*(\d+)\s*x\s*(\d+)\s*(?:@\s*(\d+(?:\.\d+)?))?\s*([A-Za-z0-9]{4})?\s*$')
+
+
+def fourcc_to_str(value: float) -> str:
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)) if code > 0 else ""
+
+
+class CaptureProfile:
+    def __init__(self, width: int, height: int, fps: float = 0.0, pixel_format: str = ''):
+        """
+        Args:
+            width, height: Requested frame size
+            fps: Requested frame rate (0 = driver default)
+            pixel_format: FOURCC such as "MJPG" or "YUYV" ('' = driver default)
+        """
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = float(fps)
+        self.pixel_format = pixel_format.upper()
+
+    @classmethod
+    def parse(cls, spec: str) -> Optional['CaptureProfile']:
+        """Parse "WIDTHxHEIGHT[@FPS] [FOURCC]".
+        Returns: Profile, or None for "auto" / empty
+        Raises: ValueError if the spec is malformed
+        """
+        if spec is None or spec.strip().lower() in ('', 'auto'):
+            return None
+        match = _SPEC.match(spec)
+        if not match:
+            raise ValueError(f"Profil de capture invalide: {spec!r} (attendu: 640x480@30 MJPG)")
+        width, height, fps, pixel_format = match.groups()
+        if int(width) <= 0 or int(height) <= 0:
+            raise ValueError(f"Profil de capture invalide: {spec!r}")
+        return cls(int(width), int(height), float(fps or 0), pixel_format or '')
+
+    @property
+    def spec(self) -> str:
+        text = f"{self.width}x{self.height}"
+        if self.fps:
+            text += f"@{self.fps:g}"
+        if self.pixel_format:
+            text += f" {self.pixel_format}"
+        return text
+
+    def __eq__(self, other):
+        return isinstance(other, CaptureProfile) and self.spec == other.spec
+
+    def __hash__(self):
+        return hash(self.spec)
+
+    def __repr__(self):
+        return f"CaptureProfile({self.spec!r})"
+
+    def pixel_formats(self) -> Tuple[str, ...]:
+        """Pixel formats to try, requested one first."""
+        if not self.pixel_format:
+            return ('',)
+        return (self.pixel_format,) + tuple(f for f in PIXEL_FORMATS if f != self.pixel_format)
+
+
+def load_capture_profiles(db) -> Dict[str, Optional[CaptureProfile]]:
+    """Profiles of the face and QR modes from the settings (invalid specs fall back to the defaults)."""
+    profiles = {}
+    for mode, default in DEFAULT_PROFILES.items():
+        spec = db.get_setting(f'capture_profile_{mode}') or default
+        try:
+            profiles[mode] = CaptureProfile.parse(spec)
+        except ValueError as e:
+            print(f"{e}; using {default}")
+            profiles[mode] = CaptureProfile.parse(default)
+    return profiles
+
+
+def negotiated_format(source, frame=None) -> Dict:
+    """Format the source is actually delivering (frame size wins over the reported properties)."""
+    width, height = int(source.get(cv2.CAP_PROP_FRAME_WIDTH)), int(source.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    if frame is not None:
+        height, width = frame.shape[:2]
+    return {
+        'width': width,
+        'height': height,
+        'fps': source.get(cv2.CAP_PROP_FPS),
+        'fourcc': fourcc_to_str(source.get(cv2.CAP_PROP_FOURCC)),
+    }
+
+
+def request_format(source, width: int = 0, height: int = 0, fps: float = 0.0, pixel_format: str = ''):
+    """Send a format request (FOURCC first: some backends reset the size when it changes)."""
+    if pixel_format and len(pixel_format) == 4 and pixel_format.isprintable():
+        source.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*pixel_format))
+    if width and height:
+        source.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        source.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    if fps:
+        source.set(cv2.CAP_PROP_FPS, fps)
+
+
+def apply_profile(source, profile: CaptureProfile) -> Tuple[bool, Optional[Dict], Optional[object]]:
+    """Request a profile and validate it with a real frame, trying the fallback pixel formats.
+    Returns: (exact, negotiated format, first frame); exact is False when the device delivers
+             another size or format than requested, frame is None if no frame could be read
+    """
+    best = None  # (pixel_format, negotiated, frame) of the best format that delivered frames
+    for pixel_format in profile.pixel_formats():
+        request_format(source, profile.width, profile.height, profile.fps, pixel_format)
+        ret, frame = source.read()
+        if not ret or frame is None:
+            continue
+        negotiated = negotiated_format(source, frame)
+        size_ok = (negotiated['width'], negotiated['height']) == (profile.width, profile.height)
+        # Backends that do not report the FOURCC (empty) are judged on the frame size only
+        format_ok = not pixel_format or not negotiated['fourcc'] or negotiated['fourcc'] == pixel_format
+        if size_ok and format_ok:
+            return True, negotiated, frame
+        # Formats are tried by preference: keep the first that delivers, unless a later one has the size
+        if best is None or (size_ok and (best[1]['width'], best[1]['height']) != (profile.width, profile.height)):
+            best = (pixel_format, negotiated, frame)
+    if best is None:
+        return False, None, None
+
+    # The device is in the last format tried: go back to the best one
+    pixel_format, negotiated, frame = best
+    request_format(source, profile.width, profile.height, profile.fps, pixel_format)
+    ret, new_frame = source.read()
+    if ret and new_frame is not None:
+        negotiated, frame = negotiated_format(source, new_frame), new_frame
+    return False, negotiated, frame
+
+
+def format_negotiated(negotiated: Optional[Dict]) -> str:
+    if not negotiated:
+        return "?"
+    text = f"{negotiated['width']}x{negotiated['height']}"
+    if negotiated.get('fps'):
+        text += f"@{negotiated['fps']:g}"
+    if negotiated.get('fourcc'):
+        text += f" {negotiated['fourcc']}"
+    return text
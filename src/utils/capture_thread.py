@@ -0,0 +1,133 @@
+"""
+Background camera capture for SLAT.
+A thread reads the camera continuously into a small preallocated ring of frame
+buffers, so the driver queue never fills up with stale frames, and consumers (GUI
+display, QR, face, photos) take the newest frame without blocking on the camera.
+Consumers normally go through utils.camera_service, which shares one thread.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class CaptureThread:
+    def __init__(self, source, slots: int = 3, max_failures: int = 10):
+        """
+        Args:
+            source: Opened FrameSource / cv2.VideoCapture-like object
+            slots: Frame buffers in the ring (>= 2: one being written, one published)
+            max_failures: Consecutive failed reads before the source is declared lost
+        """
+        self.source = source
+        self.slots = max(2, slots)
+        self.max_failures = max_failures
+
+        self._buffers = [None] * self.slots  # Allocated from the first frame's shape
+        self._latest = -1  # Slot of the newest complete frame
+        self._latest_time = None  # time.monotonic() when it was captured
+        self._sequence = 0  # Frames published so far
+        self._read_sequence = 0  # Newest sequence handed to any consumer
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._thread = None
+        self.failed = False  # Source stopped delivering frames
+
+        # Metrics
+        self.frames_read = 0  # Frames handed to consumers (unique)
+        self.started_at = None
+
+    def start(self) -> 'CaptureThread':
+        # Keep the driver queue minimal; the ring buffer replaces it (ignored by some backends)
+        self.source.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="camera-capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 1.0):
+        """Stop capturing (the source is left open; the caller releases it)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        failures = 0
+        while not self._stop.is_set():
+            # Write into the slot after the published one; consumers only copy the published slot
+            slot = (self._latest + 1) % self.slots
+            try:
+                ret, frame = self.source.read(self._buffers[slot]) if self._buffers[slot] is not None \
+                    else self.source.read()
+            except Exception as e:
+                print(f"Camera capture error: {e}")
+                ret, frame = False, None
+
+            if not ret or frame is None:
+                failures += 1
+                if failures >= self.max_failures:
+                    print("Camera capture lost")
+                    self.failed = True
+                    with self._lock:
+                        self._new_frame.notify_all()
+                    return
+                time.sleep(0.01)
+                continue
+            failures = 0
+
+            if frame is not self._buffers[slot]:
+                # First frame, or the resolution changed: (re)allocate the ring
+                if self._buffers[slot] is None or self._buffers[slot].shape != frame.shape:
+                    with self._lock:
+                        self._buffers = [np.empty_like(frame) for _ in range(self.slots)]
+                        self._latest = -1  # Previous frames have another size
+                self._buffers[slot][...] = frame
+
+            with self._lock:
+                self._latest = slot
+                self._latest_time = time.monotonic()
+                self._sequence += 1
+                self._new_frame.notify_all()
+
+    def read_latest(self, after_sequence: int = -1) -> Tuple[Optional[np.ndarray], Optional[float], int]:
+        """Copy of the newest frame, without waiting for the camera.
+        Args:
+            after_sequence: Sequence number of the last frame the consumer already has
+                (-1: return the newest frame even if it was seen)
+        Returns: (frame, capture time.monotonic(), sequence), or (None, None, after_sequence)
+                 if there is no frame newer than after_sequence
+        """
+        with self._lock:
+            if self._latest < 0 or (after_sequence >= 0 and self._sequence <= after_sequence):
+                return None, None, after_sequence
+            frame = self._buffers[self._latest].copy()
+            timestamp = self._latest_time
+            sequence = self._sequence
+            if sequence > self._read_sequence:
+                self._read_sequence = sequence
+                self.frames_read += 1
+        return frame, timestamp, sequence
+
+    def wait_for_frame(self, after_sequence: int = -1, timeout: float = 1.0) \
+            -> Tuple[Optional[np.ndarray], Optional[float], int]:
+        """Block until a frame newer than after_sequence exists (e.g. right after start)."""
+        with self._lock:
+            self._new_frame.wait_for(lambda: self._sequence > max(after_sequence, 0) or self.failed, timeout)
+        return self.read_latest(after_sequence)
+
+    def get_stats(self) -> Dict[str, float]:
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            'frames_captured': self._sequence,
+            'frames_processed': self.frames_read,
+            'frames_skipped': self._sequence - self.frames_read,
+            'capture_fps': self._sequence / elapsed if elapsed > 0 else 0.0,
+        }
@@ -0,0 +1,152 @@
+"""
+Temporal identity decision for SLAT face recognition.
+Accumulates per-frame match confidences of the face currently in front of the
+camera (a "track") and decides as soon as the evidence for the best candidate is
+decisive over the runner-up, or rejects after a bounded number of frames.
+"""
+
+import time
+from collections import deque
+from statistics import median
+from typing import Hashable, List, Optional, Tuple
+
+
+def _bbox_iou(a: List[int], b: List[int]) -> float:
+    """Intersection over union of two [x1, y1, x2, y2] boxes."""
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / float(union) if union > 0 else 0.0
+
+
+class FaceDecision:
+    """Result of TemporalIdentifier.update()."""
+    ACCEPTED = 'accepted'
+    REJECTED = 'rejected'
+    PENDING = 'pending'
+
+    def __init__(self, status: str, candidate: Optional[Hashable], confidence: float,
+                 margin: float, frames: int, elapsed: float):
+        self.status = status
+        self.candidate = candidate  # Best candidate key (employee_id)
+        self.confidence = confidence  # Mean confidence of the best candidate (0-100)
+        self.margin = margin  # Accumulated evidence over the runner-up
+        self.frames = frames  # Frames (= embeddings) used so far on this track
+        self.elapsed = elapsed  # Seconds since the track started
+
+
+class TemporalIdentifier:
+    def __init__(self, window_frames: int = 5, max_frames: int = 10, decisive_margin: float = 40.0,
+                 top_k: int = 5, track_gap_seconds: float = 1.0, min_track_iou: float = 0.3):
+        """
+        Args:
+            window_frames: Sliding window of frames whose confidences are summed
+            max_frames: Reject the track if no decision was reached after this many frames
+            decisive_margin: Summed confidence (0-100 per frame) the best candidate must have
+                over the runner-up. A strong single frame (e.g. 60% vs 0%) decides immediately,
+                a borderline user (e.g. 12% vs 0%) needs a few consistent frames.
+            top_k: Candidates kept per frame
+            track_gap_seconds: A pause longer than this without a face starts a new track
+            min_track_iou: Bounding boxes overlapping less than this start a new track
+        """
+        self.window_frames = window_frames
+        self.max_frames = max_frames
+        self.decisive_margin = decisive_margin
+        self.top_k = top_k
+        self.track_gap_seconds = track_gap_seconds
+        self.min_track_iou = min_track_iou
+
+        self._window = deque(maxlen=window_frames)
+        self._track_start = None
+        self._track_frames = 0
+        self._last_update = None
+        self._last_bbox = None
+
+        # Metrics
+        self.embeddings_computed = 0
+        self.accepted_count = 0
+        self.rejected_count = 0
+        self._decision_times = deque(maxlen=500)
+        self._decision_frames = deque(maxlen=500)
+
+    def reset(self):
+        """Drop the current track."""
+        self._window.clear()
+        self._track_start = None
+        self._track_frames = 0
+        self._last_update = None
+        self._last_bbox = None
+
+    def _is_same_track(self, bbox: Optional[List[int]], now: float) -> bool:
+        if self._track_start is None:
+            return False
+        if now - self._last_update > self.track_gap_seconds:
+            return False
+        if bbox is not None and self._last_bbox is not None:
+            return _bbox_iou(bbox, self._last_bbox) >= self.min_track_iou
+        return True
+
+    def update(self, candidates: List[Tuple[Hashable, float]], bbox: Optional[List[int]] = None,
+               now: Optional[float] = None) -> FaceDecision:
+        """Add one frame of evidence.
+        Args:
+            candidates: (employee_id, confidence 0-100) pairs for this frame's embedding
+            bbox: Face bounding box, used to tell a new person from the current one
+            now: Monotonic timestamp (defaults to time.monotonic())
+        Returns: FaceDecision with status accepted, rejected or pending
+        """
+        if now is None:
+            now = time.monotonic()
+
+        if not self._is_same_track(bbox, now):
+            self.reset()
+            self._track_start = now
+
+        self._last_update = now
+        self._last_bbox = bbox
+        self._track_frames += 1
+        self.embeddings_computed += 1
+
+        top = sorted((c for c in candidates if c[1] > 0.0), key=lambda c: c[1], reverse=True)
+        self._window.append(dict(top[:self.top_k]))
+
+        # Sum the evidence per candidate over the window
+        totals = {}
+        for frame_scores in self._window:
+            for key, confidence in frame_scores.items():
+                totals[key] = totals.get(key, 0.0) + confidence
+
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        best_key, best_total = ranked[0] if ranked else (None, 0.0)
+        runner_up_total = ranked[1][1] if len(ranked) > 1 else 0.0
+        margin = best_total - runner_up_total
+        confidence = best_total / len(self._window)
+        elapsed = now - self._track_start
+        frames = self._track_frames
+
+        if best_key is not None and margin >= self.decisive_margin:
+            status = FaceDecision.ACCEPTED
+            self.accepted_count += 1
+        elif frames >= self.max_frames:
+            status = FaceDecision.REJECTED
+            self.rejected_count += 1
+        else:
+            return FaceDecision(FaceDecision.PENDING, best_key, confidence, margin, frames, elapsed)
+
+        self._decision_times.append(elapsed)
+        self._decision_frames.append(frames)
+        self.reset()
+        return FaceDecision(status, best_key, confidence, margin, frames, elapsed)
+
+    def get_stats(self) -> dict:
+        """Return decision metrics."""
+        decisions = self.accepted_count + self.rejected_count
+        return {
+            'accepted': self.accepted_count,
+            'rejected': self.rejected_count,
+            'embeddings_computed': self.embeddings_computed,
+            'median_time_to_decision': median(self._decision_times) if self._decision_times else None,
+            'median_frames_per_decision': median(self._decision_frames) if self._decision_frames else None,
+            'embeddings_per_decision': self.embeddings_computed / float(decisions) if decisions else None,
+        }
@@ -0,0 +1,163 @@
+"""
+Face detector backends for SLAT.
+Every backend returns the same detection dicts:
+    {'bbox': [x1, y1, x2, y2], 'confidence': float,
+     'keypoints': {'left_eye', 'right_eye', 'nose', 'mouth_left', 'mouth_right': (x, y)}}
+Keypoint names follow the mtcnn package convention (left = left side of the image).
+
+Backends:
+    mtcnn-torch  facenet-pytorch MTCNN (PyTorch, no TensorFlow needed)
+    mtcnn-tf     mtcnn package (TensorFlow), the original detector
+    yunet        OpenCV FaceDetectorYN, needs a local ONNX model file
+"""
+
+import importlib.util
+import os
+import cv2
+import numpy as np
+from typing import List, Optional
+from utils.profiling import profiler
+
+BACKEND_AUTO = 'auto'
+BACKEND_MTCNN_TORCH = 'mtcnn-torch'
+BACKEND_MTCNN_TF = 'mtcnn-tf'
+BACKEND_YUNET = 'yunet'
+
+KEYPOINT_NAMES = ('left_eye', 'right_eye', 'nose', 'mouth_left', 'mouth_right')
+
+class FaceDetector:
+    """Base class of detector backends."""
+    name = ''
+
+    def detect(self, frame: np.ndarray) -> List[dict]:
+        """Detect faces in a BGR frame.
+        Returns: List of detection dicts (bbox, confidence, keypoints), unfiltered
+        """
+        raise NotImplementedError
+
+class MTCNNTensorFlowDetector(FaceDetector):
+    name = BACKEND_MTCNN_TF
+
+    def __init__(self, min_face_size: int = 80):
+        from mtcnn import MTCNN  # Pulls in TensorFlow
+        self.detector = MTCNN(min_face_size=min_face_size)
+
+    def detect(self, frame: np.ndarray) -> List[dict]:
+        # Convert BGR to RGB for MTCNN
+        with profiler.stage('color'):
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        with profiler.stage('detect'):
+            detections = self.detector.detect_faces(rgb_frame)
+        faces = []
+        for detection in detections:
+            x, y, w, h = detection['box']
+            faces.append({
+                'bbox': [x, y, x + w, y + h],
+                'confidence': detection['confidence'],
+                'keypoints': detection['keypoints']
+            })
+        return faces
+
+class MTCNNTorchDetector(FaceDetector):
+    name = BACKEND_MTCNN_TORCH
+
+    def __init__(self, min_face_size: int = 80, device=None):
+        import torch
+        from facenet_pytorch import MTCNN
+        if device is None:
+            device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.detector = MTCNN(min_face_size=min_face_size, keep_all=True, post_process=False, device=device)
+
+    def detect(self, frame: np.ndarray) -> List[dict]:
+        with profiler.stage('color'):
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        with profiler.stage('detect'):
+            boxes, probs, points = self.detector.detect(rgb_frame, landmarks=True)
+        if boxes is None:
+            return []
+        faces = []
+        for box, prob, landmarks in zip(boxes, probs, points):
+            faces.append({
+                'bbox': [int(round(v)) for v in box],
+                'confidence': float(prob),
+                'keypoints': {name: (int(round(x)), int(round(y))) for name, (x, y) in zip(KEYPOINT_NAMES, landmarks)}
+            })
+        return faces
+
+class YuNetDetector(FaceDetector):
+    name = BACKEND_YUNET
+
+    def __init__(self, model_path: str, min_face_size: int = 80, score_threshold: float = 0.6):
+        if model_path is None or not os.path.exists(model_path):
+            raise FileNotFoundError(f"YuNet model not found: {model_path}")
+        if not hasattr(cv2, 'FaceDetectorYN'):
+            raise ImportError("OpenCV build without FaceDetectorYN (needs OpenCV >= 4.5.4)")
+        self.min_face_size = min_face_size
+        self.detector = cv2.FaceDetectorYN.create(model_path, "", (320, 320), score_threshold, 0.3, 5000)
+        self.input_size = (320, 320)
+
+    def detect(self, frame: np.ndarray) -> List[dict]:
+        # YuNet works on BGR directly
+        h, w = frame.shape[:2]
+        if self.input_size != (w, h):
+            self.detector.setInputSize((w, h))
+            self.input_size = (w, h)
+        with profiler.stage('detect'):
+            _, detections = self.detector.detect(frame)
+        if detections is None:
+            return []
+        faces = []
+        for row in detections:
+            x, y, fw, fh = [int(round(v)) for v in row[:4]]
+            if min(fw, fh) < self.min_face_size:
+                continue
+            # Landmarks: right eye, left eye, nose, right mouth corner, left mouth corner of the
+            # person, i.e. image-left first, matching the mtcnn naming
+            landmarks = row[4:14].reshape(5, 2)
+            faces.append({
+                'bbox': [x, y, x + fw, y + fh],
+                'confidence': float(row[14]),
+                'keypoints': {name: (int(round(px)), int(round(py))) for name, (px, py) in zip(KEYPOINT_NAMES, landmarks)}
+            })
+        return faces
+
+_BACKENDS = {
+    BACKEND_MTCNN_TORCH: MTCNNTorchDetector,
+    BACKEND_MTCNN_TF: MTCNNTensorFlowDetector,
+    BACKEND_YUNET: YuNetDetector,
+}
+
+def _auto_order(yunet_model_path: Optional[str]) -> List[str]:
+    """Preferred backends: the original TensorFlow MTCNN when it is installed (existing
+    enrollments were cropped with its boxes), else YuNet when its model is deployed, then
+    the TensorFlow-free MTCNN."""
+    order = []
+    if importlib.util.find_spec('mtcnn') is not None:
+        order.append(BACKEND_MTCNN_TF)
+    if yunet_model_path and os.path.exists(yunet_model_path):
+        order.append(BACKEND_YUNET)
+    order.append(BACKEND_MTCNN_TORCH)
+    return order
+
+def create_detector(backend: str = BACKEND_AUTO, min_face_size: int = 80,
+                    yunet_model_path: Optional[str] = None) -> FaceDetector:
+    """Create the requested detector backend, falling back to the next available one.
+    Args:
+        backend: BACKEND_AUTO or one of the backend names
+        min_face_size: Smallest face (pixels) to report
+        yunet_model_path: Path of the YuNet ONNX model (backend used only if the file exists)
+    """
+    candidates = _auto_order(yunet_model_path)
+    if backend in _BACKENDS:
+        candidates = [backend] + [name for name in candidates if name != backend]
+    elif backend != BACKEND_AUTO:
+        print(f"Unknown face detector '{backend}', using auto selection")
+
+    for name in candidates:
+        try:
+            if name == BACKEND_YUNET:
+                return YuNetDetector(yunet_model_path, min_face_size=min_face_size)
+            return _BACKENDS[name](min_face_size=min_face_size)
+        except (ImportError, OSError, cv2.error) as e:  # OSError: model / weights file missing
+            print(f"Face detector '{name}' unavailable: {e}")
+    raise RuntimeError("No face detector backend available")
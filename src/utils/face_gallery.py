@@ -0,0 +1,178 @@
+"""
+Face template gallery for SLAT.
+Holds every face template (several per employee) as one normalized T x D matrix so
+an embedding is scored against all templates with a single matrix-vector product;
+the per-employee score is the max over that employee's templates (np.maximum.reduceat
+over contiguous rows). Matching cost grows with the template count inside numpy,
+not in a Python loop.
+"""
+
+import time
+import numpy as np
+from typing import Dict, Hashable, List, Optional, Tuple
+from utils.profiling import profiler
+
+
+class FaceGallery:
+    def __init__(self, db=None, max_templates: int = 5, add_min_confidence: float = 60.0,
+                 novelty_similarity: float = 0.85, revision_check_seconds: float = 2.0):
+        """
+        Args:
+            db: Database providing the face_templates table (None: fill with set_templates)
+            max_templates: Templates kept per employee when a template is learned
+            add_min_confidence: Match confidence (0-100) a frame needs before it can become a template
+            novelty_similarity: A frame becomes a template only if no template of the employee
+                is at least this similar (cosine), i.e. it shows a new appearance
+            revision_check_seconds: Minimum interval between database change checks
+        """
+        self.db = db
+        self.max_templates = max_templates
+        self.add_min_confidence = add_min_confidence
+        self.novelty_similarity = novelty_similarity
+        self.revision_check_seconds = revision_check_seconds
+
+        self._matrix = np.zeros((0, 0), dtype=np.float32)  # T x D, rows grouped by employee
+        self._template_ids = np.zeros(0, dtype=np.int64)
+        self._employee_ids = []  # Employee of each row group
+        self._starts = np.zeros(0, dtype=np.intp)  # First row of each group
+        self._ends = np.zeros(0, dtype=np.intp)
+        self._groups = {}  # employee_id -> group index
+        self._revision = None
+        self._last_check = None
+
+        # Metrics
+        self.reload_count = 0
+        self.learned_count = 0
+        self.match_count = 0
+        self.match_seconds = 0.0
+
+    @property
+    def template_count(self) -> int:
+        return len(self._template_ids)
+
+    @property
+    def employee_count(self) -> int:
+        return len(self._employee_ids)
+
+    def refresh(self, force: bool = False, now: Optional[float] = None) -> bool:
+        """Reload the templates if the table changed since the last load.
+        Returns: True if the gallery was reloaded
+        """
+        if self.db is None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        if not force and self._last_check is not None and now - self._last_check < self.revision_check_seconds:
+            return False
+        self._last_check = now
+
+        revision = self.db.get_face_templates_revision()
+        if not force and revision == self._revision:
+            return False
+        self._revision = revision
+        self.set_templates(self.db.get_face_templates())
+        return True
+
+    def set_templates(self, rows: List[Tuple[int, Hashable, bytes]]):
+        """Build the matrix from (template_id, employee_id, embedding_bytes) rows grouped by employee."""
+        embeddings, template_ids, owners = [], [], []
+        dim = None
+        for template_id, employee_id, blob in rows:
+            if not blob:
+                continue
+            embedding = np.frombuffer(blob, dtype=np.float32)
+            if dim is None:
+                dim = embedding.size
+            if embedding.size != dim:
+                print(f"Skipping face template {template_id}: {embedding.size} values, expected {dim}")
+                continue
+            embeddings.append(embedding)
+            template_ids.append(template_id)
+            owners.append(employee_id)
+
+        if embeddings:
+            matrix = np.vstack(embeddings)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.maximum(norms, 1e-12)
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+
+        # Row groups: consecutive rows of the same employee (rows arrive ordered by employee)
+        starts, employee_ids = [], []
+        for row, employee_id in enumerate(owners):
+            if row == 0 or employee_id != owners[row - 1]:
+                starts.append(row)
+                employee_ids.append(employee_id)
+
+        self._matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        self._template_ids = np.asarray(template_ids, dtype=np.int64)
+        self._employee_ids = employee_ids
+        self._starts = np.asarray(starts, dtype=np.intp)
+        self._ends = np.append(self._starts[1:], len(owners)).astype(np.intp)
+        self._groups = {employee_id: i for i, employee_id in enumerate(employee_ids)}
+        self.reload_count += 1
+
+    def match(self, embedding: np.ndarray, top_k: int = 5) -> List[Tuple[Hashable, float, int]]:
+        """Score an embedding against every template.
+        Returns: Up to top_k (employee_id, similarity, template_id) sorted by similarity, where
+                 similarity is the best cosine similarity over the employee's templates
+        """
+        if self.template_count == 0:
+            return []
+        start = time.perf_counter()
+
+        with profiler.stage('match'):
+            query = np.asarray(embedding, dtype=np.float32)
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+            similarities = self._matrix @ query  # T
+            per_employee = np.maximum.reduceat(similarities, self._starts)  # E
+
+            k = min(top_k, len(per_employee))
+            if k < len(per_employee):
+                best = np.argpartition(-per_employee, k - 1)[:k]
+            else:
+                best = np.arange(len(per_employee))
+            best = best[np.argsort(-per_employee[best])]
+
+            results = []
+            for group in best:
+                first, last = self._starts[group], self._ends[group]
+                row = first + int(np.argmax(similarities[first:last]))
+                results.append((self._employee_ids[group], float(per_employee[group]), int(self._template_ids[row])))
+
+        self.match_count += 1
+        self.match_seconds += time.perf_counter() - start
+        return results
+
+    def learn(self, employee_id: Hashable, embedding: np.ndarray, confidence: float) -> bool:
+        """Add the embedding of an accepted match as a new template of the employee if the match
+        was confident and the embedding differs from every existing template.
+        Returns: True if a template was added
+        """
+        if self.db is None or confidence < self.add_min_confidence:
+            return False
+        group = self._groups.get(employee_id)
+        if group is None:
+            return False
+
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        closest = float(np.max(self._matrix[self._starts[group]:self._ends[group]] @ query))
+        if closest >= self.novelty_similarity:
+            return False
+
+        self.db.add_face_template(employee_id, query.tobytes(), source='ADAPTIVE', quality=closest,
+                                  max_templates=self.max_templates)
+        self.learned_count += 1
+        self.refresh(force=True)
+        return True
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'templates': self.template_count,
+            'employees': self.employee_count,
+            'reloads': self.reload_count,
+            'learned': self.learned_count,
+            'matches': self.match_count,
+            'mean_match_ms': self.match_seconds / self.match_count * 1000 if self.match_count else 0.0,
+        }
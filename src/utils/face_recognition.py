@@ -1,7 +1,7 @@
 """
 Face recognition utilities for SLAT.
 Compliant with Mandatory Face Recognition Architecture specifications.
-Uses MTCNN for detection and FaceNet for recognition.
+Uses MTCNN (or another backend from face_detectors) for detection and FaceNet for recognition.
 """
 
 import cv2
@@ -9,34 +9,171 @@ import numpy as np
 from typing import Optional, Tuple, List
 import os
 import sys
-from mtcnn import MTCNN
+import time
 from facenet_pytorch import InceptionResnetV1
 import torch
 from PIL import Image
+from utils.face_detectors import create_detector, BACKEND_AUTO
+from utils.camera_service import camera_service
+from utils.capture_profile import MODE_FACE
+from utils.profiling import profiler
 
 def resource_path(rel_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
     base = getattr(sys, '_MEIPASS', os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     return os.path.join(base, rel_path)
 
+# FaceNet weights (VGGFace2) and the frozen TorchScript artifacts exported from them
+WEIGHTS_PATH = "models/20180402-114759-vggface2.pt"
+COMPILED_MODEL_PATH = "models/20180402-114759-vggface2.torchscript.pt"
+QUANTIZED_MODEL_PATH = "models/20180402-114759-vggface2.int8.torchscript.pt"
+
+# OpenCV YuNet face detector (optional, enables the 'yunet' detector backend)
+YUNET_MODEL_PATH = "models/face_detection_yunet_2023mar.onnx"
+
+# Recognition model precisions selectable in settings ('face_model_precision')
+PRECISION_FLOAT = 'float'
+PRECISION_INT8 = 'int8'
+
+def preprocess_faces(faces: List[np.ndarray]) -> torch.Tensor:
+    """Convert cropped BGR faces to a normalized N x 3 x 160 x 160 FaceNet input tensor."""
+    batch = np.stack([cv2.cvtColor(cv2.resize(face, (160, 160)), cv2.COLOR_BGR2RGB) for face in faces])
+    tensor = torch.from_numpy(batch).permute(0, 3, 1, 2).float()
+    return (tensor - 127.5) / 128.0
+
+def build_recognition_model(device: torch.device, weights_path: Optional[str] = None) -> torch.nn.Module:
+    """Build InceptionResnetV1 from the local state dict (offline deployment)."""
+    if weights_path is None:
+        weights_path = resource_path(WEIGHTS_PATH)
+    model = InceptionResnetV1(pretrained=None).eval()
+    
+    # Load state dict and remove unexpected keys
+    state_dict = torch.load(weights_path, map_location=device)
+    # Remove logits layers (only needed for training)
+    state_dict = {k: v for k, v in state_dict.items() if not k.startswith('logits')}
+    model.load_state_dict(state_dict, strict=False)
+    return model.to(device)
+
+def export_recognition_model(weights_path: Optional[str] = None, output_path: Optional[str] = None) -> str:
+    """Trace and freeze FaceNet into a TorchScript artifact for fast cold start.
+    Returns: Path of the written artifact
+    """
+    if weights_path is None:
+        weights_path = resource_path(WEIGHTS_PATH)
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(weights_path), os.path.basename(COMPILED_MODEL_PATH))
+    
+    model = build_recognition_model(torch.device('cpu'), weights_path)
+    example = torch.zeros(1, 3, 160, 160)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+        # Weights and attributes become constants; no Python module rebuild at load time
+        frozen = torch.jit.freeze(traced)
+    frozen.save(output_path)
+    return output_path
+
+def export_quantized_model(calibration_faces: List[np.ndarray], weights_path: Optional[str] = None,
+                           output_path: Optional[str] = None) -> str:
+    """Statically quantize FaceNet to int8 (conv and linear layers) and save it as TorchScript.
+    Args:
+        calibration_faces: Cropped BGR face images used to calibrate activation ranges
+            (a few hundred faces from the site, in real lighting, is plenty)
+    Returns: Path of the written artifact
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+    
+    if weights_path is None:
+        weights_path = resource_path(WEIGHTS_PATH)
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(weights_path), os.path.basename(QUANTIZED_MODEL_PATH))
+    if not calibration_faces:
+        raise ValueError("At least one calibration face is required")
+    
+    model = build_recognition_model(torch.device('cpu'), weights_path)
+    example = torch.zeros(1, 3, 160, 160)
+    qconfig_mapping = get_default_qconfig_mapping(torch.backends.quantized.engine)
+    prepared = prepare_fx(model, qconfig_mapping, (example,))
+    
+    # Calibration: observers record activation ranges
+    with torch.no_grad():
+        for start in range(0, len(calibration_faces), 16):
+            prepared(preprocess_faces(calibration_faces[start:start + 16]))
+    
+    quantized = convert_fx(prepared)
+    with torch.no_grad():
+        frozen = torch.jit.freeze(torch.jit.trace(quantized, example))
+    frozen.save(output_path)
+    return output_path
+
+def quantize_dynamic_model(model: torch.nn.Module) -> torch.nn.Module:
+    """Dynamic int8 quantization (linear layers only) when no calibrated artifact exists."""
+    from torch.ao.quantization import quantize_dynamic
+    return quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def _load_artifact(path: str, weights_path: str, device: torch.device) -> Optional[torch.nn.Module]:
+    """Load a TorchScript artifact if it exists and is not older than the weights."""
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(weights_path) and os.path.getmtime(path) < os.path.getmtime(weights_path):
+        print(f"{os.path.basename(path)} is older than {WEIGHTS_PATH}, ignoring it (re-run export_model.py)")
+        return None
+    try:
+        return torch.jit.load(path, map_location=device).eval()
+    except Exception as e:
+        print(f"Failed to load {os.path.basename(path)}, falling back: {e}")
+        return None
+
+def load_recognition_model(device: torch.device, precision: str = PRECISION_FLOAT) -> Tuple[torch.nn.Module, str]:
+    """Load the compiled artifact when present and up to date, otherwise build from weights.
+    Args:
+        device: Target device (int8 models always run on CPU)
+        precision: PRECISION_FLOAT or PRECISION_INT8
+    Returns: (model, source) where source is 'torchscript', 'state_dict', 'int8_static' or 'int8_dynamic'
+    """
+    weights_path = resource_path(WEIGHTS_PATH)
+    
+    if precision == PRECISION_INT8:
+        model = _load_artifact(resource_path(QUANTIZED_MODEL_PATH), weights_path, torch.device('cpu'))
+        if model is not None:
+            return model, 'int8_static'
+        print("No calibrated int8 model found, using dynamic quantization (linear layers only)")
+        return quantize_dynamic_model(build_recognition_model(torch.device('cpu'), weights_path)), 'int8_dynamic'
+    
+    model = _load_artifact(resource_path(COMPILED_MODEL_PATH), weights_path, device)
+    if model is not None:
+        # Graph rewrites (conv/bn folding, MKLDNN) don't survive serialization, apply them here
+        try:
+            model = torch.jit.optimize_for_inference(model)
+        except Exception as e:
+            print(f"optimize_for_inference skipped: {e}")
+        return model, 'torchscript'
+    
+    return build_recognition_model(device, weights_path), 'state_dict'
+
 class FaceRecognition:
-    def __init__(self):
-        # Initialize MTCNN detector
-        self.detector = MTCNN(min_face_size=80)
+    def __init__(self, precision: str = PRECISION_FLOAT, detector_backend: str = BACKEND_AUTO):
+        """
+        Args:
+            precision: Recognition model precision, PRECISION_FLOAT or PRECISION_INT8 (CPU only)
+            detector_backend: Face detector backend name (see utils.face_detectors), 'auto' picks
+                YuNet if its model is deployed, then the PyTorch MTCNN, then the TensorFlow one
+        """
+        # Initialize face detector
+        self.detector = create_detector(detector_backend, min_face_size=80,
+                                        yunet_model_path=resource_path(YUNET_MODEL_PATH))
         
         # Initialize FaceNet recognition model (pre-trained on VGGFace2)
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        
-        # Load model from local weights (offline deployment)
-        weights_path = resource_path("models/20180402-114759-vggface2.pt")
-        self.recognition_model = InceptionResnetV1(pretrained=None).eval()
+        self.precision = precision
+        if precision == PRECISION_INT8:
+            self.device = torch.device('cpu')  # Quantized kernels are CPU only
+        else:
+            self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         
-        # Load state dict and remove unexpected keys
-        state_dict = torch.load(weights_path, map_location=self.device)
-        # Remove logits layers (only needed for training)
-        state_dict = {k: v for k, v in state_dict.items() if not k.startswith('logits')}
-        self.recognition_model.load_state_dict(state_dict, strict=False)
-        self.recognition_model = self.recognition_model.to(self.device)
+        # Load model (precompiled TorchScript artifact if exported, local weights otherwise)
+        load_start = time.perf_counter()
+        self.recognition_model, self.model_source = load_recognition_model(self.device, precision)
+        self.model_ready_seconds = time.perf_counter() - load_start
         
         # Similarity threshold for FaceNet (cosine similarity)
         self.similarity_threshold = 0.5  # Calibrated for FaceNet embeddings
@@ -44,80 +181,118 @@ class FaceRecognition:
         # Face detection confidence threshold
         self.detection_threshold = 0.85  # Lowered for better detection
         
-        print(f"Initialized MTCNN detector and FaceNet model on {self.device}")
+        # Preallocated batch buffers for extract_embeddings (grown on demand)
+        self._batch_capacity = 0
+        self._face_buffer = None  # N x 160 x 160 x 3 uint8 (RGB)
+        self._input_tensor = None  # N x 3 x 160 x 160 float32 on self.device
+        
+        print(f"Initialized {self.detector.name} detector and FaceNet model on {self.device} "
+              f"({self.model_source}, ready in {self.model_ready_seconds:.2f}s)")
+
+    @classmethod
+    def from_settings(cls, db) -> 'FaceRecognition':
+        """Create a recognizer configured from the terminal settings table."""
+        return cls(precision=db.get_setting('face_model_precision') or PRECISION_FLOAT,
+                   detector_backend=db.get_setting('face_detector') or BACKEND_AUTO)
 
     def _detect_faces(self, frame: np.ndarray) -> List[dict]:
-        """Detect faces using MTCNN.
+        """Detect faces with the configured detector backend.
         Returns: List of face dictionaries with bbox, confidence, and landmarks
         """
         try:
-            # Convert BGR to RGB for MTCNN
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Detect faces
-            detections = self.detector.detect_faces(rgb_frame)
-            
-            faces = []
-            for detection in detections:
-                confidence = detection['confidence']
-                if confidence >= self.detection_threshold:
-                    x, y, w, h = detection['box']
-                    # Convert to x1, y1, x2, y2 format
-                    bbox = [x, y, x + w, y + h]
-                    faces.append({
-                        'bbox': bbox,
-                        'confidence': confidence,
-                        'keypoints': detection['keypoints']
-                    })
-            
-            return faces
+            # Keep confident detections only
+            return [face for face in self.detector.detect(frame)
+                    if face['confidence'] >= self.detection_threshold]
         
         except Exception as e:
-            print(f"Error in MTCNN face detection: {e}")
+            print(f"Error in {self.detector.name} face detection: {e}")
             return []
 
-    def _extract_embedding(self, frame: np.ndarray, bbox: List[int]) -> Optional[np.ndarray]:
-        """Extract FaceNet embedding from a detected face.
-        Args:
-            frame: Image frame (BGR)
-            bbox: Bounding box [x1, y1, x2, y2]
-        Returns: 512-dimensional embedding vector or None
+    def _clamp_bbox(self, frame: np.ndarray, bbox: Optional[List[int]]) -> Tuple[int, int, int, int]:
+        """Clamp a [x1, y1, x2, y2] box to the frame (None = whole frame)."""
+        h, w = frame.shape[:2]
+        if bbox is None:
+            return 0, 0, w, h
+        x1, y1, x2, y2 = [int(v) for v in bbox]
+        return max(0, x1), max(0, y1), min(w, x2), min(h, y2)
+
+    def _prepare_face(self, frame: np.ndarray, bbox: Optional[List[int]], out: np.ndarray) -> bool:
+        """Crop a face, resize it to 160x160 and convert it to RGB into a preallocated slot.
+        Returns: False if the crop is empty
         """
-        try:
-            x1, y1, x2, y2 = bbox
-            
-            # Ensure coordinates are within frame bounds
-            h, w = frame.shape[:2]
-            x1 = max(0, x1)
-            y1 = max(0, y1)
-            x2 = min(w, x2)
-            y2 = min(h, y2)
-            
-            # Crop and preprocess face
+        with profiler.stage('crop_resize'):
+            x1, y1, x2, y2 = self._clamp_bbox(frame, bbox)
             face = frame[y1:y2, x1:x2]
             if face.size == 0:
-                return None
+                return False
+            
+            # Resize to 160x160 (FaceNet input size), then BGR -> RGB in place
+            cv2.resize(face, (160, 160), dst=out)
+            cv2.cvtColor(out, cv2.COLOR_BGR2RGB, dst=out)
+            return True
+
+    def _ensure_batch_buffers(self, batch_size: int):
+        """Grow the preallocated input buffers so they hold at least batch_size faces."""
+        if batch_size <= self._batch_capacity:
+            return
+        capacity = max(batch_size, 2 * self._batch_capacity, 8)
+        self._face_buffer = np.empty((capacity, 160, 160, 3), dtype=np.uint8)
+        self._input_tensor = torch.empty((capacity, 3, 160, 160), dtype=torch.float32, device=self.device)
+        self._batch_capacity = capacity
+
+    def extract_embeddings(self, faces: List[Tuple[np.ndarray, Optional[List[int]]]],
+                           max_batch_size: int = 32) -> List[Optional[np.ndarray]]:
+        """Extract FaceNet embeddings for many faces with one forward pass per batch.
+        Args:
+            faces: (image BGR, bbox [x1, y1, x2, y2]) pairs. Several boxes of the same frame
+                and boxes from different frames can be mixed; bbox None uses the whole image
+                (already cropped face).
+            max_batch_size: Upper bound of faces per forward pass
+        Returns: List of 512-dimensional normalized embeddings, None for empty crops
+        """
+        results = [None] * len(faces)
+        
+        for start in range(0, len(faces), max_batch_size):
+            chunk = faces[start:start + max_batch_size]
+            self._ensure_batch_buffers(len(chunk))
             
-            # Convert BGR to RGB
-            face_rgb = cv2.cvtColor(face, cv2.COLOR_BGR2RGB)
+            # Crop and preprocess into the preallocated uint8 buffer
+            valid = []
+            for offset, (frame, bbox) in enumerate(chunk):
+                if self._prepare_face(frame, bbox, self._face_buffer[len(valid)]):
+                    valid.append(start + offset)
             
-            # Resize to 160x160 (FaceNet input size)
-            face_resized = cv2.resize(face_rgb, (160, 160))
+            count = len(valid)
+            if count == 0:
+                continue
             
-            # Convert to tensor and normalize
-            face_tensor = torch.from_numpy(face_resized).permute(2, 0, 1).float()
-            face_tensor = (face_tensor - 127.5) / 128.0
-            face_tensor = face_tensor.unsqueeze(0).to(self.device)
+            # Convert to tensor and normalize in place (NHWC uint8 -> NCHW float32)
+            with profiler.stage('tensor'):
+                batch = self._input_tensor[:count]
+                batch.copy_(torch.from_numpy(self._face_buffer[:count]).permute(0, 3, 1, 2))
+                batch.sub_(127.5).div_(128.0)
             
-            # Extract embedding
-            with torch.no_grad():
-                embedding = self.recognition_model(face_tensor)
+            # Extract embeddings (.cpu() waits for the device, so it is part of the forward time)
+            with profiler.stage('forward'), torch.no_grad():
+                embeddings = self.recognition_model(batch).cpu().numpy()
             
-            # Convert to numpy and normalize
-            embedding = embedding.cpu().numpy().flatten()
-            embedding = embedding / np.linalg.norm(embedding)
+            # Normalize
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
             
-            return embedding
+            for index, embedding in zip(valid, embeddings):
+                results[index] = embedding
+        
+        return results
+
+    def _extract_embedding(self, frame: np.ndarray, bbox: List[int]) -> Optional[np.ndarray]:
+        """Extract FaceNet embedding from a detected face.
+        Args:
+            frame: Image frame (BGR)
+            bbox: Bounding box [x1, y1, x2, y2]
+        Returns: 512-dimensional embedding vector or None
+        """
+        try:
+            return self.extract_embeddings([(frame, bbox)])[0]
         
         except Exception as e:
             print(f"Error extracting embedding: {e}")
@@ -125,57 +300,23 @@ class FaceRecognition:
 
     def test_camera(self) -> bool:
         """Test if camera is available with robust initialization."""
-        # Try different camera indices
-        for camera_index in [0, 1, 2]:
-            try:
-                cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-
-                if cap.isOpened():
-                    # Test if we can actually read frames
-                    ret, test_frame = cap.read()
-                    if ret and test_frame is not None:
-                        cap.release()
-                        return True
-                    else:
-                        cap.release()
-                        continue
-                else:
-                    continue
-
-            except Exception as e:
-                print(f"Failed to test camera {camera_index}: {e}")
-                continue
-
-        return False
+        # The camera service probes the indices and keeps the one that works
+        cap = camera_service.subscribe("camera test")
+        if cap is None:
+            return False
+        cap.release()
+        return True
 
     def capture_face_for_enrollment(self) -> Optional[Tuple[np.ndarray, str]]:
         """Capture face for enrollment and return embedding vector.
         Returns: (embedding_vector, status_message) or (None, error_message)
         """
-        # Initialize camera
-        cap = None
-        for camera_index in [0, 1, 2]:
-            try:
-                cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-                if cap.isOpened():
-                    ret, _ = cap.read()
-                    if ret:
-                        break
-                cap.release()
-                cap = None
-            except:
-                continue
-
+        # Shared camera from the camera service
+        cap = camera_service.subscribe("enrollment", MODE_FACE)  # Face capture profile (640x480@30 YUYV by default)
         if cap is None:
             return None, "Aucune caméra détectée"
 
-        # Optimize settings
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        cap.set(cv2.CAP_PROP_FPS, 30)
-
-        best_embedding = None
-        best_quality = 0
+        captured_faces = []  # (face crop, detection confidence) of the frames held in position
         countdown = 0
         frame_skip = 0
 
@@ -193,7 +334,7 @@ class FaceRecognition:
                     break
                 continue
 
-            # Detect faces using MTCNN
+            # Detect faces
             faces = self._detect_faces(frame)
 
             status = ""
@@ -224,13 +365,10 @@ class FaceRecognition:
                     status = f"BON - Maintien position ({countdown}/20)"
                     countdown += 1
 
-                    # Extract embedding from this frame
-                    current_embedding = self._extract_embedding(frame, [int(v) for v in bbox])
-                    
-                    # Update best embedding
-                    if current_embedding is not None and confidence > best_quality:
-                        best_quality = confidence
-                        best_embedding = current_embedding
+                    # Keep the face crop; embeddings are computed in one batch after capture
+                    x1, y1, x2, y2 = self._clamp_bbox(frame, bbox)
+                    if x2 > x1 and y2 > y1:
+                        captured_faces.append((frame[y1:y2, x1:x2].copy(), confidence))
 
                     # Auto-capture after 20 frames (~0.7s)
                     if countdown >= 20:
@@ -264,17 +402,28 @@ class FaceRecognition:
             key = cv2.waitKey(1) & 0xFF
             if key == ord('q'):
                 break
-            elif key == ord(' ') and best_embedding is not None:
+            elif key == ord(' ') and captured_faces:
                 break
 
         cap.release()
         cv2.destroyAllWindows()
 
-        if best_embedding is not None:
-            return best_embedding, "Succès"
-        else:
+        if not captured_faces:
             return None, "Échec de capture"
 
+        # Embed all captured frames in one batch and enroll the one with the best detection confidence
+        embeddings = self.extract_embeddings([(face, None) for face, _ in captured_faces])
+        best_embedding = None
+        best_quality = 0
+        for embedding, (_, confidence) in zip(embeddings, captured_faces):
+            if embedding is not None and confidence > best_quality:
+                best_quality = confidence
+                best_embedding = embedding
+        if best_embedding is None:
+            return None, "Échec de capture"
+        
+        return best_embedding, "Succès"
+
     def detect_and_extract_face(self, frame: np.ndarray) -> Optional[Tuple[np.ndarray, dict]]:
         """Detect a single face in the frame and extract its embedding.
         Args:
@@ -283,7 +432,7 @@ class FaceRecognition:
             face_info contains: {'bbox': [x1, y1, x2, y2], 'confidence': float}
         """
         try:
-            # Detect faces using MTCNN
+            # Detect faces
             faces = self._detect_faces(frame)
             
             if len(faces) != 1:
@@ -312,30 +461,9 @@ class FaceRecognition:
         """Capture a face for recognition and return embedding vector and raw frame.
         Returns: (embedding_vector, raw_frame) or (None, None)
         """
-        # Initialize camera with robust fallback
-        cap = None
-        for camera_index in [0, 1, 2]:
-            try:
-                cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-
-                if cap.isOpened():
-                    # Test if we can actually read frames
-                    ret, test_frame = cap.read()
-                    if ret and test_frame is not None:
-                        print(f"Camera initialized successfully on index {camera_index} for recognition")
-                        break
-                    else:
-                        cap.release()
-                        cap = None
-                        continue
-                else:
-                    continue
-
-            except Exception as e:
-                print(f"Failed to initialize camera {camera_index} for recognition: {e}")
-                continue
-
-        if cap is None or not cap.isOpened():
+        # Shared camera from the camera service (index fallback is done there)
+        cap = camera_service.subscribe("recognition", MODE_FACE)
+        if cap is None:
             return None, None
 
         captured_embedding = None
@@ -353,7 +481,7 @@ class FaceRecognition:
 
             consecutive_failures = 0
 
-            # Detect faces using MTCNN
+            # Detect faces
             faces = self._detect_faces(frame)
 
             if len(faces) == 1:
@@ -405,27 +533,23 @@ class FaceRecognition:
             captured_embedding = captured_embedding / np.linalg.norm(captured_embedding)
 
             # Calculate cosine similarity between embeddings
-            similarity = np.dot(stored_embedding, captured_embedding)
+            with profiler.stage('match'):
+                similarity = np.dot(stored_embedding, captured_embedding)
 
-            # Convert similarity to confidence percentage
-            # FaceNet embeddings typically range from 0.3 to 1.0 for matches
-            # Threshold of 0.6 is a good balance
-            if similarity <= self.similarity_threshold:
-                confidence = 0.0
-            else:
-                # Linear mapping from threshold to 1.0
-                confidence = ((similarity - self.similarity_threshold) /
-                            (1.0 - self.similarity_threshold)) * 100.0
-
-            # Ensure confidence is between 0 and 100
-            confidence = max(0.0, min(100.0, confidence))
-
-            return confidence
+            return float(self.similarity_to_confidence(similarity))
 
         except Exception as e:
             print(f"Error in face matching: {e}")
             return 0.0
 
+    def similarity_to_confidence(self, similarity):
+        """Convert cosine similarity (scalar or array) to confidence percentage (0-100)."""
+        # FaceNet embeddings typically range from 0.3 to 1.0 for matches
+        # Linear mapping from the similarity threshold (0%) to 1.0 (100%)
+        confidence = ((np.asarray(similarity) - self.similarity_threshold) /
+                      (1.0 - self.similarity_threshold)) * 100.0
+        return np.clip(confidence, 0.0, 100.0)
+
     def is_match_accepted(self, confidence: float) -> bool:
         """Determine if the confidence level meets the acceptance threshold."""
         return confidence > 0.0  # Any confidence above 0% is considered a match
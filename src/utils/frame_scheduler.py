@@ -0,0 +1,171 @@
+"""
+Frame scheduling for the kiosk.
+Each stage (preview, QR decode, face inference) runs at its own target rate instead of
+all of them on every timer tick. The scheduler measures what each stage costs on the
+GUI thread and, when the stages together keep it busier than max_load, lowers the
+rate of the sheddable stages in shed order (face inference first, then QR decoding),
+restoring them when the load drops. The preview is never shed, and every tick leaves
+at least min_idle_ms to the event loop so input stays responsive.
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+SHED_STEP = 0.8  # Rate multiplier per overloaded check
+RESTORE_STEP = 1.1  # Rate multiplier per relaxed check
+RESTORE_BELOW = 0.75  # Restore when load < max_load * RESTORE_BELOW
+LOAD_WINDOW = 2.0  # Seconds of history for the load and achieved rates
+ADAPT_INTERVAL = 0.5  # Seconds between rate adjustments (lets the load window follow)
+
+
+class _StageState:
+    def __init__(self, name: str, target_fps: float, min_fps: float, shed_order: Optional[int]):
+        self.name = name
+        self.target_fps = target_fps
+        self.min_fps = min(min_fps, target_fps)
+        self.shed_order = shed_order  # None: never shed
+        self.fps = target_fps  # Allowed rate (lowered while overloaded)
+        self.next_due = 0.0
+        self.runs = deque()  # (start, seconds) within LOAD_WINDOW
+        self.count = 0
+        self.total_seconds = 0.0
+
+    def prune(self, now: float):
+        while self.runs and now - self.runs[0][0] > LOAD_WINDOW:
+            self.runs.popleft()
+
+
+class FrameScheduler:
+    def __init__(self, max_load: float = 0.7, min_idle_ms: float = 10.0, max_delay_ms: float = 100.0):
+        """
+        Args:
+            max_load: Share of the GUI thread the stages may use before work is shed
+            min_idle_ms: Minimum gap between ticks left to input and painting
+            max_delay_ms: Longest wait between ticks (bounds reaction to a new stage)
+        """
+        self.max_load = max_load
+        self.min_idle = min_idle_ms / 1000.0
+        self.max_delay = max_delay_ms / 1000.0
+        self.stages = {}
+        self.active = None  # Stages the tick delay waits for (None: all)
+        self.ceiling_fps = None  # Rate cap on every stage while the terminal is idle
+        self.shed_events = 0
+        self._last_adapt = 0.0
+
+    def add_stage(self, name: str, target_fps: float, min_fps: float = 1.0, shed_order: Optional[int] = None):
+        """Register a stage.
+        Args:
+            target_fps: Rate the stage runs at when the terminal keeps up (0 = every tick)
+            min_fps: Lowest rate shedding can bring it to
+            shed_order: Lower values are shed first; None never sheds the stage
+        """
+        self.stages[name] = _StageState(name, target_fps, min_fps, shed_order)
+
+    def set_ceiling(self, fps: Optional[float]):
+        """Cap every stage at fps (None: back to the scheduled rates)."""
+        self.ceiling_fps = fps if fps and fps > 0 else None
+        if self.ceiling_fps is None:
+            # Waking up: run the stages right away instead of at the idle cadence
+            for stage in self.stages.values():
+                stage.next_due = 0.0
+
+    def _rate(self, stage: _StageState) -> float:
+        if self.ceiling_fps is None:
+            return stage.fps
+        return min(stage.fps, self.ceiling_fps) if stage.fps > 0 else self.ceiling_fps
+
+    def due(self, name: str, now: Optional[float] = None) -> bool:
+        stage = self.stages[name]
+        return self._rate(stage) <= 0 or (time.monotonic() if now is None else now) >= stage.next_due
+
+    @contextmanager
+    def run(self, name: str):
+        """Time one run of a stage and schedule its next run."""
+        stage = self.stages[name]
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            end = time.monotonic()
+            stage.runs.append((start, end - start))
+            stage.count += 1
+            stage.total_seconds += end - start
+            rate = self._rate(stage)
+            if rate > 0:
+                interval = 1.0 / rate
+                # Keep the cadence, but do not try to catch up on missed runs
+                next_due = stage.next_due + interval
+                stage.next_due = next_due if next_due > start else start + interval
+            self._adapt(end)
+
+    def load(self, now: Optional[float] = None) -> float:
+        """Share of the last LOAD_WINDOW seconds spent in the stages."""
+        now = time.monotonic() if now is None else now
+        busy = 0.0
+        for stage in self.stages.values():
+            stage.prune(now)
+            busy += sum(seconds for _, seconds in stage.runs)
+        return busy / LOAD_WINDOW
+
+    def _adapt(self, now: float):
+        if now - self._last_adapt < ADAPT_INTERVAL:
+            return
+        self._last_adapt = now
+        load = self.load(now)
+        sheddable = sorted((s for s in self.stages.values() if s.shed_order is not None and s.runs),
+                           key=lambda s: s.shed_order)
+        if load > self.max_load:
+            for stage in sheddable:
+                if stage.fps > stage.min_fps:
+                    stage.fps = max(stage.min_fps, stage.fps * SHED_STEP)
+                    self.shed_events += 1
+                    return
+        elif load < self.max_load * RESTORE_BELOW:
+            # Restore in reverse order: the last stage shed comes back first
+            for stage in reversed(sheddable):
+                if stage.fps < stage.target_fps:
+                    stage.fps = min(stage.target_fps, stage.fps * RESTORE_STEP)
+                    return
+
+    def next_delay_ms(self, now: Optional[float] = None) -> int:
+        """Milliseconds until the next stage is due (at least min_idle_ms)."""
+        now = time.monotonic() if now is None else now
+        next_due = min((s.next_due for name, s in self.stages.items()
+                        if self._rate(s) > 0 and (self.active is None or name in self.active)), default=now)
+        max_delay = max(self.max_delay, 1.0 / self.ceiling_fps) if self.ceiling_fps else self.max_delay
+        return int(min(max_delay, max(self.min_idle, next_due - now)) * 1000)
+
+    def reset(self, active=None):
+        """Back to the target rates with no history (e.g. when the camera is activated).
+        Args:
+            active: Names of the stages that will run (the others do not wake the tick up)
+        """
+        self.active = set(active) if active is not None else None
+        for stage in self.stages.values():
+            stage.fps = stage.target_fps
+            stage.next_due = 0.0
+            stage.runs.clear()
+
+    def achieved_fps(self, name: str, now: Optional[float] = None) -> float:
+        stage = self.stages[name]
+        now = time.monotonic() if now is None else now
+        stage.prune(now)
+        if not stage.runs:
+            return 0.0
+        return len(stage.runs) / min(LOAD_WINDOW, max(now - stage.runs[0][0], 1e-3))
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        now = time.monotonic()
+        stats = {}
+        for name, stage in self.stages.items():
+            stats[name] = {
+                'target_fps': stage.target_fps,
+                'allowed_fps': stage.fps,
+                'achieved_fps': self.achieved_fps(name, now),
+                'mean_ms': stage.total_seconds / stage.count * 1000 if stage.count else 0.0,
+                'runs': stage.count,
+                'shed': stage.fps < stage.target_fps,
+            }
+        return stats
@@ -0,0 +1,199 @@
+"""
+Frame sources for SLAT.
+Live cameras, video files and image directories behind the cv2.VideoCapture
+interface (read / isOpened / release / get / set), so the capture paths and the
+benchmarks can run on recorded sessions on machines without a camera.
+Cameras are opened through utils.camera_manager.open_camera().
+"""
+
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov')
+
+
+def camera_backend() -> int:
+    """OpenCV capture backend for live cameras (DirectShow on Windows, automatic elsewhere)."""
+    return cv2.CAP_DSHOW if sys.platform == 'win32' else cv2.CAP_ANY
+
+
+class FrameSource:
+    """Base class: a cv2.VideoCapture-like source of BGR frames."""
+    name = ''
+    profile = None  # CaptureProfile requested at open (cameras only)
+    negotiated = None  # Format the device actually delivers (width, height, fps, fourcc)
+    profile_exact = True  # False when the device refused the requested profile
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read the next frame (into image when given and of the right shape)."""
+        raise NotImplementedError
+
+    def isOpened(self) -> bool:
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def get(self, prop_id: int) -> float:
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class CameraSource(FrameSource):
+    def __init__(self, index: int, backend: Optional[int] = None):
+        self.index = index
+        self.name = f"camera {index}"
+        self.capture = cv2.VideoCapture(index, camera_backend() if backend is None else backend)
+
+    def read(self, image=None):
+        if image is not None:
+            return self.capture.read(image)
+        return self.capture.read()
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def release(self):
+        self.capture.release()
+
+    def get(self, prop_id):
+        return self.capture.get(prop_id)
+
+    def set(self, prop_id, value):
+        return self.capture.set(prop_id, value)
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path: str, loop: bool = False, realtime: bool = False):
+        """
+        Args:
+            path: Video file
+            loop: Restart from the beginning at the end of the file
+            realtime: Pace reads at the file frame rate (like a live camera) instead of as fast as possible
+        """
+        self.path = path
+        self.name = os.path.basename(path)
+        self.loop = loop
+        self.realtime = realtime
+        self.capture = cv2.VideoCapture(path)
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.frame_interval = 1.0 / fps if fps and fps > 0 else 1.0 / 30
+        self._next_frame_time = None
+
+    def read(self, image=None):
+        if self.realtime:
+            now = time.monotonic()
+            if self._next_frame_time is not None and now < self._next_frame_time:
+                time.sleep(self._next_frame_time - now)
+            self._next_frame_time = max(now, self._next_frame_time or now) + self.frame_interval
+
+        ret, frame = self.capture.read(image) if image is not None else self.capture.read()
+        if not ret and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read(image) if image is not None else self.capture.read()
+        return ret, frame
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def release(self):
+        self.capture.release()
+
+    def get(self, prop_id):
+        return self.capture.get(prop_id)
+
+    def set(self, prop_id, value):
+        # Resolution/FPS requests are meaningless for a file; allow seeking only
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return self.capture.set(prop_id, value)
+        return False
+
+
+class ImageDirectorySource(FrameSource):
+    def __init__(self, path: str, loop: bool = False, fps: float = 0.0):
+        """
+        Args:
+            path: Directory of images, read in file name order
+            loop: Restart from the first image after the last one
+            fps: Pace reads at this rate (0 = as fast as possible)
+        """
+        self.path = path
+        self.name = os.path.basename(os.path.normpath(path))
+        self.loop = loop
+        self.files = list_images(path)
+        self.position = 0
+        self.frame_interval = 1.0 / fps if fps > 0 else 0.0
+        self._next_frame_time = None
+        self._opened = True
+
+    def read(self, image=None):
+        if self.frame_interval:
+            now = time.monotonic()
+            if self._next_frame_time is not None and now < self._next_frame_time:
+                time.sleep(self._next_frame_time - now)
+            self._next_frame_time = max(now, self._next_frame_time or now) + self.frame_interval
+
+        while self._opened and self.files:
+            if self.position >= len(self.files):
+                if not self.loop:
+                    return False, None
+                self.position = 0
+            path = self.files[self.position]
+            self.position += 1
+            frame = cv2.imread(path)
+            if frame is None:
+                print(f"Skipping unreadable image {path}")
+                continue
+            if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+                image[...] = frame
+                return True, image
+            return True, frame
+        return False, None
+
+    def isOpened(self):
+        return self._opened and bool(self.files)
+
+    def release(self):
+        self._opened = False
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.files))
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        return 0.0
+
+    def set(self, prop_id, value):
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            self.position = max(0, int(value))
+            return True
+        return False
+
+
+def list_images(path: str) -> List[str]:
+    """Image files of a directory in name order."""
+    return [os.path.join(path, name) for name in sorted(os.listdir(path))
+            if name.lower().endswith(IMAGE_EXTENSIONS)]
+
+
+def open_frame_source(spec: str, loop: bool = False, realtime: bool = False) -> FrameSource:
+    """Open a source from a description: camera index ("0"), video file or image directory."""
+    if spec.isdigit():
+        return CameraSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, loop=loop, fps=30.0 if realtime else 0.0)
+    return VideoFileSource(spec, loop=loop, realtime=realtime)
+
@@ -0,0 +1,96 @@
+"""
+Idle / power state of the kiosk.
+ACTIVE: someone is (or just was) in front of the terminal, full processing rates.
+IDLE: no motion, key press or punch for idle_after_seconds; processing runs at a low
+      rate just fast enough to notice the next person, who wakes it immediately.
+PARKED: outside the working windows; camera released and models unloaded.
+Process CPU time is accounted per state to report CPU-seconds per hour in each.
+"""
+
+import time
+from typing import Dict, Optional
+
+ACTIVE = 'active'
+IDLE = 'idle'
+PARKED = 'parked'
+
+
+class IdleController:
+    def __init__(self, idle_after_seconds: float = 20.0, park_outside_windows: bool = True):
+        """
+        Args:
+            idle_after_seconds: Quiet time (no motion, key press or punch) before going IDLE
+            park_outside_windows: Park the terminal outside the working windows
+        """
+        self.idle_after_seconds = idle_after_seconds
+        self.park_outside_windows = park_outside_windows
+        self.state = ACTIVE
+        self.previous_state = None
+        self.last_activity = time.monotonic()
+
+        # CPU accounting per state
+        self._state_since = time.monotonic()
+        self._cpu_since = time.process_time()
+        self.wall_seconds = {ACTIVE: 0.0, IDLE: 0.0, PARKED: 0.0}
+        self.cpu_seconds = {ACTIVE: 0.0, IDLE: 0.0, PARKED: 0.0}
+        self.wakeups = 0
+
+    def _account(self, now: float):
+        cpu = time.process_time()
+        self.wall_seconds[self.state] += now - self._state_since
+        self.cpu_seconds[self.state] += cpu - self._cpu_since
+        self._state_since, self._cpu_since = now, cpu
+
+    def _enter(self, state: str, now: float) -> Optional[str]:
+        if state == self.state:
+            return None
+        self._account(now)
+        self.previous_state, self.state = self.state, state
+        return state
+
+    def note_activity(self, now: Optional[float] = None) -> Optional[str]:
+        """Motion, key press or punch.
+        Returns: ACTIVE if this woke the terminal from IDLE, else None
+        """
+        now = time.monotonic() if now is None else now
+        self.last_activity = now
+        if self.state == IDLE:
+            self.wakeups += 1
+            return self._enter(ACTIVE, now)
+        return None
+
+    def update(self, in_window: bool, now: Optional[float] = None) -> Optional[str]:
+        """Re-evaluate the state (call periodically and when the windows may have changed).
+        Returns: The new state if it changed, else None
+        """
+        now = time.monotonic() if now is None else now
+        if self.park_outside_windows and not in_window:
+            return self._enter(PARKED, now)
+        if self.state == PARKED:
+            # Window opened: wait idle until someone shows up
+            self.last_activity = now
+            return self._enter(IDLE, now)
+        if self.state == ACTIVE and now - self.last_activity >= self.idle_after_seconds:
+            return self._enter(IDLE, now)
+        return None
+
+    def cpu_seconds_per_hour(self, state: str) -> float:
+        """Process CPU seconds per wall-clock hour spent in a state."""
+        self._account(time.monotonic())
+        wall = self.wall_seconds[state]
+        return self.cpu_seconds[state] / wall * 3600 if wall > 0 else 0.0
+
+    def get_stats(self) -> Dict[str, float]:
+        self._account(time.monotonic())
+        stats = {'state': self.state, 'wakeups': self.wakeups}
+        for state in (ACTIVE, IDLE, PARKED):
+            wall = self.wall_seconds[state]
+            stats[f'{state}_hours'] = wall / 3600
+            stats[f'{state}_cpu_seconds_per_hour'] = self.cpu_seconds[state] / wall * 3600 if wall > 0 else 0.0
+        return stats
+
+    def format_report(self) -> str:
+        stats = self.get_stats()
+        parts = [f"{state} {stats[f'{state}_hours']:.2f} h / {stats[f'{state}_cpu_seconds_per_hour']:.0f} CPU-s/h"
+                 for state in (ACTIVE, IDLE, PARKED) if stats[f'{state}_hours'] > 0]
+        return "Power states: " + ", ".join(parts) + f" ({stats['wakeups']} wake-ups)"
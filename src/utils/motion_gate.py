@@ -0,0 +1,114 @@
+"""
+Motion / presence gate for SLAT.
+Cheap pre-stage placed in front of the face detector: frames are compared on a
+small grayscale thumbnail and detection is skipped while nothing changes.
+"""
+
+import time
+import cv2
+import numpy as np
+from typing import Optional
+
+
+class MotionGate:
+    def __init__(self, diff_threshold: int = 12, min_changed_ratio: float = 0.01,
+                 hold_seconds: float = 3.0, thumb_width: int = 160):
+        """
+        Args:
+            diff_threshold: Per-pixel absolute grey level difference counted as change (0-255)
+            min_changed_ratio: Fraction of changed thumbnail pixels that counts as motion
+            hold_seconds: Keep the detector running this long after the last motion,
+                so a person standing still in front of the camera is still processed
+            thumb_width: Width of the downsampled grayscale thumbnail
+        """
+        self.diff_threshold = diff_threshold
+        self.min_changed_ratio = min_changed_ratio
+        self.hold_seconds = hold_seconds
+        self.thumb_width = thumb_width
+
+        # Reused buffers (allocated on first frame / resolution change)
+        self._gray = None
+        self._thumb = None
+        self._previous = None
+        self._diff = None
+        self._has_previous = False
+
+        self.last_motion_time = None
+        self.last_changed_ratio = 0.0
+
+        # Counters
+        self.frames_seen = 0
+        self.frames_gated = 0
+        self.frames_passed = 0
+
+    def reset(self):
+        """Forget the reference frame (e.g. after the camera was reopened)."""
+        self._previous = None
+        self.last_motion_time = None
+        self.last_changed_ratio = 0.0
+
+    def _allocate(self, frame: np.ndarray):
+        h, w = frame.shape[:2]
+        thumb_h = max(1, int(round(h * self.thumb_width / float(w))))
+        self._gray = np.empty((h, w), dtype=np.uint8)
+        self._thumb = np.empty((thumb_h, self.thumb_width), dtype=np.uint8)
+        self._previous = np.empty_like(self._thumb)
+        self._diff = np.empty_like(self._thumb)
+        self._has_previous = False
+
+    def detect_motion(self, frame: np.ndarray) -> bool:
+        """Return True if the frame differs enough from the previous one."""
+        if self._gray is None or self._gray.shape != frame.shape[:2] or self._previous is None:
+            self._allocate(frame)
+
+        if frame.ndim == 3:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+            gray = self._gray
+        else:
+            gray = frame
+        cv2.resize(gray, (self._thumb.shape[1], self._thumb.shape[0]), dst=self._thumb,
+                   interpolation=cv2.INTER_AREA)
+        # Light blur removes sensor noise that would otherwise count as motion
+        cv2.GaussianBlur(self._thumb, (5, 5), 0, dst=self._thumb)
+
+        if not self._has_previous:
+            np.copyto(self._previous, self._thumb)
+            self._has_previous = True
+            return True
+
+        cv2.absdiff(self._thumb, self._previous, dst=self._diff)
+        changed = cv2.countNonZero(cv2.threshold(self._diff, self.diff_threshold, 255,
+                                                 cv2.THRESH_BINARY, dst=self._diff)[1])
+        self.last_changed_ratio = changed / float(self._diff.size)
+
+        # Thumbnail becomes the new reference
+        self._previous, self._thumb = self._thumb, self._previous
+
+        return self.last_changed_ratio >= self.min_changed_ratio
+
+    def should_process(self, frame: np.ndarray, now: Optional[float] = None) -> bool:
+        """Decide whether the (expensive) detector should run on this frame."""
+        if now is None:
+            now = time.monotonic()
+        self.frames_seen += 1
+
+        if self.detect_motion(frame):
+            self.last_motion_time = now
+
+        if self.last_motion_time is not None and now - self.last_motion_time <= self.hold_seconds:
+            self.frames_passed += 1
+            return True
+
+        self.frames_gated += 1
+        return False
+
+    def get_stats(self) -> dict:
+        """Return gate counters."""
+        gated_ratio = self.frames_gated / float(self.frames_seen) if self.frames_seen else 0.0
+        return {
+            'frames_seen': self.frames_seen,
+            'frames_gated': self.frames_gated,
+            'frames_passed': self.frames_passed,
+            'gated_ratio': gated_ratio,
+            'last_changed_ratio': self.last_changed_ratio,
+        }
@@ -0,0 +1,170 @@
+"""
+Compact checkpoint photo store.
+Instead of one JPEG file per punch, photos are appended to one container file per
+month (data/photos/YYYY-MM.pack) and located through the photo_index table
+(record_id -> container, offset, length): a lookup is one primary-key read and one
+seek. Photos can be reduced to the face or badge region that triggered the punch,
+and the retention purge drops whole months (and the old one-file-per-punch photos)
+past the retention period.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+CONTAINER_SUFFIX = '.pack'
+
+
+def crop_region(frame: np.ndarray, region: Sequence[int], margin: float = 0.6) -> np.ndarray:
+    """Crop around an (x1, y1, x2, y2) region expanded by margin of its size on each side."""
+    x1, y1, x2, y2 = [int(v) for v in region]
+    pad_x, pad_y = int((x2 - x1) * margin), int((y2 - y1) * margin)
+    height, width = frame.shape[:2]
+    x1, y1 = max(0, x1 - pad_x), max(0, y1 - pad_y)
+    x2, y2 = min(width, x2 + pad_x), min(height, y2 + pad_y)
+    if x2 <= x1 or y2 <= y1:
+        return frame
+    return frame[y1:y2, x1:x2]
+
+
+def polygon_region(polygon) -> Tuple[int, int, int, int]:
+    """Bounding (x1, y1, x2, y2) of a polygon (e.g. a QR code outline)."""
+    xs = [x for x, _ in polygon]
+    ys = [y for _, y in polygon]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class PhotoStore:
+    def __init__(self, root: str, db):
+        """
+        Args:
+            root: Directory of the monthly containers
+            db: Database holding the photo_index table
+        """
+        self.root = root
+        self.db = db
+        self._file = None  # Open container being appended to
+        self._container = None
+
+        # Metrics
+        self.appended = 0
+        self.bytes_appended = 0
+        self.purged_photos = 0
+        self.purged_bytes = 0
+
+    def container_name(self, when: Optional[datetime] = None) -> str:
+        return (when or datetime.now()).strftime('%Y-%m') + CONTAINER_SUFFIX
+
+    def container_path(self, container: str) -> str:
+        return os.path.join(self.root, container)
+
+    def append(self, record_id: str, data: bytes, container: Optional[str] = None) -> Tuple[str, int, int]:
+        """Append an encoded photo to a container and index it (one writer thread only).
+        Args:
+            container: Container reserved when the punch was recorded (default: the current month's)
+        Returns: (container, offset, length)
+        """
+        container = container or self.container_name()
+        if container != self._container:
+            self.close()
+            os.makedirs(self.root, exist_ok=True)
+            self._file = open(self.container_path(container), 'ab')
+            self._container = container
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(data)
+        self._file.flush()
+        # Index only once the bytes are in the file: a crash leaves unindexed bytes, never a dangling index
+        self.db.add_photo_index(record_id, container, offset, len(data))
+        self.appended += 1
+        self.bytes_appended += len(data)
+        return container, offset, len(data)
+
+    def read(self, record_id: str) -> Optional[bytes]:
+        """Encoded photo of a record (None if it has no packed photo)."""
+        entry = self.db.get_photo_index(record_id)
+        if entry is None:
+            return None
+        container, offset, length = entry
+        try:
+            with open(self.container_path(container), 'rb') as f:
+                f.seek(offset)
+                data = f.read(length)
+        except OSError as e:
+            print(f"Error reading photo of record {record_id}: {e}")
+            return None
+        return data if len(data) == length else None
+
+    def read_image(self, record_id: str) -> Optional[np.ndarray]:
+        data = self.read(record_id)
+        if data is None:
+            return None
+        return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._container = None
+
+    def purge(self, retention_days: int, now: Optional[datetime] = None) -> int:
+        """Delete the photos older than retention_days (0 = keep everything).
+        Containers go as a whole once their month is entirely past the retention period;
+        photos stored as individual files (before packing) go one by one. Records pointing to a
+        container without an index entry (photo lost before it was written) only lose the reference.
+        Returns: Number of photos removed
+        """
+        if retention_days <= 0:
+            return 0
+        cutoff = (now or datetime.now()) - timedelta(days=retention_days)
+        removed = 0
+
+        for container in self.db.get_photo_containers():
+            month = datetime.strptime(container[:-len(CONTAINER_SUFFIX)], '%Y-%m')
+            next_month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+            if next_month > cutoff:
+                continue
+            if container == self._container:
+                self.close()
+            path = self.container_path(container)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            # Rows first: a failed delete leaves an unreferenced file, not references to a missing one
+            count = self.db.delete_photo_container(container)
+            if os.path.exists(path):
+                os.remove(path)
+            removed += count
+            self.purged_bytes += size
+            print(f"Photo retention: removed {container} ({count} photos, {size / 1e6:.1f} MB)")
+
+        for record_id, photo_path in self.db.get_expired_photo_files(cutoff):
+            if photo_path.endswith(CONTAINER_SUFFIX):
+                # Packed photo never indexed (process stopped before it was written): the
+                # container holds other records' photos, only the reference goes
+                self.db.clear_photo_path(record_id)
+                continue
+            try:
+                if os.path.exists(photo_path):
+                    self.purged_bytes += os.path.getsize(photo_path)
+                    os.remove(photo_path)
+                    try:
+                        os.rmdir(os.path.dirname(photo_path))  # Employee directory, once empty
+                    except OSError:
+                        pass
+            except OSError as e:
+                print(f"Error removing photo {photo_path}: {e}")
+                continue
+            self.db.clear_photo_path(record_id)
+            removed += 1
+
+        self.purged_photos += removed
+        return removed
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'appended': self.appended,
+            'mean_kb': self.bytes_appended / self.appended / 1024 if self.appended else 0.0,
+            'purged_photos': self.purged_photos,
+            'purged_mb': self.purged_bytes / 1e6,
+        }
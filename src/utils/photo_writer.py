@@ -0,0 +1,158 @@
+"""
+Background checkpoint photo writer.
+A punch is recorded right away with the path its photo will have; cropping, the JPEG
+encode and the write (to a file, or appended to a PhotoStore container) happen on a
+worker thread fed by a bounded queue, so the GUI thread never waits for them.
+When the queue is full (burst of punches on a slow disk) or a write fails, on_failure
+is called with the record so its log row can be reconciled (photo_path cleared)
+instead of pointing to a file that does not exist. The same thread runs maintenance
+tasks such as the photo retention purge, so they never race with the writes.
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import cv2
+import numpy as np
+
+from utils.photo_store import crop_region
+
+_STOP = object()
+
+
+class PhotoWriter:
+    def __init__(self, on_failure: Optional[Callable[[str], None]] = None, quality: int = 95,
+                 max_width: int = 0, max_queue: int = 8, store=None, crop: bool = False):
+        """
+        Args:
+            on_failure: Called with the record_id of a photo that could not be written
+                (from the worker thread, or the caller's when the queue is full)
+            quality: JPEG quality (0-100)
+            max_width: Photos wider than this are downscaled before encoding (0 = full size)
+            max_queue: Photos waiting to be written before new ones are dropped
+            store: PhotoStore the photos are packed into (None: one file per photo)
+            crop: Keep only the region (face / badge) given with each photo
+        """
+        self.on_failure = on_failure
+        self.quality = quality
+        self.max_width = max_width
+        self.store = store
+        self.crop = crop
+        self._queue = queue.Queue(maxsize=max(1, max_queue))
+        self._thread = None
+
+        # Metrics
+        self.queued = 0
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0  # Queue full
+        self.max_depth = 0
+        self.encode_seconds = 0.0
+        self.bytes_written = 0
+
+    def start(self) -> 'PhotoWriter':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="photo-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Write the queued photos (up to timeout) and stop the worker."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+        if self.store is not None:
+            self.store.close()
+
+    def submit(self, record_id: str, path: str, frame: np.ndarray, region=None) -> bool:
+        """Queue a photo. The frame must not be modified afterwards.
+        Args:
+            path: Reserved path (the container file when packing)
+            region: (x1, y1, x2, y2) of the face or badge, kept when cropping
+        Returns: False if the queue was full (the photo is dropped and reported as failed)
+        """
+        try:
+            self._queue.put_nowait((record_id, path, frame, region))
+        except queue.Full:
+            self.dropped += 1
+            print(f"Photo queue full, photo dropped: {path}")
+            self._report_failure(record_id)
+            return False
+        self.queued += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def submit_task(self, task: Callable[[], None]) -> bool:
+        """Run a maintenance task on the writer thread, between two photos."""
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            return False
+        return True
+
+    def _report_failure(self, record_id: str):
+        if self.on_failure is not None:
+            try:
+                self.on_failure(record_id)
+            except Exception as e:
+                print(f"Error reconciling photo of record {record_id}: {e}")
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            if callable(job):
+                try:
+                    job()
+                except Exception as e:
+                    print(f"Photo writer task failed: {e}")
+                continue
+            record_id, path, frame, region = job
+            try:
+                self.write(path, frame, region, record_id)
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Error saving checkpoint photo {path}: {e}")
+                self._report_failure(record_id)
+
+    def write(self, path: str, frame: np.ndarray, region=None, record_id: Optional[str] = None):
+        """Crop, encode and write one photo (raises on failure)."""
+        start = time.perf_counter()
+        if self.crop and region is not None:
+            frame = crop_region(frame, region)
+        if self.max_width and frame.shape[1] > self.max_width:
+            height = int(round(frame.shape[0] * self.max_width / frame.shape[1]))
+            frame = cv2.resize(frame, (self.max_width, height), interpolation=cv2.INTER_AREA)
+        ok, data = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, int(self.quality)])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        self.encode_seconds += time.perf_counter() - start
+        if self.store is not None:
+            self.store.append(record_id, data.tobytes(), os.path.basename(path))
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data.tobytes())
+        self.bytes_written += len(data)
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'queued': self.queued,
+            'written': self.written,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'pending': self._queue.qsize(),
+            'max_depth': self.max_depth,
+            'mean_encode_ms': self.encode_seconds / self.written * 1000 if self.written else 0.0,
+            'mean_kb': self.bytes_written / self.written / 1024 if self.written else 0.0,
+        }
@@ -0,0 +1,126 @@
+"""
+Per-stage profiling for SLAT.
+Code marks pipeline stages with `with profiler.stage('detect'):`. While the profiler
+is disabled, stage() returns a shared no-op context manager, so the hooks can stay
+in the per-frame path. When enabled, each stage keeps a rolling window of its most
+recent durations that can be queried (snapshot) or written to a JSON file (dump).
+Stages can be recorded from worker threads (QR decode) while the GUI thread reads them.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+_NULL_STAGE = nullcontext()
+
+
+class StageHistogram:
+    """Rolling window of the last `window` durations (seconds) of one stage."""
+
+    def __init__(self, window: int = 1000):
+        self.samples = np.zeros(window, dtype=np.float64)
+        self.position = 0
+        self.count = 0  # Total samples since reset (can exceed the window)
+        self.total = 0.0
+
+    def add(self, seconds: float):
+        self.samples[self.position] = seconds
+        self.position = (self.position + 1) % len(self.samples)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self) -> Dict[str, float]:
+        """Percentiles (ms) over the window, mean over all samples."""
+        recent = self.samples[:min(self.count, len(self.samples))]
+        if len(recent) == 0:
+            return {'count': 0}
+        p50, p90, p99 = np.percentile(recent, [50, 90, 99]) * 1000
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000,
+            'p50_ms': float(p50),
+            'p90_ms': float(p90),
+            'p99_ms': float(p99),
+            'max_ms': float(recent.max() * 1000),
+        }
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled: bool = False, window: int = 1000):
+        """
+        Args:
+            enabled: Record stages (False: hooks cost one attribute check and a no-op context)
+            window: Samples kept per stage for the percentiles
+        """
+        self.enabled = enabled
+        self.window = window
+        self.stages = {}  # name -> StageHistogram
+        self._lock = threading.Lock()  # Guards stages and their histograms
+
+    def stage(self, name: str):
+        """Context manager timing one execution of a stage."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.stages.get(name)
+            if histogram is None:
+                histogram = self.stages[name] = StageHistogram(self.window)
+            histogram.add(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Summary of every stage recorded so far."""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in self.stages.items()}
+
+    def format_table(self) -> str:
+        lines = [f"{'stage':<14}{'count':>8}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)"]
+        for name, s in sorted(self.snapshot().items()):
+            if s['count']:
+                lines.append(f"{name:<14}{s['count']:>8}{s['mean_ms']:>9.2f}{s['p50_ms']:>9.2f}"
+                             f"{s['p90_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}")
+        return "\n".join(lines)
+
+    def dump(self, directory: str = "data/profiles", path: Optional[str] = None) -> str:
+        """Write the snapshot to a JSON file.
+        Returns: Path of the written file
+        """
+        if path is None:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w') as f:
+            json.dump({'created_at': datetime.now().isoformat(), 'window': self.window,
+                       'stages': self.snapshot()}, f, indent=2)
+        return path
+
+
+# Shared by the face pipeline modules; enabled from the 'profiling_enabled' setting
+profiler = Profiler()
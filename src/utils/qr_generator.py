@@ -1,11 +1,32 @@
 """
 QR code generation utilities for SLAT.
+Badges for many employees are rendered by generate_badges on a process pool (PIL and
+qrcode are pure Python around small C parts, so threads would serialize on the GIL);
+finished badges are yielded as soon as their chunk completes so the caller can stream
+them to disk. generate_badge_sheets lays them out on print-ready A4 PDF pages with the
+QR modules drawn as vector rectangles.
 """
 
 import qrcode
 from PIL import Image, ImageDraw, ImageFont
 import io
-from typing import Optional
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+BADGE_CHUNK = 16  # Badges per pool task (amortizes the inter-process round trip)
+
+
+@lru_cache(maxsize=None)
+def _font(size: int):
+    """Badge font, loaded once per process and size."""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
 
 def generate_qr(data: str) -> bytes:
     """Generate QR code image as bytes."""
@@ -28,15 +49,10 @@ def generate_qr_with_text(employee_id: str, name: str) -> bytes:
     qr.make(fit=True)
     img = qr.make_image(fill='black', back_color='white')
 
-    # Convert to RGB for drawing
-    img = img.convert('RGB')
+    # Grayscale for drawing (black and white only: a third of the RGB bytes to encode)
+    img = img.convert('L')
     draw = ImageDraw.Draw(img)
-
-    # Try to use a default font, fallback to default if not available
-    try:
-        font = ImageFont.truetype("arial.ttf", 30)
-    except:
-        font = ImageFont.load_default()
+    font = _font(30)
 
     # Add employee ID at the top
     text_id = f"ID: {employee_id}"
@@ -57,6 +73,184 @@ def generate_qr_with_text(employee_id: str, name: str) -> bytes:
     img.save(buffer, format='PNG')
     return buffer.getvalue()
 
+def _render_chunk(chunk: Sequence[Tuple[str, str]]) -> List[Tuple[str, str, Optional[bytes], Optional[str]]]:
+    """Render (employee_id, name) badges in a pool worker.
+    Returns: (employee_id, name, png_bytes, error) per badge
+    """
+    results = []
+    for employee_id, name in chunk:
+        try:
+            results.append((employee_id, name, generate_qr_with_text(employee_id, name), None))
+        except Exception as e:
+            results.append((employee_id, name, None, str(e)))
+    return results
+
+
+def _pool_chunks(func: Callable, items: Iterable, workers: int = 0, chunk_size: int = BADGE_CHUNK) -> Iterator:
+    """Apply func (taking and returning a list) to chunks of items on a process pool.
+    Items are consumed lazily and at most two chunks per worker are in flight, so memory
+    stays flat however many items there are. Results are yielded in input order.
+    Args:
+        workers: Worker processes; values <= 0 are relative to the core count (0 = all cores)
+    """
+    cores = os.cpu_count() or 1
+    workers = max(1, min(cores + workers if workers <= 0 else workers, cores))
+    chunks = iter(lambda it=iter(items): list(islice(it, chunk_size)), [])
+    first = next(chunks, None)
+    second = next(chunks, None)
+    if workers == 1 or second is None:
+        # Not worth starting processes
+        for chunk in (first, second):
+            if chunk is not None:
+                yield from func(chunk)
+        for chunk in chunks:
+            yield from func(chunk)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        pending.append(executor.submit(func, first))
+        pending.append(executor.submit(func, second))
+        for chunk in chunks:
+            while len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(func, chunk))
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # Also reached when the caller stops early (cancelled progress dialog)
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def generate_badges(badges: Iterable[Tuple[str, str]], workers: int = 0, chunk_size: int = BADGE_CHUNK) \
+        -> Iterator[Tuple[str, str, Optional[bytes], Optional[str]]]:
+    """Render badges on a process pool, yielding each one as soon as its chunk is done.
+    Args:
+        badges: (employee_id, name) pairs
+        workers: Worker processes; values <= 0 are relative to the core count (0 = all cores)
+        chunk_size: Badges per pool task
+    Yields: (employee_id, name, png_bytes or None, error or None), in input order
+    """
+    return _pool_chunks(_render_chunk, badges, workers, chunk_size)
+
+
+def qr_rects(data: str) -> Tuple[int, List[Tuple[int, int, int, int]]]:
+    """Dark modules of a QR code as few rectangles: horizontal runs of dark modules, merged
+    with the identical runs of the rows below.
+    Returns: (modules per side without quiet zone, [(col, row, width, height)] in modules)
+    """
+    qr = qrcode.QRCode(border=0, error_correction=qrcode.constants.ERROR_CORRECT_M)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    open_runs = {}  # (col, width) -> [col, first row, width, height] still growing downwards
+    rects = []
+    for row, line in enumerate(matrix):
+        runs = []
+        col = 0
+        while col < len(line):
+            if line[col]:
+                start = col
+                while col < len(line) and line[col]:
+                    col += 1
+                runs.append((start, col - start))
+            col += 1
+        current = {}
+        for run in runs:
+            rect = open_runs.pop(run, None)
+            if rect is None:
+                rect = [run[0], row, run[1], 0]
+            rect[3] += 1
+            current[run] = rect
+        rects.extend(tuple(rect) for rect in open_runs.values())  # Runs that stopped
+        open_runs = current
+    rects.extend(tuple(rect) for rect in open_runs.values())
+    return len(matrix), rects
+
+
+def _rects_chunk(chunk: Sequence[Tuple[str, str]]) -> List[Tuple[str, str, int, List[Tuple[int, int, int, int]]]]:
+    """QR rectangles of (employee_id, name) badges in a pool worker."""
+    return [(employee_id, name) + qr_rects(employee_id) for employee_id, name in chunk]
+
+
+def generate_badge_sheets(badges: Iterable[Tuple[str, str]], path: str, badge_size_cm: float = 6.0,
+                          workers: int = 0, progress: Optional[Callable[[int], bool]] = None) -> int:
+    """Write a print-ready A4 PDF with as many badges per page as fit.
+    QR modules are vector rectangles (run-merged) instead of bitmaps, and pages are
+    compressed and closed as soon as they are full, so the PDF stays small and the
+    memory use does not grow with one image per employee.
+    Args:
+        badges: (employee_id, name) pairs (any iterable, consumed once)
+        path: PDF file to write
+        badge_size_cm: Badge side, cut marks included
+        workers: Processes computing the QR modules (<= 0: relative to the core count)
+        progress: Called with the number of badges drawn after each page; returning False stops
+    Returns: Number of badges written
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.pdfgen import canvas
+
+    size = badge_size_cm * cm
+    gutter = 0.5 * cm
+    margin = 1.0 * cm
+    page_width, page_height = A4
+    cols = max(1, int((page_width - 2 * margin + gutter) // (size + gutter)))
+    rows = max(1, int((page_height - 2 * margin + gutter) // (size + gutter)))
+    # Center the grid on the page
+    left = (page_width - cols * size - (cols - 1) * gutter) / 2
+    top = page_height - (page_height - rows * size - (rows - 1) * gutter) / 2
+    text_band = size * 0.12  # ID above the code, name below
+    font_size = max(6.0, size / cm * 1.6)
+
+    pdf = canvas.Canvas(path, pagesize=A4, pageCompression=1)
+    pdf.setTitle("Badges SLAT")
+    count = 0
+    slot = 0
+    for employee_id, name, modules, rects in _pool_chunks(_rects_chunk, badges, workers):
+        if slot == cols * rows:
+            pdf.showPage()
+            slot = 0
+            if progress is not None and progress(count) is False:
+                break
+        col, row = slot % cols, slot // cols
+        x = left + col * (size + gutter)
+        y = top - (row + 1) * size - row * gutter
+
+        # Cut outline
+        pdf.setStrokeGray(0.75)
+        pdf.setLineWidth(0.3)
+        pdf.rect(x, y, size, size, stroke=1, fill=0)
+
+        # Code: one filled path of module rectangles in module units (short integer
+        # coordinates), 4-module quiet zone around it
+        code_size = size - 2 * text_band
+        module = code_size / (modules + 8)
+        pdf.saveState()
+        pdf.translate(x + (size - modules * module) / 2, y + size - text_band - 4 * module)
+        pdf.scale(module, -module)
+        path_object = pdf.beginPath()
+        for rect in rects:
+            path_object.rect(*rect)
+        pdf.setFillGray(0)
+        pdf.drawPath(path_object, stroke=0, fill=1)
+        pdf.restoreState()
+
+        pdf.setFont("Helvetica", font_size)
+        pdf.drawCentredString(x + size / 2, y + size - text_band * 0.7, f"ID: {employee_id}")
+        pdf.drawCentredString(x + size / 2, y + text_band * 0.4, f"Name: {name}")
+        count += 1
+        slot += 1
+    else:
+        if progress is not None:
+            progress(count)
+    pdf.save()
+    return count
+
+
 def decode_qr(image_bytes: bytes) -> Optional[str]:
     """Decode QR code from image bytes."""
     # This would require additional libraries like pyzbar
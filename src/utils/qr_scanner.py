@@ -1,28 +1,174 @@
 """
 QR code scanning utilities for SLAT.
+A QRScanner is long-lived: it converts each frame to grayscale once into a reused
+buffer, restricts zbar to QR symbols, and decodes a downscaled copy first, retrying
+at full resolution when the small image gives nothing (every few frames at most, so
+empty frames stay cheap).
+Once a code has been read, the next frames are decoded on an expanded crop around its
+last polygon (the badge rarely moves much between frames); the whole frame is searched
+again when the crop misses and every track_frames frames.
 """
 
 import cv2
-from pyzbar.pyzbar import decode
-from typing import Optional
+import numpy as np
+from pyzbar.pyzbar import decode, ZBarSymbol
+from typing import Dict, List, Optional, Tuple
 import time
+from utils.camera_service import camera_service
+from utils.capture_profile import MODE_QR
+from utils.profiling import profiler
+
+QR_SYMBOLS = [ZBarSymbol.QRCODE]
+
 
 class QRScanner:
-    def __init__(self):
+    def __init__(self, decode_width: int = 640, full_retry_interval: int = 3,
+                 track_frames: int = 10, track_margin: float = 0.5):
+        """
+        Args:
+            decode_width: Frames wider than this are decoded on a downscaled copy first (0 = never)
+            full_retry_interval: Retry at full resolution at most every N frames without a code
+                (1 = every frame, 0 = never)
+            track_frames: Frames decoded on the crop around the last code before a full-frame
+                search (0 = no tracking)
+            track_margin: Crop margin on each side, as a share of the code size
+        """
         self.camera_index = 0
+        self.decode_width = decode_width
+        self.full_retry_interval = full_retry_interval
+        self.track_frames = track_frames
+        self.track_margin = track_margin
+        self._gray = None  # Reused full-resolution grayscale buffer
+        self._small = None  # Reused downscaled buffer
+        self._misses = 0  # Frames since the last full-resolution attempt
+        self._track = None  # Last code polygon (frame coordinates)
+        self._tracked_frames = 0  # Crop decodes since the last full-frame search
+
+        # Metrics
+        self.frames = 0
+        self.found = 0
+        self.found_small = 0
+        self.full_retries = 0
+        self.decode_seconds = 0.0
+        self.roi_attempts = 0
+        self.roi_hits = 0
+        self.decoded_pixels = 0  # Pixels searched (crop or frame, before downscaling)
+        self.frame_pixels = 0
+
+    def to_gray(self, frame: np.ndarray) -> np.ndarray:
+        """Grayscale view of a frame, converted into the reused buffer."""
+        if frame.ndim == 2:
+            return frame
+        if self._gray is None or self._gray.shape != frame.shape[:2]:
+            self._gray = np.empty(frame.shape[:2], dtype=np.uint8)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+    def _decode(self, gray: np.ndarray, scale: float = 1.0, offset=(0, 0)) -> Optional[Tuple[str, List]]:
+        for obj in decode(gray, symbols=QR_SYMBOLS):
+            try:
+                data = obj.data.decode('utf-8')
+            except UnicodeDecodeError:
+                continue
+            polygon = [(int(x * scale) + offset[0], int(y * scale) + offset[1]) for x, y in obj.polygon]
+            return data, polygon
+        return None
+
+    def track_roi(self, shape) -> Optional[Tuple[int, int, int, int]]:
+        """Expanded (x, y, width, height) crop around the last code, clipped to the frame."""
+        if self._track is None:
+            return None
+        xs = [x for x, _ in self._track]
+        ys = [y for _, y in self._track]
+        margin = int(max(max(xs) - min(xs), max(ys) - min(ys)) * self.track_margin)
+        x1, y1 = max(0, min(xs) - margin), max(0, min(ys) - margin)
+        x2, y2 = min(shape[1], max(xs) + margin), min(shape[0], max(ys) + margin)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return x1, y1, x2 - x1, y2 - y1
+
+    def _search(self, gray: np.ndarray, offset=(0, 0)) -> Optional[Tuple[str, List]]:
+        """Downscaled pass first, full-resolution retry every few misses."""
+        self.decoded_pixels += gray.size
+        height, width = gray.shape[:2]
+        if not self.decode_width or width <= self.decode_width:
+            return self._decode(gray, 1.0, offset)
+        # Small image first: a quarter of the pixels for a 1280 px frame
+        small_size = (self.decode_width, max(1, int(round(height * self.decode_width / width))))
+        if self._small is None or self._small.shape != (small_size[1], small_size[0]):
+            self._small = np.empty((small_size[1], small_size[0]), dtype=np.uint8)
+        cv2.resize(gray, small_size, dst=self._small, interpolation=cv2.INTER_AREA)
+        result = self._decode(self._small, width / float(self.decode_width), offset)
+        if result is not None:
+            self.found_small += 1
+            return result
+        self._misses += 1
+        if self.full_retry_interval and self._misses >= self.full_retry_interval:
+            # Codes too small for the downscaled image
+            self._misses = 0
+            self.full_retries += 1
+            return self._decode(gray, 1.0, offset)
+        return None
+
+    def decode_frame(self, frame: np.ndarray, roi: Optional[Tuple[int, int, int, int]] = None) \
+            -> Optional[Tuple[str, List[Tuple[int, int]]]]:
+        """Decode the first QR code of a frame.
+        Args:
+            frame: BGR or grayscale frame
+            roi: Optional (x, y, width, height) region to decode instead of the whole frame
+                (disables tracking for this call)
+        Returns: (data, polygon in frame coordinates) or None
+        """
+        start = time.perf_counter()
+        self.frames += 1
+        with profiler.stage('qr_decode'):
+            gray = self.to_gray(frame)
+            self.frame_pixels += gray.size
+            result = None
+            if roi is not None:
+                x, y, w, h = roi
+                result = self._search(gray[y:y + h, x:x + w], (x, y))
+            else:
+                track = self.track_roi(gray.shape) if self.track_frames else None
+                if track is not None and self._tracked_frames < self.track_frames:
+                    # Crop around the last code first
+                    x, y, w, h = track
+                    self._tracked_frames += 1
+                    self.roi_attempts += 1
+                    result = self._search(gray[y:y + h, x:x + w], (x, y))
+                    if result is not None:
+                        self.roi_hits += 1
+                if result is None:
+                    # Crop missed, nothing tracked yet, or periodic full-frame search
+                    self._tracked_frames = 0
+                    result = self._search(gray)
+                self._track = result[1] if result is not None and len(result[1]) >= 3 else None
+
+        if result is not None:
+            self.found += 1
+        self.decode_seconds += time.perf_counter() - start
+        return result
 
     def scan_frame(self, frame) -> Optional[str]:
         """
         Scan a single frame for QR codes.
         Returns decoded QR data or None if no QR found.
         """
-        decoded_objects = decode(frame)
-        
-        for obj in decoded_objects:
-            if obj.type == 'QRCODE':
-                return obj.data.decode('utf-8')
-        
-        return None
+        result = self.decode_frame(frame)
+        return result[0] if result is not None else None
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'frames': self.frames,
+            'found': self.found,
+            'found_small': self.found_small,
+            'full_retries': self.full_retries,
+            'mean_decode_ms': self.decode_seconds / self.frames * 1000 if self.frames else 0.0,
+            'roi_attempts': self.roi_attempts,
+            'roi_hits': self.roi_hits,
+            'roi_hit_rate': self.roi_hits / self.roi_attempts if self.roi_attempts else 0.0,
+            'mean_decode_area': self.decoded_pixels / self.frames if self.frames else 0.0,
+            'decode_area_ratio': self.decoded_pixels / self.frame_pixels if self.frame_pixels else 0.0,
+        }
 
     def scan_qr_code(self) -> Optional[str]:
         """
@@ -30,29 +176,8 @@ class QRScanner:
         Returns None if no QR code found or camera error.
         """
         # Initialize camera with robust fallback
-        cap = None
-        for camera_index in [0, 1, 2]:
-            try:
-                cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-                
-                if cap.isOpened():
-                    # Test if we can actually read frames
-                    ret, test_frame = cap.read()
-                    if ret and test_frame is not None:
-                        print(f"Camera initialized successfully on index {camera_index} for QR scanning")
-                        break
-                    else:
-                        cap.release()
-                        cap = None
-                        continue
-                else:
-                    continue
-                    
-            except Exception as e:
-                print(f"Failed to initialize camera {camera_index} for QR scanning: {e}")
-                continue
-        
-        if cap is None or not cap.isOpened():
+        cap = camera_service.subscribe("QR scanning", MODE_QR)
+        if cap is None:
             return None
 
         start_time = time.time()
@@ -71,15 +196,11 @@ class QRScanner:
                 consecutive_failures = 0
 
                 # Decode QR codes in the frame
-                decoded_objects = decode(frame)
-
-                for obj in decoded_objects:
-                    # Check if it's a QR code
-                    if obj.type == 'QRCODE':
-                        qr_data = obj.data.decode('utf-8')
-                        cap.release()
-                        cv2.destroyAllWindows()
-                        return qr_data
+                qr_data = self.scan_frame(frame)
+                if qr_data:
+                    cap.release()
+                    cv2.destroyAllWindows()
+                    return qr_data
 
                 # Show the frame with instructions
                 cv2.putText(frame, "Position QR code in frame", (10, 30),
@@ -102,24 +223,8 @@ class QRScanner:
     def test_camera(self) -> bool:
         """Test if camera is available with robust initialization."""
         # Try different camera indices
-        for camera_index in [0, 1, 2]:
-            try:
-                cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-                
-                if cap.isOpened():
-                    # Test if we can actually read frames
-                    ret, test_frame = cap.read()
-                    if ret and test_frame is not None:
-                        cap.release()
-                        return True
-                    else:
-                        cap.release()
-                        continue
-                else:
-                    continue
-                    
-            except Exception as e:
-                print(f"Failed to test camera {camera_index}: {e}")
-                continue
-        
-        return False
\ No newline at end of file
+        cap = camera_service.subscribe("camera test")
+        if cap is None:
+            return False
+        cap.release()
+        return True
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Background QR decoding for the kiosk.
+The GUI hands each new frame to the worker pool and never waits for zbar. A single
+pending slot holds the freshest frame: a frame still pending when a newer one arrives
+is dropped, so the workers always decode the newest frame and never build a backlog.
+Results come back with the capture timestamp of the frame they were read in.
+pyzbar calls zbar through ctypes, which releases the GIL, so several workers can
+decode in parallel on multi-core terminals.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class QRResult:
+    __slots__ = ('data', 'polygon', 'timestamp', 'frame', 'decode_ms')
+
+    def __init__(self, data: str, polygon: List[Tuple[int, int]], timestamp: float, frame: np.ndarray,
+                 decode_ms: float):
+        self.data = data
+        self.polygon = polygon  # Code corners in frame coordinates
+        self.timestamp = timestamp  # Capture time.monotonic() of the frame
+        self.frame = frame  # Frame the code was read in (not modified afterwards)
+        self.decode_ms = decode_ms
+
+
+class QRDecodeWorker:
+    def __init__(self, scanner_factory: Callable, workers: int = 1):
+        """
+        Args:
+            scanner_factory: Creates a QRScanner (one per worker thread, scanners keep buffers)
+            workers: Decoding threads
+        """
+        self.scanners = [scanner_factory() for _ in range(max(1, workers))]
+        self._pending = None  # (frame, timestamp) waiting for a worker
+        self._results = deque()
+        self._lock = threading.Lock()
+        self._work = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._threads = []
+
+        # Metrics
+        self.submitted = 0
+        self.decoded = 0
+        self.dropped = 0  # Frames replaced by a newer one before a worker took them
+        self.found = 0
+        self._latencies = deque(maxlen=200)  # Capture to result (seconds)
+
+    def start(self) -> 'QRDecodeWorker':
+        for i, scanner in enumerate(self.scanners):
+            thread = threading.Thread(target=self._run, args=(scanner,), name=f"qr-decode-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        with self._lock:
+            self._work.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, frame: np.ndarray, timestamp: Optional[float] = None):
+        """Queue a frame for decoding (replaces a frame no worker has taken yet).
+        The frame must not be modified afterwards.
+        """
+        with self._lock:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = (frame, time.monotonic() if timestamp is None else timestamp)
+            self.submitted += 1
+            self._work.notify()
+
+    def poll(self) -> List[QRResult]:
+        """Results decoded since the last call, oldest first."""
+        with self._lock:
+            results = list(self._results)
+            self._results.clear()
+        return results
+
+    def _run(self, scanner):
+        while True:
+            with self._lock:
+                self._work.wait_for(lambda: self._pending is not None or self._stop.is_set())
+                if self._stop.is_set():
+                    return
+                frame, timestamp = self._pending
+                self._pending = None
+
+            start = time.perf_counter()
+            try:
+                result = scanner.decode_frame(frame)
+            except Exception as e:
+                print(f"QR decode error: {e}")
+                result = None
+            decode_ms = (time.perf_counter() - start) * 1000
+
+            with self._lock:
+                self.decoded += 1
+                if result is not None:
+                    self.found += 1
+                    self._latencies.append(time.monotonic() - timestamp)
+                    self._results.append(QRResult(result[0], result[1], timestamp, frame, decode_ms))
+
+    def get_stats(self) -> Dict[str, float]:
+        decode_seconds = sum(scanner.decode_seconds for scanner in self.scanners)
+        latencies = sorted(self._latencies)
+        roi_attempts = sum(scanner.roi_attempts for scanner in self.scanners)
+        roi_hits = sum(scanner.roi_hits for scanner in self.scanners)
+        decoded_pixels = sum(scanner.decoded_pixels for scanner in self.scanners)
+        frame_pixels = sum(scanner.frame_pixels for scanner in self.scanners)
+        return {
+            'workers': len(self.scanners),
+            'submitted': self.submitted,
+            'decoded': self.decoded,
+            'dropped': self.dropped,
+            'found': self.found,
+            'mean_decode_ms': decode_seconds / self.decoded * 1000 if self.decoded else 0.0,
+            'median_latency_ms': latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+            'found_small': sum(scanner.found_small for scanner in self.scanners),
+            'full_retries': sum(scanner.full_retries for scanner in self.scanners),
+            'roi_attempts': roi_attempts,
+            'roi_hit_rate': roi_hits / roi_attempts if roi_attempts else 0.0,
+            'mean_decode_area': decoded_pixels / self.decoded if self.decoded else 0.0,
+            'decode_area_ratio': decoded_pixels / frame_pixels if frame_pixels else 0.0,
+        }
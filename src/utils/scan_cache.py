@@ -0,0 +1,105 @@
+"""
+Recent-scan cache for the kiosk.
+A badge held up for a few seconds is decoded over and over. The cache remembers, per
+payload (QR string or typed card ID), the employee it resolved to and the last outcome
+of the punch (already punched in this window), so repeats are answered without going
+back to the database. Entries expire after ttl_seconds, the least recently used ones
+are evicted beyond max_entries, and every entry is dropped as soon as the employee
+table changes (Database.employees_revision) or the attendance windows are saved (clear).
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Hashable, Optional
+
+
+class ScanEntry:
+    __slots__ = ('employee', 'revision', 'expires', 'outcome', 'outcome_until')
+
+    def __init__(self, employee, revision: int, expires: float):
+        self.employee = employee  # Resolved Employee, or None for an unknown payload
+        self.revision = revision
+        self.expires = expires  # time.monotonic() deadline
+        self.outcome = None  # Message of the last refused punch ("Déjà pointé ...")
+        self.outcome_until = None  # Wall-clock end of the window the outcome holds for
+
+    def set_outcome(self, message: str, until: datetime):
+        self.outcome = message
+        self.outcome_until = until
+
+    def current_outcome(self, now: Optional[datetime] = None) -> Optional[str]:
+        """The cached outcome if it still holds (same attendance window), else None."""
+        if self.outcome is None:
+            return None
+        if (datetime.now() if now is None else now) > self.outcome_until:
+            self.outcome = self.outcome_until = None
+            return None
+        return self.outcome
+
+
+class RecentScanCache:
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 256):
+        """
+        Args:
+            ttl_seconds: Lifetime of an entry
+            max_entries: Entries kept (least recently used evicted first)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (kind, payload) -> ScanEntry
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidated = 0  # Entries dropped because the employees changed
+        self.outcome_hits = 0  # Repeats answered without any database access
+
+    def get(self, key: Hashable, revision: int, now: Optional[float] = None) -> Optional[ScanEntry]:
+        """Entry for (kind, payload) if it is fresh and the employees did not change."""
+        now = time.monotonic() if now is None else now
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.revision != revision:
+            # The employee table changed: nothing cached before can be trusted
+            self.invalidated += len(self._entries)
+            self._entries.clear()
+            self.misses += 1
+            return None
+        if now >= entry.expires:
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, employee, revision: int, now: Optional[float] = None) -> ScanEntry:
+        now = time.monotonic() if now is None else now
+        entry = ScanEntry(employee, revision, now + self.ttl_seconds)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        """Drop every entry (e.g. the attendance windows changed)."""
+        self.invalidated += len(self._entries)
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'outcome_hits': self.outcome_hits,
+            'expired': self.expired,
+            'invalidated': self.invalidated,
+        }
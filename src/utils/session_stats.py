@@ -0,0 +1,134 @@
+"""
+Session statistics report for SLAT.
+The kiosk pipeline components expose get_stats(); each formatter below turns one
+component's metrics into a log line (None when there is nothing to report), so the
+kiosk logs a whole camera session with one call instead of per-feature print blocks.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+
+def _kiosk_camera(camera) -> Optional[str]:
+    stats = camera.get_stats()
+    if not stats['frames']:
+        return None
+    return (f"Kiosk frames ({camera.service.get_stats()['negotiated']}): {stats['frames']}, frame age median "
+            f"{stats['median_frame_age_ms']:.0f} ms / p95 {stats['p95_frame_age_ms']:.0f} ms")
+
+
+def _motion_gate(gate) -> Optional[str]:
+    stats = gate.get_stats()
+    return (f"Motion gate: {stats['frames_gated']}/{stats['frames_seen']} frames skipped "
+            f"({stats['gated_ratio'] * 100:.0f}%)")
+
+
+def _face_decisions(identifier) -> Optional[str]:
+    stats = identifier.get_stats()
+    if not (stats['accepted'] or stats['rejected']):
+        return None
+    return (f"Face decisions: {stats['accepted']} accepted, {stats['rejected']} rejected, "
+            f"median {stats['median_time_to_decision']:.2f}s / {stats['median_frames_per_decision']} frames, "
+            f"{stats['embeddings_per_decision']:.1f} embeddings per decision")
+
+
+def _camera_open(manager) -> Optional[str]:
+    stats = manager.get_stats()
+    if not stats['opens']:
+        return None
+    return (f"Camera open: time to first frame median {stats['median_time_to_first_frame'] * 1000:.0f} ms "
+            f"over {stats['opens']} opens ({stats['cache_hits']} cached, {stats['probes']} probes, "
+            f"{stats['profile_mismatches']} unsupported profiles)")
+
+
+def _frame_scheduler(scheduler) -> Optional[str]:
+    lines = [f"Stage {stage}: {stats['achieved_fps']:.1f}/{stats['target_fps']:.0f} fps, "
+             f"{stats['mean_ms']:.1f} ms per run{' (shed under load)' if stats['shed'] else ''}"
+             for stage, stats in scheduler.get_stats().items() if stats['runs']]
+    return "\n".join(lines) or None
+
+
+def _qr_worker(worker) -> Optional[str]:
+    stats = worker.get_stats()
+    if not stats['decoded']:
+        return None
+    line = (f"QR decoding: {stats['decoded']}/{stats['submitted']} frames decoded on {stats['workers']} "
+            f"worker(s) ({stats['dropped']} dropped), {stats['mean_decode_ms']:.1f} ms per frame, "
+            f"{stats['found']} codes, median {stats['median_latency_ms']:.0f} ms from capture to result "
+            f"({stats['found_small']} on the downscaled image, {stats['full_retries']} full-resolution retries)")
+    if stats['roi_attempts']:
+        line += (f"\nQR tracking: {stats['roi_hit_rate'] * 100:.0f}% of {stats['roi_attempts']} crop decodes hit, "
+                 f"{stats['mean_decode_area'] / 1000:.0f} kpx searched per frame "
+                 f"({stats['decode_area_ratio'] * 100:.0f}% of the frame)")
+    return line
+
+
+def _scan_cache(cache) -> Optional[str]:
+    stats = cache.get_stats()
+    if not (stats['hits'] or stats['misses']):
+        return None
+    return (f"Recent-scan cache: {stats['hit_rate'] * 100:.0f}% of {stats['hits'] + stats['misses']} lookups "
+            f"cached, {stats['outcome_hits']} repeats answered without the database, "
+            f"{stats['invalidated']} entries invalidated by employee or window changes")
+
+
+def _preview(renderer) -> Optional[str]:
+    stats = renderer.get_stats()
+    if not stats['rendered']:
+        return None
+    return (f"Preview: {stats['rendered']} frames drawn, {stats['skipped']} skipped by the rate cap, "
+            f"{stats['mean_render_ms']:.1f} ms per frame")
+
+
+def _face_gallery(gallery) -> Optional[str]:
+    stats = gallery.get_stats()
+    if not stats['matches']:
+        return None
+    return (f"Face gallery: {stats['templates']} templates / {stats['employees']} employees, "
+            f"{stats['mean_match_ms']:.2f} ms per match, {stats['learned']} templates learned")
+
+
+def _photo_writer(writer) -> Optional[str]:
+    stats = writer.get_stats()
+    if not stats['queued']:
+        return None
+    return (f"Photos: {stats['written']}/{stats['queued']} written, {stats['failed']} failed, "
+            f"{stats['dropped']} dropped (queue full), {stats['mean_encode_ms']:.1f} ms encode, "
+            f"{stats['mean_kb']:.0f} KB per photo, queue depth max {stats['max_depth']}")
+
+
+def _profiler(profiler) -> Optional[str]:
+    return profiler.format_table() if profiler.enabled and profiler.stages else None
+
+
+FORMATTERS: Dict[str, Callable[[object], Optional[str]]] = {
+    'kiosk_camera': _kiosk_camera,
+    'motion_gate': _motion_gate,
+    'face_decisions': _face_decisions,
+    'camera_open': _camera_open,
+    'frame_scheduler': _frame_scheduler,
+    'qr_worker': _qr_worker,
+    'power_states': lambda controller: controller.format_report(),
+    'scan_cache': _scan_cache,
+    'preview': _preview,
+    'face_gallery': _face_gallery,
+    'photo_writer': _photo_writer,
+    'profiler': _profiler,
+}
+
+
+def format_session_stats(components: Dict[str, object]) -> List[str]:
+    """Report lines of the given components, in order.
+    Args:
+        components: FORMATTERS name -> component (None entries are skipped)
+    """
+    lines = []
+    for name, component in components.items():
+        if component is None:
+            continue
+        try:
+            line = FORMATTERS[name](component)
+        except Exception as e:
+            line = f"{name} stats unavailable: {e}"
+        if line:
+            lines.append(line)
+    return lines
@@ -0,0 +1,116 @@
+"""
+CPU thread budget for SLAT.
+PyTorch (FaceNet), TensorFlow (mtcnn detector), OpenCV and Qt each size their
+thread pools to all cores by default; on small kiosks they oversubscribe the CPU.
+The budget must be applied at startup, before the models are loaded.
+"""
+
+import os
+import sys
+from typing import Dict, Optional
+
+# Thread counts per library. Values <= 0 are relative to the core count
+# (0 = all cores, -1 = all cores but one, ...). The 'default' profile leaves every
+# library at its own default.
+#
+# kiosk: one face is processed at a time, so wide intra-op pools buy little while
+# they steal cores from the GUI thread and camera capture. Two FaceNet threads keep
+# most of the forward pass speed-up on 4 cores; the small MTCNN networks and the
+# per-frame OpenCV calls (cvtColor, resize on 640x480) run best single threaded.
+# Opt-in until benchmarks/bench_thread_budget.py confirms it on terminal hardware.
+# admin batch: enrollment, re-embedding and benchmarks own the machine.
+THREAD_PROFILES = {
+    'kiosk': {
+        'torch_intra': 2,
+        'torch_inter': 1,
+        'tf_intra': 1,
+        'tf_inter': 1,
+        'opencv': 1,
+        'qt': 2,
+    },
+    'admin batch': {
+        'torch_intra': 0,
+        'torch_inter': 2,
+        'tf_intra': -1,
+        'tf_inter': 2,
+        'opencv': 0,
+        'qt': 0,
+    },
+}
+
+LIBRARY_DEFAULTS = 'default'
+DEFAULT_PROFILE = LIBRARY_DEFAULTS
+
+
+def _resolve(value: int, cores: int) -> int:
+    """Turn a profile value into a thread count (never more than the cores)."""
+    if value <= 0:
+        value = cores + value
+    return max(1, min(value, cores))
+
+
+def resolve_profile(name: str, cores: Optional[int] = None) -> Dict[str, int]:
+    """Return the thread counts of a profile for this machine (empty: library defaults)."""
+    if cores is None:
+        cores = os.cpu_count() or 1
+    if name == LIBRARY_DEFAULTS:
+        return {}
+    profile = THREAD_PROFILES.get(name)
+    if profile is None:
+        print(f"Unknown thread profile '{name}', keeping the library defaults")
+        return {}
+    return {key: _resolve(value, cores) for key, value in profile.items()}
+
+
+def apply_thread_budget(name: str = DEFAULT_PROFILE) -> Dict[str, int]:
+    """Apply a thread profile to torch, TensorFlow, OpenCV, BLAS and Qt.
+    Call before torch/TensorFlow run any operation (ideally before they are imported).
+    Environment variables already set by the operator are left untouched.
+    Returns: Applied thread counts (empty when the library defaults are kept)
+    """
+    budget = resolve_profile(name)
+    if not budget:
+        print("Thread budget: library defaults")
+        return budget
+
+    # Read by OpenMP / MKL / OpenBLAS (numpy, torch) and TensorFlow when they initialize
+    for var, key in (('OMP_NUM_THREADS', 'torch_intra'), ('MKL_NUM_THREADS', 'torch_intra'),
+                     ('OPENBLAS_NUM_THREADS', 'torch_intra'),
+                     ('TF_NUM_INTRAOP_THREADS', 'tf_intra'), ('TF_NUM_INTEROP_THREADS', 'tf_inter')):
+        os.environ.setdefault(var, str(budget[key]))
+
+    try:
+        import torch
+        torch.set_num_threads(budget['torch_intra'])
+        try:
+            torch.set_num_interop_threads(budget['torch_inter'])
+        except RuntimeError:
+            # Only possible once, before any inter-op parallel work started
+            print("torch inter-op threads already initialized, keeping current value")
+    except ImportError:
+        pass
+
+    # Configure TensorFlow directly only if something already imported it; importing it
+    # here would add its startup cost even when the detector backend doesn't need it.
+    if 'tensorflow' in sys.modules:
+        try:
+            tf = sys.modules['tensorflow']
+            tf.config.threading.set_intra_op_parallelism_threads(budget['tf_intra'])
+            tf.config.threading.set_inter_op_parallelism_threads(budget['tf_inter'])
+        except Exception as e:
+            print(f"TensorFlow threads already initialized: {e}")
+
+    try:
+        import cv2
+        cv2.setNumThreads(budget['opencv'])
+    except ImportError:
+        pass
+
+    try:
+        from PyQt5.QtCore import QThreadPool
+        QThreadPool.globalInstance().setMaxThreadCount(budget['qt'])
+    except ImportError:
+        pass
+
+    print(f"Thread budget '{name}': " + ", ".join(f"{k}={v}" for k, v in budget.items()))
+    return budget